@@ -0,0 +1,146 @@
+# amenity_parser.py
+
+import re
+from functools import lru_cache
+from typing import NamedTuple
+import numpy as np
+import pandas as pd
+
+# All patterns are compiled once at import and matched against upper-cased text.
+# "PF-1=26", "PF 2/3 = 14", "PF-1A=16", "PF-4/5 =Nil"
+_PF_EQUALS = re.compile(
+    r"PF\s*[-#]?\s*([0-9][0-9A-Z]*(?:\s*[/&]\s*[0-9][0-9A-Z]*)*)\s*=\s*(\d+(?:\.\d+)?|NIL)"
+)
+# "PF-1/15", "PF#1 - 1", "PF1-150", "PF 2/3-1" (no '=' in the whole value)
+_PF_SEPARATOR = re.compile(
+    r"PF\s*[-#]?\s*([0-9][0-9A-Z]*(?:\s*[/&]\s*[0-9][0-9A-Z]*)*)\s*[-/:]\s*(\d+(?:\.\d+)?)"
+)
+_LEADING_NUMBER = re.compile(r"^\s*(\d+(?:\.\d+)?)")
+_WHITESPACE = re.compile(r"\s+")
+_NONE_WORDS = frozenset({"--", "-", "NIL", "NO", "NOT", "NONE", "NA", "N/A", "NOT AVAILABLE"})
+_YES_WORDS = frozenset({"YES", "Y", "AVAILABLE", "PROVIDED"})
+
+# Station-wide values carry an empty platform label.
+STATION_WIDE = ""
+
+
+class PlatformValues(NamedTuple):
+    """Parsed quantities of one cell: platform labels and a read-only array of quantities."""
+    platforms: tuple
+    quantities: np.ndarray
+
+    @property
+    def total(self) -> float:
+        """Sum over all platforms (0.0 when nothing was recorded)."""
+        return float(self.quantities.sum())
+
+    @property
+    def lowest(self) -> float:
+        """Smallest per-platform quantity, or the station-wide value."""
+        return float(self.quantities.min()) if len(self.quantities) else 0.0
+
+    def pairs(self) -> list:
+        """Return (platform, quantity) pairs."""
+        return list(zip(self.platforms, self.quantities.tolist()))
+
+
+def _values(platforms, quantities) -> PlatformValues:
+    array = np.array(list(quantities), dtype=np.float64)
+    array.flags.writeable = False  # results are shared through the cache
+    return PlatformValues(tuple(platforms), array)
+
+
+_EMPTY = _values((), ())
+_NONE = _values((STATION_WIDE,), (0.0,))
+_YES = _values((STATION_WIDE,), (1.0,))
+
+
+@lru_cache(maxsize=65536)
+def _parse(value: str):
+    value = value.strip().upper()
+    if not value:
+        return _EMPTY
+    if value in _NONE_WORDS:
+        return _NONE
+    if value in _YES_WORDS:
+        return _YES
+
+    pattern = _PF_EQUALS if "=" in value else _PF_SEPARATOR
+    quantities = {}
+    for label, quantity in pattern.findall(value):
+        platform = _WHITESPACE.sub("", label).replace("&", "/")
+        amount = 0.0 if quantity == "NIL" else float(quantity)
+        quantities[platform] = quantities.get(platform, 0.0) + amount
+    if quantities:
+        return _values(quantities.keys(), quantities.values())
+
+    number = _LEADING_NUMBER.match(value)
+    if number:
+        return _values((STATION_WIDE,), (float(number.group(1)),))
+    return None
+
+
+def parse_platform_values(text):
+    """
+    Parse a free-text paavailability value into per-platform quantities.
+
+    Platform-wise values such as ``PF-1=26; PF-2/3=14`` give one quantity per
+    platform label; plain counts such as ``12`` or ``10 units`` and yes/no
+    answers give a single station-wide quantity ("No", "Nil" and "--" count
+    as zero). Repeated platforms are summed. Results are memoized per distinct
+    string and must not be modified.
+
+    Parameters:
+        text: Raw cell value (None and NaN are treated as empty).
+
+    Returns:
+        PlatformValues or None: Parsed quantities (empty for a blank value),
+                                or None when the value cannot be parsed.
+    """
+    if text is None or text != text:
+        return _EMPTY
+    return _parse(str(text))
+
+
+def parse_column(values) -> list:
+    """
+    Parse a whole column, running the parser once per distinct value.
+
+    Parameters:
+        values (pd.Series or sequence): Raw cell values.
+
+    Returns:
+        list: One PlatformValues (or None when unparseable) per input value.
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    parsed = [parse_platform_values(value) for value in uniques]
+    parsed.append(_EMPTY)  # code -1 marks missing values
+    return [parsed[code] for code in codes.tolist()]
+
+
+def column_totals(values, lowest: bool = False) -> np.ndarray:
+    """
+    Reduce a column to one number per row as a float array.
+
+    Each distinct value is parsed and reduced once; the per-row array is then
+    gathered with a single take. NaN marks unparseable values.
+
+    Parameters:
+        values (pd.Series or sequence): Raw cell values.
+        lowest (bool): Use the smallest platform quantity instead of the total.
+
+    Returns:
+        np.ndarray: One number per input value.
+    """
+    codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+    reduced = np.empty(len(uniques) + 1, dtype=np.float64)
+    for position, value in enumerate(uniques):
+        parsed = parse_platform_values(value)
+        reduced[position] = np.nan if parsed is None else (parsed.lowest if lowest else parsed.total)
+    reduced[-1] = 0.0  # code -1 marks missing values
+    return reduced.take(codes)
+
+
+def cache_info():
+    """Return hit/miss counters of the per-string result cache."""
+    return _parse.cache_info()
@@ -0,0 +1,207 @@
+# amenity_store.py
+
+import sqlite3
+import logging
+from collections.abc import Mapping
+import pandas as pd
+from amenity_parser import parse_column, parse_platform_values
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s]: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Normalized amenity name -> paavailability column it is migrated from.
+AMENITY_COLUMNS = {
+    "drinking_water_taps": "drinking_water_taps_pf_wise",
+    "seating": "seating_arrangement",
+    "platform_shelter_sqm": "platform_shelter_sqm",
+    "urinals": "urinals",
+    "latrines": "latrines",
+    "pay_use_toilets": "number_of_pay_use_toilet_units",
+    "water_cooler": "water_cooler_ro_plant_pf_wise",
+    "dustbins": "dustbins",
+    "two_wheeler_parking": "two_wheeler_parking_capacity",
+    "four_wheeler_parking": "four_wheeler_parking_capacity",
+    "uts_counters": "no_of_functional_uts_counters",
+    "prs_counters": "no_of_functional_prs_counters",
+    "atvm": "no_of_atvm_available",
+    "retiring_rooms_ac": "retiring_room_nos_ac",
+    "retiring_rooms_non_ac": "retiring_room_nos_non_ac",
+    "dormitory_gents_beds": "dormitory_gents_beds",
+    "dormitory_ladies_beds": "dormitory_ladies_beds",
+    "general_waiting_room_seats": "general_waiting_room_seating_capacity",
+    "ac_waiting_room_seats": "ac_waiting_room_seating_capacity",
+    "ladies_waiting_room_seats": "ladies_waiting_room_seating_capacity",
+    "wheel_chairs": "wheel_chair",
+    "railway_sahayak": "no_of_railway_sahayak",
+    "catering_stalls": "no_of_catering_stall_pf_wise",
+    "milk_stalls": "no_of_milk_stall_pf_wise",
+    "multipurpose_stalls": "no_of_multipurpose_stall_pf_wise",
+    "book_stalls": "no_of_book_stall_pf_wise",
+    "lifts": "lifts_with_location_pf_no",
+    "escalators": "escalator_with_location_pf_no",
+}
+
+# Norm key in RailwayAmenities -> (normalized amenity, basis). "station" norms are
+# compared with the station total, "platform" norms with the worst platform.
+NORM_AMENITIES = {
+    "drinking_water_taps": ("drinking_water_taps", "station"),
+    "seating_per_platform": ("seating", "platform"),
+    "platform_shelter_sqm": ("platform_shelter_sqm", "station"),
+    "urinals": ("urinals", "station"),
+    "latrines": ("latrines", "station"),
+}
+
+
+def station_amenity_rows(frame: pd.DataFrame):
+    """
+    Turn paavailability rows into normalized (station_code, platform, amenity, quantity) rows.
+
+    Parameters:
+        frame (pd.DataFrame): paavailability rows with station_code and the AMENITY_COLUMNS columns.
+
+    Returns:
+        tuple: (list of row tuples, number of non-empty values that could not be parsed).
+    """
+    rows = []
+    unparsed = 0
+    codes = frame["station_code"].astype(str).str.strip().tolist()
+    for amenity, column in AMENITY_COLUMNS.items():
+        if column not in frame.columns:
+            continue
+        for code, parsed in zip(codes, parse_column(frame[column])):
+            if parsed is None:
+                unparsed += 1
+                continue
+            rows.extend((code, platform, amenity, quantity) for platform, quantity in parsed.pairs())
+    return rows, unparsed
+
+
+def migrate_paavailability(conn: sqlite3.Connection, station_codes=None) -> dict:
+    """
+    Rebuild station_amenities from the wide paavailability table.
+
+    Runs in the caller's transaction, so the bulk importer can migrate in the
+    same transaction as the import. Stations are replaced wholesale, which
+    makes the migration safe to re-run.
+
+    Parameters:
+        conn (sqlite3.Connection): Connection whose tables were created by Database.
+        station_codes (iterable, optional): Only migrate these stations.
+
+    Returns:
+        dict: Counts of stations migrated, rows written and unparseable values.
+    """
+    # database imports this module, so its constants are only read at call time
+    from database import ID_CHUNK
+
+    columns = ", ".join(["station_code", *AMENITY_COLUMNS.values()])
+    sql = f"SELECT {columns} FROM paavailability"
+    if station_codes is None:
+        frame = pd.read_sql_query(sql, conn)
+    else:
+        station_codes = list(station_codes)
+        frames = [
+            pd.read_sql_query(
+                f"{sql} WHERE station_code IN ({', '.join('?' for _ in chunk)})", conn, params=chunk,
+            )
+            for chunk in (station_codes[start:start + ID_CHUNK] for start in range(0, len(station_codes), ID_CHUNK))
+        ]
+        frame = pd.concat(frames, ignore_index=True) if frames else pd.read_sql_query(f"{sql} WHERE 0", conn)
+
+    rows, unparsed = station_amenity_rows(frame)
+    codes = [(code,) for code in frame["station_code"].tolist()]
+    if station_codes is None:
+        conn.execute("DELETE FROM station_amenities;")
+    else:
+        conn.executemany("DELETE FROM station_amenities WHERE station_code = ?;", codes)
+    conn.executemany(
+        "INSERT INTO station_amenities (station_code, platform, amenity, quantity) VALUES (?, ?, ?, ?);",
+        rows,
+    )
+    report = {"stations": len(codes), "rows": len(rows), "unparsed": unparsed}
+    logging.info(
+        f"Migrated {report['stations']} stations to station_amenities: "
+        f"{report['rows']} rows, {report['unparsed']} unparseable values."
+    )
+    return report
+
+
+def minimum_requirements(norms) -> list:
+    """
+    Extract numeric minimum-amenity norms as (category, amenity, basis, required) rows.
+
+    Parameters:
+        norms (RailwayAmenities): Source of the per-category norms.
+
+    Returns:
+        list: One row per category and normalized amenity with a numeric norm.
+    """
+    rows = []
+    for category, amenities in norms.minimum_essential_amenities.items():
+        for key, (amenity, basis) in NORM_AMENITIES.items():
+            value = amenities.get(key)
+            if isinstance(value, Mapping):
+                value = value.get("quantity")
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                rows.append((category, amenity, basis, float(value)))
+    return rows
+
+
+def norm_available(paavailability_row: dict, norm_key: str):
+    """
+    Return the quantity a station offers for a minimum-amenity norm.
+
+    Parameters:
+        paavailability_row (dict): The station's paavailability row.
+        norm_key (str): Key in RailwayAmenities.get_minimum_amenities(), e.g. "urinals".
+
+    Returns:
+        float or None: Station total, or the worst platform for per-platform norms;
+                       None when the norm has no numeric column or the value is unparseable.
+    """
+    mapping = NORM_AMENITIES.get(norm_key)
+    if mapping is None:
+        return None
+    amenity, basis = mapping
+    parsed = parse_platform_values(paavailability_row.get(AMENITY_COLUMNS[amenity]))
+    if parsed is None:
+        return None
+    return parsed.lowest if basis == "platform" else parsed.total
+
+
+def amenity_totals(conn: sqlite3.Connection, amenity: str) -> pd.DataFrame:
+    """
+    Aggregate one amenity across stations, grouped by station category.
+
+    Parameters:
+        conn (sqlite3.Connection): Database connection.
+        amenity (str): Normalized amenity name, e.g. "drinking_water_taps".
+
+    Returns:
+        pd.DataFrame: category, stations, total, average and lowest per-station quantity.
+    """
+    return pd.read_sql_query(
+        """
+        WITH per_station AS (
+            SELECT station_code, SUM(quantity) AS quantity
+            FROM station_amenities
+            WHERE amenity = ?
+            GROUP BY station_code
+        )
+        SELECT p.amenities AS category,
+               COUNT(*) AS stations,
+               SUM(s.quantity) AS total,
+               AVG(s.quantity) AS average,
+               MIN(s.quantity) AS lowest
+        FROM per_station s
+        JOIN paavailability p ON p.station_code = s.station_code
+        GROUP BY p.amenities
+        ORDER BY p.amenities;
+        """,
+        conn,
+        params=(amenity,),
+    )
@@ -3,9 +3,20 @@
 import streamlit as st
 import pandas as pd
 import plotly.express as px
-import io
-from norms import RailwayAmenities
+from collections.abc import Mapping
+from norms import get_desirable_amenities, get_minimum_amenities
+from amenity_store import AMENITY_COLUMNS, amenity_totals, norm_available
+from compliance import load_compliance
+from dashboard import load_dashboard
 from database import Database
+from data_cache import cache, db_fingerprint, get_database, get_import_job, get_works_manager, start_import_job
+from data_index import DataIndex
+from export import render_export_buttons
+from search_index import SearchIndex, work_search_text
+from ingest import ImportJob, PENDING_WITH_FILES
+from nl_query import load_query_engine
+from paged_table import FrameSource, remarks_source, render_paged_table, station_list_source
+from retrieval import KINDS as RETRIEVAL_KINDS, load_retrieval_index
 from works import WorksManager
 import datetime
 import logging
@@ -13,20 +24,56 @@ import logging
 def load_data(db: Database):
     """
     Load stations and amenities data from the database.
+    The frames are cached per process and reloaded only when the database changes,
+    so they are shared between sessions and must not be modified in place.
     
     Parameters:
         db (Database): An instance of the Database class.
     
     Returns:
-        tuple: DataFrames for stations and amenities.
+        tuple: DataFrames for stations and amenities, and the DataIndex built over
+               stations, amenities and the works pending-with column.
     """
-    try:
+    def read_tables():
         stations_df = pd.read_sql_query("SELECT * FROM stations;", db.connection)
         amenities_df = pd.read_sql_query("SELECT * FROM paavailability;", db.connection)
-        return stations_df, amenities_df
+        works_df = pd.read_sql_query("SELECT * FROM works;", db.connection)
+        data_index = DataIndex()
+        data_index.add("station", stations_df, "station_code")
+        data_index.add("station.category", stations_df, "categorisation")
+        data_index.add("amenities", amenities_df, "station_code")
+        data_index.add("works.pending_with", works_df, "works_pending_with")
+        return stations_df, amenities_df, data_index
+
+    try:
+        return cache.get_or_load(
+            ("tables", db.db_path),
+            lambda: db_fingerprint(db),
+            read_tables
+        )
     except Exception as e:
         st.error(f"Error loading data from database: {e}")
-        return None, None
+        return None, None, None
+
+def load_works_search(db: Database, manager: WorksManager) -> SearchIndex:
+    """
+    Return the process-wide search index over work titles and project IDs.
+
+    The index is built once and then kept current by a WorksManager listener,
+    so it is only rebuilt when another connection changes the database.
+    """
+    def build():
+        works = pd.read_sql_query("SELECT project_id, short_name_of_work FROM works;", db.connection)
+        index = SearchIndex()
+        index.add_many((work["project_id"], work_search_text(work)) for work in works.to_dict("records"))
+        manager.add_listener("works_search", index.on_work_change)
+        return index
+
+    return cache.get_or_load(
+        ("works_search", db.db_path),
+        lambda: db_fingerprint(db, own_writes=False),
+        build
+    )
 
 def create_platform_info_card(platform_info):
     platforms = platform_info.get('platforms_hl_ml_rl', 'N/A')
@@ -45,21 +92,20 @@ def create_platform_info_card(platform_info):
 def create_comparison_card(amenity_name, required_value, available_value):
     # Ensure both required_value and available_value are integers
     required_val = required_value
-    if isinstance(required_val, dict):
-        # If required_val is a dict, try extracting a numeric key (e.g., 'count')
-        required_val = required_val.get('count', 0)
+    if isinstance(required_val, Mapping):
+        # Norms with details keep the number under 'quantity'
+        required_val = required_val.get('quantity', 0)
 
     if not isinstance(required_val, (int, float)):
         required_val = 0
 
-    if not isinstance(available_value, (int, float)):
-        # Attempt to convert to int if it's a string
-        try:
-            available_value = int(available_value)
-        except:
-            available_value = 0
-
-    status = "✅" if available_value >= required_val else "❌"
+    if available_value is None:
+        # Not recorded as a number in paavailability
+        available_value = "N/A"
+        status = "➖"
+    else:
+        available_value = int(available_value) if float(available_value).is_integer() else available_value
+        status = "✅" if available_value >= required_val else "❌"
     st.markdown(f"""
     <div class="amenity-card" style="border: 1px solid #ddd; padding: 10px; margin-bottom: 10px; border-radius: 5px;">
         <h5>{amenity_name}</h5>
@@ -69,9 +115,7 @@ def create_comparison_card(amenity_name, required_value, available_value):
     </div>
     """, unsafe_allow_html=True)
 
-def create_station_info_cards(station_data, amenities_data, manager: WorksManager):
-    railway_norms = RailwayAmenities()
-
+def create_station_info_cards(station_data, data_index: DataIndex, manager: WorksManager):
     st.markdown("### 📍 Basic Information")
     col1, col2, col3 = st.columns(3)
     with col1:
@@ -127,16 +171,16 @@ def create_station_info_cards(station_data, amenities_data, manager: WorksManage
         """, unsafe_allow_html=True)
 
     st.markdown("### 📋 Station Amenity Requirements")
-    category = station_data.get('categorisation', 'N/A').replace('-', '')
+    category = station_data.get('categorisation') or ''
 
     # Match station code from stations table with station_code in paavailability table
     station_code = station_data.get('station_code', '').strip()
-    if 'station_code' not in amenities_data.columns:
+    if 'amenities' not in data_index:
         st.error("'station_code' column not found in paavailability table. Please verify column names.")
         station_amenities = None
     else:
-        station_amenities = amenities_data[amenities_data['station_code'].str.strip() == station_code]
-        station_amenities = station_amenities.iloc[0].to_dict() if not station_amenities.empty else None
+        station_amenities = data_index.first("amenities", station_code)
+        station_amenities = station_amenities.to_dict() if station_amenities is not None else None
 
     col1, col2 = st.columns(2)
     
@@ -146,11 +190,10 @@ def create_station_info_cards(station_data, amenities_data, manager: WorksManage
             <h4>Minimum Essential Amenities</h4>
         """, unsafe_allow_html=True)
         
-        min_amenities = railway_norms.get_minimum_amenities(category)
+        min_amenities = get_minimum_amenities(category)
         if min_amenities and station_amenities is not None:
             for amenity, value in min_amenities.items():
-                # Assuming available_value is stored as 'amenity_count' in paavailability
-                available_value = station_amenities.get(f"{amenity}_count", 0)
+                available_value = norm_available(station_amenities, amenity)
                 create_comparison_card(
                     amenity.replace('_', ' ').title(),
                     value,
@@ -164,7 +207,7 @@ def create_station_info_cards(station_data, amenities_data, manager: WorksManage
             <h4>Desirable Amenities</h4>
         """, unsafe_allow_html=True)
         
-        desirable_amenities = railway_norms.get_desirable_amenities(category)
+        desirable_amenities = get_desirable_amenities(category)
         if desirable_amenities and station_amenities is not None:
             for amenity, required in desirable_amenities.items():
                 if required:
@@ -180,124 +223,146 @@ def create_station_info_cards(station_data, amenities_data, manager: WorksManage
     # Display related works
     st.markdown("### 📑 Related Works")
     try:
-        works_df = pd.read_sql_query("""
-            SELECT * FROM works WHERE works_pending_with = ?;
-        """, self.db.connection, params=(station_code,))
+        works_df = data_index.rows("works.pending_with", station_code)
         if not works_df.empty:
-            st.dataframe(works_df)
+            render_paged_table(FrameSource(works_df, "station.works"), key="station.works")
         else:
             st.write("No related works found for this station.")
     except Exception as e:
         st.error(f"Error fetching related works: {e}")
 
+def format_seconds(seconds) -> str:
+    if seconds is None:
+        return "estimating..."
+    return f"{int(seconds) // 60}m {int(seconds) % 60:02d}s" if seconds >= 60 else f"{seconds:.0f}s"
+
+def show_import_summary(job: ImportJob):
+    failed = [task["file"] for task in job.progress()["tasks"] if task["state"] == "failed"]
+    if failed or job.error:
+        st.warning(f"CSV import finished with errors: {', '.join(failed) or job.error}")
+    for task in job.progress()["tasks"]:
+        if task["state"] == "done":
+            st.caption(f"{task['file']} → {task['table']}: {task['inserted']} of {task['rows']} rows imported, {task['rejected']} rejected.")
+
+@st.fragment(run_every=1.0)
+def show_import_progress(job: ImportJob):
+    """Show the background import's progress, refreshing itself every second until it finishes."""
+    progress = job.progress()
+    if progress["finished"]:
+        # Reload the whole page once so every table reflects the finished import
+        st.session_state["import_reloaded"] = True
+        st.rerun(scope="app")
+
+    tasks = progress["tasks"]
+    done = sum(task["state"] == "done" for task in tasks)
+    st.progress(
+        progress["fraction"],
+        text=f"Importing CSV files in the background: {done} of {len(tasks)} files done, "
+             f"ETA {format_seconds(progress['eta_seconds'])}"
+    )
+    st.caption(" · ".join(f"{task['file']}: {task['state']}" for task in tasks))
+
 def create_app():
     st.set_page_config(layout="wide")
     st.title('Passenger Amenity Dashboard')
 
     # Initialize the database and manager
-    db = Database()
-    manager = WorksManager(db)
+    db = get_database()
+    manager = get_works_manager(db)
 
-    # Initialize data from CSVs if database tables are empty
+    # Initialize data from CSVs in the background if database tables are empty;
+    # the dashboard serves whatever tables have finished importing meanwhile.
     def check_and_initialize():
-        stations_count = pd.read_sql_query("SELECT COUNT(*) as count FROM stations;", db.connection)['count'][0]
-        if stations_count == 0:
-            st.info("Initializing database with data from CSV files...")
-            manager.initialize_data_from_csv(csv_folder='.')
-            st.success("Database initialized successfully!")
+        job = get_import_job(db)
+        if job is None:
+            stations_count = pd.read_sql_query("SELECT COUNT(*) as count FROM stations;", db.connection)['count'][0]
+            if stations_count > 0:
+                logging.info("Database already initialized. Skipping data initialization.")
+                return
+            job = start_import_job(db, csv_folder='.')
+        if job.running or not st.session_state.get("import_reloaded"):
+            show_import_progress(job)
         else:
-            logging.info("Database already initialized. Skipping data initialization.")
+            with st.sidebar.expander("CSV import"):
+                show_import_summary(job)
 
     check_and_initialize()
 
     # Load data from the database
-    stations_df, amenities_df = load_data(db)
+    stations_df, amenities_df, data_index = load_data(db)
     if stations_df is None or amenities_df is None:
         return
 
     # Sidebar navigation for Dashboard or Works
-    page = st.sidebar.radio("Navigation", ["Dashboard", "Works"])
+    page = st.sidebar.radio("Navigation", ["Dashboard", "Works", "Search"])
+    cache_stats = cache.stats()["total"]
+    st.sidebar.caption(
+        f"Data cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+        f"{cache_stats['load_seconds']:.2f}s loading"
+    )
 
     if page == "Dashboard":
         st.sidebar.header('Station Search')
         search_option = st.sidebar.selectbox('Search by:', ['Station code', 'Categorisation'])
         
         if search_option == 'Station code':
-            selected_station = st.sidebar.selectbox('Select Station Code:', ['All'] + sorted(stations_df['station_code'].unique()))
+            selected_station = st.sidebar.selectbox('Select Station Code:', ['All'] + data_index.keys("station"))
             if selected_station != 'All':
-                filtered_df = stations_df[stations_df['station_code'] == selected_station]
+                filtered_df = data_index.rows("station", selected_station)
             else:
                 filtered_df = stations_df
         else:
-            selected_category = st.sidebar.selectbox('Select Category:', ['All'] + sorted(stations_df['categorisation'].unique()))
+            selected_category = st.sidebar.selectbox('Select Category:', ['All'] + data_index.keys("station.category"))
             if selected_category != 'All':
-                filtered_df = stations_df[stations_df['categorisation'] == selected_category]
+                filtered_df = data_index.rows("station.category", selected_category)
             else:
                 filtered_df = stations_df
 
         tab1, tab2, tab3 = st.tabs(['Overview', 'Analysis', 'Station Details'])
         
+        # Counts and figures from the station summary; nothing here scans stations_df
+        dashboard = load_dashboard(db)
+
         with tab1:
-            col1, col2, col3, col4 = st.columns(4)
-            with col1:
-                st.metric("Total Stations", len(stations_df))
-            with col2:
-                st.metric("Total Categories", len(stations_df['categorisation'].unique()))
-            with col3:
-                st.metric("Total Zones", len(stations_df['zone'].unique()))
-            with col4:
-                st.metric("Total Sections", len(stations_df['section'].unique()))
-
-            fig1 = px.pie(stations_df, names='categorisation', title='Distribution by Category', hole=0.4)
-            st.plotly_chart(fig1, use_container_width=True)
-
-            zone_counts = stations_df['zone'].value_counts().reset_index()
-            zone_counts.columns = ['Zone', 'Count']
-            fig2 = px.bar(zone_counts, x='Zone', y='Count', title='Stations by Zone')
-            st.plotly_chart(fig2, use_container_width=True)
+            for column, (label, value) in zip(st.columns(4), dashboard.metrics.items()):
+                with column:
+                    st.metric(label, value)
+
+            st.plotly_chart(dashboard.figure("categories"), use_container_width=True)
+            st.plotly_chart(dashboard.figure("zones"), use_container_width=True)
 
         with tab2:
             # Section-wise Analysis
-            section_stats = stations_df.groupby('section').agg({
-                'station_code': 'count',
-                'categorisation': lambda x: x.value_counts().index[0] if not x.value_counts().empty else 'N/A'
-            }).reset_index()
-            section_stats.columns = ['Section', 'Station Count', 'Most Common Category']
-            
             st.subheader('Section-wise Analysis')
-            st.dataframe(section_stats)
+            st.dataframe(dashboard.section_stats)
+
+            st.plotly_chart(dashboard.figure("earnings"), use_container_width=True)
 
-            earnings_fig = px.histogram(stations_df, x='earnings_range', title='Distribution of Stations by Earnings Range')
-            st.plotly_chart(earnings_fig, use_container_width=True)
+            # Division-wide shortfalls against the minimum norms, all stations in one pass
+            st.subheader('Minimum Amenity Shortfalls')
+            shortfalls = load_compliance(db).shortfall_report()
+            st.caption(f"{shortfalls['station_code'].nunique()} of {len(amenities_df)} stations fall short of at least one norm.")
+            st.dataframe(shortfalls)
+
+            selected_amenity = st.selectbox('Amenity totals by category', list(AMENITY_COLUMNS))
+            st.dataframe(amenity_totals(db.connection, selected_amenity))
 
         with tab3:
             if search_option == 'Station code' and selected_station != 'All':
                 # Show detailed info for the selected station
                 station_data = filtered_df.iloc[0].to_dict()
-                create_station_info_cards(station_data, amenities_df, manager)
+                create_station_info_cards(station_data, data_index, manager)
                 st.markdown("---")
             
             st.subheader('Station List')
-            st.dataframe(filtered_df)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                csv = filtered_df.to_csv(index=False)
-                st.download_button(
-                    "Download CSV",
-                    csv,
-                    "station_data.csv",
-                    "text/csv"
-                )
-            with col2:
-                excel_buffer = io.BytesIO()
-                filtered_df.to_excel(excel_buffer, index=False)
-                st.download_button(
-                    "Download Excel",
-                    excel_buffer.getvalue(),
-                    "station_data.xlsx",
-                    "application/vnd.ms-excel"
-                )
+            if search_option == 'Station code':
+                list_filters = {"station_code": selected_station} if selected_station != 'All' else {}
+            else:
+                list_filters = {"categorisation": selected_category} if selected_category != 'All' else {}
+            station_list = station_list_source(db)
+            view = render_paged_table(station_list, key="station_list", filters=list_filters,
+                                      empty_message="No stations found.")
+            render_export_buttons(station_list, view, key="station_list.export", file_name="station_data")
     
     elif page == "Works":
         st.header("PH-53 Works Management")
@@ -319,31 +384,24 @@ def create_app():
 
         with wtab2:
             st.subheader("Remarks with Dates")
-            remarks_df = manager.get_all_remarks()
-            st.dataframe(remarks_df)
-
-            # Optional filtering by department
-            if not remarks_df.empty:
-                selected_dept = st.selectbox("Filter by Department:", ["All"] + sorted(remarks_df['department'].unique()))
-                if selected_dept != "All":
-                    filtered_remarks = remarks_df[remarks_df['department'] == selected_dept]
-                else:
-                    filtered_remarks = remarks_df
-                st.dataframe(filtered_remarks)
-
-            # Download button for remarks
-            if not filtered_remarks.empty:
-                csv_remarks = filtered_remarks.to_csv(index=False)
-                st.download_button("Download Remarks CSV", csv_remarks, "remarks.csv", "text/csv")
+            departments = [row[0] for row in db.connection.execute(
+                "SELECT DISTINCT department FROM remarks WHERE department IS NOT NULL ORDER BY department;"
+            ).fetchall()]
+            selected_dept = st.selectbox("Filter by Department:", ["All"] + departments)
+            remark_filters = {"department": selected_dept} if selected_dept != "All" else {}
+            remarks_table = remarks_source(db)
+            view = render_paged_table(remarks_table, key="remarks", filters=remark_filters,
+                                      empty_message="No remarks found.")
+            render_export_buttons(remarks_table, view, key="remarks.export", file_name="remarks")
 
         with wtab3:
             st.subheader("Manage Works")
-            action = st.selectbox("Select Action", ["Add New Work", "Edit Existing Work"])
+            action = st.selectbox("Select Action", ["Add New Work", "Edit Existing Work", "Upload Progress Sheet"])
 
             if action == "Add New Work":
                 st.markdown("### Add a New Work Record")
                 with st.form("add_work_form"):
-                    works_pending_with = st.selectbox("Works Pending With", sorted(amenities_df['station_code'].unique()))
+                    works_pending_with = st.selectbox("Works Pending With", data_index.keys("amenities"))
                     project_id = st.text_input("Project ID")
                     year_of_sanction = st.number_input("Year of Sanction", min_value=1900, max_value=2100, step=1)
                     date_of_sanction = st.date_input("Date of Sanction", value=datetime.date.today())
@@ -402,16 +460,21 @@ def create_app():
                     st.info("No work records available to edit.")
                 else:
                     project_ids = sorted(works_df['project_id'].unique())
+                    work_query = st.text_input("Search Works by Name or Project ID")
+                    if work_query:
+                        matching_ids = load_works_search(db, manager).search(work_query, limit=None)
+                        project_ids = matching_ids if matching_ids else project_ids
                     selected_project_id = st.selectbox("Select Project ID to Edit", project_ids)
                     if selected_project_id:
                         work = manager.get_work_by_id(selected_project_id)
                         if work:
                             with st.form("edit_work_form"):
                                 # Pre-fill the form with existing data
+                                station_codes = data_index.keys("amenities")
                                 works_pending_with = st.selectbox(
                                     "Works Pending With", 
-                                    sorted(amenities_df['station_code'].unique()), 
-                                    index=sorted(amenities_df['station_code'].unique()).index(work['works_pending_with']) if work['works_pending_with'] in sorted(amenities_df['station_code'].unique()) else 0
+                                    station_codes, 
+                                    index=station_codes.index(work['works_pending_with']) if work['works_pending_with'] in station_codes else 0
                                 )
                                 year_of_sanction = st.number_input(
                                     "Year of Sanction", 
@@ -517,5 +580,70 @@ def create_app():
                         else:
                             st.error("Selected work record not found.")
 
+            elif action == "Upload Progress Sheet":
+                st.markdown("### Upload a Progress Sheet")
+                st.caption("CSV or Excel sheet in the same layout as the division sheets. "
+                           "Only new works and works whose values changed are written.")
+                uploaded = st.file_uploader("Progress sheet", type=["csv", "xlsx"])
+                pending_with = st.selectbox("Works Pending with", ["(as in sheet)"] + list(PENDING_WITH_FILES))
+                atomic = st.checkbox("Apply all rows or none", value=False)
+                if uploaded is not None and st.button("Apply Sheet"):
+                    try:
+                        report = manager.upload_progress_sheet(
+                            uploaded, filename=uploaded.name,
+                            pending_with=None if pending_with == "(as in sheet)" else pending_with,
+                            atomic=atomic,
+                        )
+                    except ValueError as e:
+                        st.error(f"Could not read the sheet: {e}")
+                    else:
+                        col1, col2, col3, col4 = st.columns(4)
+                        col1.metric("Inserted", report["inserted"])
+                        col2.metric("Updated", report["updated"])
+                        col3.metric("Unchanged", report["unchanged"])
+                        col4.metric("Failed", report["failed"])
+                        if report["skipped"]:
+                            st.caption(f"{report['skipped']} rows without a usable PROJECTID were skipped.")
+                        failures = [
+                            result for kind in ("inserts", "updates") for result in report["results"][kind]
+                            if result["status"] not in ("inserted", "updated")
+                        ]
+                        if failures:
+                            st.dataframe(pd.DataFrame(failures)[["project_id", "status", "error"]])
+
+    elif page == "Search":
+        st.header("Search Stations, Amenities and Works")
+        query = st.text_input("Search", placeholder="e.g. foot over bridge SBC, platform shelter 2021")
+        kinds = st.multiselect("Include", list(RETRIEVAL_KINDS), default=list(RETRIEVAL_KINDS))
+        top_k = st.slider("Results", 5, 50, 10)
+        if query and kinds:
+            index = load_retrieval_index(db, manager)
+            results = index.search(query, k=top_k, kinds=kinds)
+            if results:
+                st.dataframe(pd.DataFrame(results)[["kind", "title", "score", "id"]], hide_index=True)
+            else:
+                st.info("No matching stations, amenities or works.")
+
+        st.subheader("Ask a Question")
+        question = st.text_input(
+            "Question", placeholder="e.g. works in YNK-KQZ section sanctioned after 2020 with progress under 50%"
+        )
+        if question:
+            try:
+                plan, answer = load_query_engine(db).ask(question)
+            except Exception as e:
+                st.error(f"Could not answer the question: {e}")
+            else:
+                st.caption("Understood: " + "; ".join(plan.understood))
+                if plan.ignored:
+                    st.caption("Not understood: " + ", ".join(plan.ignored))
+                with st.expander("SQL"):
+                    st.code(plan.sql, language="sql")
+                    st.write(list(plan.params))
+                if answer.empty:
+                    st.info("No rows match the question.")
+                else:
+                    st.dataframe(answer, hide_index=True)
+
     if __name__ == "__main__":
         create_app()
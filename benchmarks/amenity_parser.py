@@ -0,0 +1,64 @@
+# benchmarks/amenity_parser.py
+#
+# Parse throughput of amenity_parser on the real paavailability.csv: one
+# uncached parse per cell versus the memoized batch column pass, cold and warm.
+# --repeat stacks the file to simulate larger divisions.
+#
+#     python -m benchmarks.amenity_parser --repeat 1,100
+
+import argparse
+import time
+import pandas as pd
+import amenity_parser
+from amenity_parser import parse_column
+from amenity_store import AMENITY_COLUMNS
+from ingest import PAAVAILABILITY_COLUMNS, header_key
+
+
+def amenity_columns(path: str) -> pd.DataFrame:
+    """The raw CSV columns that feed station_amenities."""
+    raw = pd.read_csv(path, dtype=str)
+    lookup = {header_key(col): col for col in raw.columns}
+    sources = [lookup[header_key(PAAVAILABILITY_COLUMNS[column][0])] for column in AMENITY_COLUMNS.values()]
+    return raw[sources]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Amenity parser throughput benchmark.")
+    parser.add_argument("--csv", default="paavailability.csv")
+    parser.add_argument("--repeat", default="1,100", help="Comma-separated stack factors.")
+    args = parser.parse_args()
+
+    base = amenity_columns(args.csv)
+    for repeat in (int(n) for n in args.repeat.split(",")):
+        frame = pd.concat([base] * repeat, ignore_index=True)
+        cells = frame.size
+
+        uncached = amenity_parser._parse.__wrapped__
+        start = time.perf_counter()
+        for column in frame.columns:
+            for value in frame[column].tolist():
+                if value == value:
+                    uncached(str(value))
+        per_cell = time.perf_counter() - start
+
+        amenity_parser._parse.cache_clear()
+        start = time.perf_counter()
+        for column in frame.columns:
+            parse_column(frame[column])
+        cold = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for column in frame.columns:
+            parse_column(frame[column])
+        warm = time.perf_counter() - start
+
+        info = amenity_parser.cache_info()
+        print(f"{cells:>9} cells ({info.currsize} distinct) | "
+              f"per-cell {cells / per_cell:>11,.0f} cells/s | "
+              f"batch cold {cells / cold:>11,.0f} cells/s | "
+              f"batch warm {cells / warm:>11,.0f} cells/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/batch_edits.py
+#
+# Applying a financial-progress review to N works: one edit_work_record call
+# (one statement, one commit) per work versus a single apply_batch call.
+#
+#     python -m benchmarks.batch_edits --updates 300,3000
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+import numpy as np
+from database import Database
+from works import WorksManager
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batched work edits benchmark.")
+    parser.add_argument("--rows", type=int, default=20000, help="Works rows in the database.")
+    parser.add_argument("--updates", default="300,3000", help="Comma-separated batch sizes.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as folder:
+        db = Database(os.path.join(folder, "works.db"))
+        manager = WorksManager(db)
+        db.write(lambda conn: conn.execute("PRAGMA foreign_keys = OFF;"))
+        result = manager.apply_batch(inserts=[{"project_id": f"14.01.53.{i:08d}"} for i in range(args.rows)])
+        assert result["applied"]
+
+        rng = np.random.default_rng(6)
+        for size in (int(n) for n in args.updates.split(",")):
+            updates = [
+                {"project_id": f"14.01.53.{int(i):08d}", "financial_progress_percent": float(rng.integers(0, 120))}
+                for i in rng.choice(args.rows, size, replace=False)
+            ]
+
+            start = time.perf_counter()
+            for update in updates:
+                manager.edit_work_record(update["project_id"], {"financial_progress_percent": update["financial_progress_percent"]})
+            single = time.perf_counter() - start
+
+            start = time.perf_counter()
+            result = manager.apply_batch(updates=updates)
+            batched = time.perf_counter() - start
+            assert result["applied"] and manager.check_ph53_summary().empty
+
+            print(f"{size:>6} updates | one call each {single * 1000:9.1f} ms | "
+                  f"apply_batch {batched * 1000:8.1f} ms | {single / batched:6.1f}x")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
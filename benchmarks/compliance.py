@@ -0,0 +1,95 @@
+# benchmarks/compliance.py
+#
+# Division-wide shortfall report: ComplianceEngine's pass over the typed
+# station_amenities rows versus the per-station, per-amenity loop the
+# station cards use, on the real paavailability.csv stacked --repeat times
+# (station codes suffixed to stay unique) in a temporary database. The
+# matrices are built once per data version; a rerun only derives the
+# report and the gap table from them.
+#
+#     python -m benchmarks.compliance --repeat 1,10,100
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+from collections.abc import Mapping
+import pandas as pd
+from amenity_store import AMENITY_COLUMNS, NORM_AMENITIES, migrate_paavailability, norm_available
+from compliance import ComplianceEngine
+from database import Database
+from ingest import PAAVAILABILITY_COLUMNS, map_columns
+from norms import RailwayAmenities
+
+
+def per_station_loop(paavailability: pd.DataFrame) -> int:
+    """One RailwayAmenities lookup and one comparison per station and norm."""
+    shortfalls = 0
+    for row in paavailability.to_dict("records"):
+        norms = RailwayAmenities().get_minimum_amenities(row["amenities"])
+        for amenity, value in norms.items():
+            if amenity not in NORM_AMENITIES:
+                continue
+            required = value.get("quantity") if isinstance(value, Mapping) else value
+            # Values station_amenities has no rows for (blank or unparseable) count as 0
+            available = norm_available(row, amenity) or 0
+            if isinstance(required, (int, float)) and available < required:
+                shortfalls += 1
+    return shortfalls
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Norm-compliance benchmark.")
+    parser.add_argument("--csv", default="paavailability.csv")
+    parser.add_argument("--repeat", default="1,10,100", help="Comma-separated stack factors.")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    base, _ = map_columns(pd.read_csv(args.csv, dtype=str), PAAVAILABILITY_COLUMNS)
+    columns = ["station_code", "amenities", *AMENITY_COLUMNS.values()]
+    engine = ComplianceEngine()
+    for repeat in (int(n) for n in args.repeat.split(",")):
+        frame = pd.concat(
+            [base[columns].assign(station_code=base["station_code"].astype(str) + f"-{copy}") for copy in range(repeat)],
+            ignore_index=True,
+        )
+        with tempfile.TemporaryDirectory() as folder:
+            db = Database(os.path.join(folder, "bench.db"))
+            rows = list(frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None))
+
+            def load(conn):
+                conn.execute("PRAGMA foreign_keys = OFF;")
+                conn.executemany(
+                    f"INSERT INTO paavailability ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)});",
+                    rows,
+                )
+                migrate_paavailability(conn)
+
+            db.write(load)
+
+            start = time.perf_counter()
+            expected = per_station_loop(frame)
+            loop = time.perf_counter() - start
+
+            start = time.perf_counter()
+            matrices = engine.matrices(db.connection)
+            build = time.perf_counter() - start
+            db.close()
+
+        start = time.perf_counter()
+        report = matrices.shortfall_report()
+        rerun = time.perf_counter() - start
+        start = time.perf_counter()
+        matrices.gaps()
+        gaps = time.perf_counter() - start
+
+        assert len(report) == expected, (len(report), expected)
+        print(f"{len(frame):>7} stations | {len(report):>6} shortfalls | "
+              f"per-station loop {loop * 1000:9.1f} ms | matrices per data version {build * 1000:8.1f} ms | "
+              f"report per rerun {rerun * 1000:7.2f} ms ({loop / rerun:7.0f}x) | gap table {gaps * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
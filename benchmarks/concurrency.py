@@ -0,0 +1,150 @@
+# benchmarks/concurrency.py
+#
+# N dashboard readers and M editors hitting the works table at the same time:
+# the original single shared connection (rollback journal, no locking) versus
+# Database's per-thread WAL connections and single-writer queue.
+#
+# Editors are paced to --edit-rate edits per second each, so both modes do
+# the same editing work and readers get the same share of the CPU; pass 0 to
+# let editors run flat out.
+#
+#     python -m benchmarks.concurrency --readers 1,4,8 --editors 2 --edit-rate 10 --seconds 3
+
+import argparse
+import logging
+import os
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+import numpy as np
+from database import Database
+from works import WorksManager
+
+WORK_COLUMNS = ["works_pending_with", "project_id", "year_of_sanction", "short_name_of_work", "station", "section", "cost"]
+
+
+def synthetic_works(rows: int) -> list:
+    rng = np.random.default_rng(5)
+    return [
+        (f"Sr.DEN/{'EWSN'[i % 4]}/SBC", f"14.01.53.{i:08d}", int(rng.integers(2015, 2025)),
+         f"Improvement to circulating area {i}", f"S{i % 2000:04d}", "east", float(rng.integers(100, 50_000)))
+        for i in range(rows)
+    ]
+
+
+def seed(path: str, rows: int):
+    db = Database(path)
+    insert = f"INSERT INTO works ({', '.join(WORK_COLUMNS)}) VALUES ({', '.join('?' for _ in WORK_COLUMNS)});"
+    db.write(lambda conn: conn.execute("PRAGMA foreign_keys = OFF;"))
+    db.write(lambda conn: conn.executemany(insert, synthetic_works(rows)))
+    db.close()
+
+
+def dashboard_read(conn: sqlite3.Connection, rng):
+    """What one dashboard rerun reads: the works table and one station's works."""
+    conn.execute("SELECT * FROM works;").fetchall()
+    conn.execute("SELECT * FROM works WHERE station = ?;", (f"S{int(rng.integers(0, 2000)):04d}",)).fetchall()
+
+
+def run(mode: str, path: str, readers: int, editors: int, seconds: float, rows: int, edit_rate: float) -> dict:
+    stop = threading.Event()
+    latencies, edits, errors = [], [0], [0]
+    lock = threading.Lock()
+
+    if mode == "legacy":
+        shared = sqlite3.connect(path, check_same_thread=False)
+        shared.row_factory = sqlite3.Row
+        shared.execute("PRAGMA journal_mode = DELETE;")
+        read_connection = lambda: shared
+
+        def edit(project_id, cost):
+            cursor = shared.cursor()
+            cursor.execute("UPDATE works SET cost = ? WHERE project_id = ?;", (cost, project_id))
+            shared.commit()
+    else:
+        db = Database(path)
+        manager = WorksManager(db)
+        def read_connection():
+            # Every rerun first checks the cache fingerprint, as data_cache does
+            db.versions()
+            return db.connection
+
+        def edit(project_id, cost):
+            if not manager.edit_work_record(project_id, {"cost": cost}):
+                raise RuntimeError("edit failed")
+
+    def reader(seed_value):
+        rng = np.random.default_rng(seed_value)
+        while not stop.is_set():
+            start = time.perf_counter()
+            try:
+                dashboard_read(read_connection(), rng)
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+            except Exception:
+                with lock:
+                    errors[0] += 1
+
+    def editor(seed_value):
+        rng = np.random.default_rng(seed_value)
+        due = time.perf_counter()
+        while not stop.is_set():
+            if edit_rate:
+                due += 1 / edit_rate
+                if stop.wait(max(0.0, due - time.perf_counter())):
+                    break
+            try:
+                edit(f"14.01.53.{int(rng.integers(0, rows)):08d}", float(rng.integers(100, 50_000)))
+                with lock:
+                    edits[0] += 1
+            except Exception:
+                with lock:
+                    errors[0] += 1
+
+    threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=editor, args=(100 + i,)) for i in range(editors)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    if mode == "legacy":
+        shared.close()
+    else:
+        db.close()
+    return {
+        "reads_per_s": len(latencies) / seconds,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "p95_ms": float(np.percentile(latencies, 95)) * 1000 if latencies else float("nan"),
+        "edits_per_s": edits[0] / seconds,
+        "errors": errors[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent readers and editors benchmark.")
+    parser.add_argument("--rows", type=int, default=5000, help="Works rows in the database.")
+    parser.add_argument("--readers", default="1,4,8", help="Comma-separated reader thread counts.")
+    parser.add_argument("--editors", type=int, default=2)
+    parser.add_argument("--edit-rate", type=float, default=10.0, help="Edits per second per editor; 0 is unpaced.")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as folder:
+        for readers in (int(n) for n in args.readers.split(",")):
+            for mode in ("legacy", "pooled"):
+                path = os.path.join(folder, f"{mode}-{readers}.db")
+                seed(path, args.rows)
+                result = run(mode, path, readers, args.editors, args.seconds, args.rows, args.edit_rate)
+                print(f"{mode:>6} | {readers:>2} readers, {args.editors} editors | "
+                      f"{result['reads_per_s']:7.1f} reads/s (p50 {result['p50_ms']:7.1f} ms, p95 {result['p95_ms']:7.1f} ms) | "
+                      f"{result['edits_per_s']:7.1f} edits/s | {result['errors']} errors")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/dashboard.py
+#
+# One rerun of the dashboard's Overview and Analysis tabs over a synthetic
+# database: the original code (unique counts, value_counts, a per-section
+# groupby lambda and three Plotly figures built from the stations frame)
+# versus dashboard.py (aggregates from the trigger-maintained station
+# summary, cached figures), after no write, a works write and a
+# station write. Also checks that both compute the same section table.
+#
+#     python -m benchmarks.dashboard --stations 10000,100000 --reruns 10
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+import plotly.express as px
+from database import Database
+from dashboard import load_dashboard
+
+CATEGORIES = ["NSG-1", "NSG-2", "NSG-3", "NSG-4", "NSG-5", "NSG-6", "HG-1", "HG-2", "HG-3", "Non-Commercial"]
+EARNINGS = ["< 1 Cr", "1-5 Cr", "5-20 Cr", "20-100 Cr", "> 100 Cr"]
+
+
+def seed(path: str, stations: int):
+    rng = np.random.default_rng(25)
+    rows = [
+        (f"S{i:06d}", f"Station {i}", str(rng.choice(CATEGORIES)), str(rng.choice(["SWR", "SR", "CR"])),
+         "SBC", f"SEC-{int(rng.integers(0, 200))}", str(rng.choice(EARNINGS)))
+        for i in range(stations)
+    ]
+    db = Database(path)
+    db.write(lambda conn: conn.executemany(
+        "INSERT INTO stations (station_code, station_name, categorisation, zone, division, section, earnings_range) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?);", rows))
+    db.close()
+
+
+def legacy(stations_df: pd.DataFrame):
+    """The Overview and Analysis tabs as they were, without the Streamlit calls."""
+    metrics = [len(stations_df), len(stations_df['categorisation'].unique()),
+               len(stations_df['zone'].unique()), len(stations_df['section'].unique())]
+    figures = [px.pie(stations_df, names='categorisation', title='Distribution by Category', hole=0.4)]
+    zone_counts = stations_df['zone'].value_counts().reset_index()
+    zone_counts.columns = ['Zone', 'Count']
+    figures.append(px.bar(zone_counts, x='Zone', y='Count', title='Stations by Zone'))
+    section_stats = stations_df.groupby('section').agg({
+        'station_code': 'count',
+        'categorisation': lambda x: x.value_counts().index[0] if not x.value_counts().empty else 'N/A'
+    }).reset_index()
+    section_stats.columns = ['Section', 'Station Count', 'Most Common Category']
+    figures.append(px.histogram(stations_df, x='earnings_range', title='Distribution of Stations by Earnings Range'))
+    return metrics, section_stats, [figure.to_json() for figure in figures]
+
+
+def current(db: Database):
+    dashboard = load_dashboard(db)
+    figures = [dashboard.figure(name) for name in ("categories", "zones", "earnings")]
+    return dashboard.metrics, dashboard.section_stats, [figure.to_json() for figure in figures]
+
+
+def timed(run, reruns: int) -> float:
+    start = time.perf_counter()
+    for _ in range(reruns):
+        run()
+    return (time.perf_counter() - start) / reruns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Dashboard aggregates benchmark.")
+    parser.add_argument("--stations", default="10000,100000", help="Comma-separated station counts.")
+    parser.add_argument("--reruns", type=int, default=10)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    for stations in (int(n) for n in args.stations.split(",")):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "bench.db")
+            seed(path, stations)
+            db = Database(path)
+            stations_df = pd.read_sql_query("SELECT * FROM stations;", db.connection)
+
+            _, legacy_sections, _ = legacy(stations_df)
+            first = time.perf_counter()
+            _, sections, _ = current(db)
+            first = time.perf_counter() - first
+            # Ties for the most common category may be broken differently; counts must agree
+            same = (legacy_sections["Section"].tolist() == sections["Section"].tolist()
+                    and legacy_sections["Station Count"].tolist() == sections["Station Count"].tolist())
+
+            results = [("legacy", timed(lambda: legacy(stations_df), args.reruns)),
+                       ("first load", first),
+                       ("no write", timed(lambda: current(db), args.reruns))]
+
+            def works_write():
+                db.write(lambda conn: conn.execute(
+                    "INSERT INTO remarks (date, department, remark) VALUES ('2024-01-01', 'Civil', 'x');"))
+                current(db)
+
+            def station_write():
+                db.write(lambda conn: conn.execute(
+                    "UPDATE stations SET categorisation = CASE categorisation WHEN 'HG-1' THEN 'HG-2' "
+                    "ELSE 'HG-1' END WHERE station_code = 'S000001';"))
+                current(db)
+
+            results.append(("other write", timed(works_write, args.reruns)))
+            results.append(("station write", timed(station_write, args.reruns)))
+            db.close()
+
+            print(f"{stations} stations | section table matches legacy: {same}")
+            for label, seconds in results:
+                print(f"  {label:>13} | {seconds * 1000:9.2f} ms per rerun")
+
+
+if __name__ == "__main__":
+    main()
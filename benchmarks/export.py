@@ -0,0 +1,83 @@
+# benchmarks/export.py
+#
+# Station List exports over a synthetic database: the original buttons
+# (whole frame read, then to_csv and to_excel into memory on every rerun)
+# versus export.py (rows streamed from SQLite into files, written once per
+# view and data version). Reports time and, with --memory, peak traced
+# Python memory.
+#
+#     python -m benchmarks.export --stations 10000,100000 --memory
+
+import argparse
+import io
+import logging
+import os
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+from benchmarks.paged_table import seed
+from database import Database
+from export import export_file
+from paged_table import station_list_source
+
+
+def measured(run, trace: bool) -> tuple:
+    """Return (seconds, peak traced MB or None) of one run; tracing slows the run, so it is timed apart."""
+    start = time.perf_counter()
+    run()
+    seconds = time.perf_counter() - start
+    if not trace:
+        return seconds, None
+    tracemalloc.start()
+    run()
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return seconds, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming export benchmark.")
+    parser.add_argument("--stations", default="10000,100000", help="Comma-separated station counts.")
+    parser.add_argument("--memory", action="store_true", help="Also measure peak traced memory (slow).")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    for stations in (int(n) for n in args.stations.split(",")):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "bench.db")
+            seed(path, stations)
+            db = Database(path)
+            source = station_list_source(db)
+            # The legacy buttons exported the stations table as loaded, every column
+            view = {"columns": source.column_names[:12], "filters": {}, "search": "", "sort": None,
+                    "descending": None}
+            exports = os.path.join(folder, "exports")
+
+            def legacy():
+                frame = pd.read_sql_query("SELECT * FROM stations;", db.connection)
+                frame.to_csv(index=False)
+                frame.to_excel(io.BytesIO(), index=False)
+
+            def stream(fmt, reuse=False):
+                # A fresh directory per run, so each one writes its file; reuse reads back the last one
+                return lambda: export_file(source, view, fmt, exports if reuse else tempfile.mkdtemp(dir=folder))
+
+            export_file(source, view, "csv", exports)
+            results = [
+                ("legacy rerun", *measured(legacy, args.memory)),
+                ("stream csv", *measured(stream("csv"), args.memory)),
+                ("stream xlsx", *measured(stream("xlsx"), args.memory)),
+                ("cached csv", *measured(stream("csv", reuse=True), args.memory)),
+            ]
+            sizes = {fmt: os.path.getsize(export_file(source, view, fmt, exports)) / 2 ** 20
+                     for fmt in ("csv", "xlsx")}
+            db.close()
+
+            print(f"{stations} stations | csv {sizes['csv']:.1f} MB, xlsx {sizes['xlsx']:.1f} MB")
+            for label, seconds, peak in results:
+                print(f"  {label:>12} | {seconds * 1000:9.1f} ms" + (f" | peak {peak:8.1f} MB" if peak is not None else ""))
+
+
+if __name__ == "__main__":
+    main()
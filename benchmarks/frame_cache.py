@@ -0,0 +1,56 @@
+# benchmarks/frame_cache.py
+#
+# Cold start of the prepared station and works frames: reading and preparing
+# the CSVs (read_csv, column renaming, fillna, DISPLAY_NAME apply, works
+# explode) versus reading them back from the on-disk frame cache.
+#
+#     python -m benchmarks.frame_cache --repeat 1,100,1000
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+import pandas as pd
+import frame_cache
+from data_loader import DataLoader
+
+
+def main():
+    parser = argparse.ArgumentParser(description="On-disk frame cache benchmark.")
+    parser.add_argument("--stations", default="stations.csv")
+    parser.add_argument("--works", default="works.csv")
+    parser.add_argument("--repeat", default="1,100,1000", help="Comma-separated stack factors.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    stations, works = pd.read_csv(args.stations), pd.read_csv(args.works)
+    for repeat in (int(n) for n in args.repeat.split(",")):
+        with tempfile.TemporaryDirectory() as folder:
+            station_csv, works_csv = os.path.join(folder, "stations.csv"), os.path.join(folder, "works.csv")
+            pd.concat([stations] * repeat, ignore_index=True).to_csv(station_csv, index=False)
+            pd.concat([works] * repeat, ignore_index=True).to_csv(works_csv, index=False)
+            frame_cache.CACHE_DIR = os.path.join(folder, "cache")
+            loader = DataLoader(station_csv, works_csv)
+
+            start = time.perf_counter()
+            prepared = (loader._read_station_data(), loader._read_works_data())
+            uncached = time.perf_counter() - start
+
+            start = time.perf_counter()
+            loader.load_station_data(), loader.load_works_data()
+            build = time.perf_counter() - start
+
+            start = time.perf_counter()
+            cached = (loader.load_station_data(), loader.load_works_data())
+            hit = time.perf_counter() - start
+
+            for expected, actual in zip(prepared, cached):
+                pd.testing.assert_frame_equal(expected, actual, check_index_type=False)
+            print(f"{len(prepared[0]):>8} stations, {len(prepared[1]):>8} work rows | "
+                  f"prepare from CSV {uncached * 1000:9.1f} ms | build+store {build * 1000:9.1f} ms | "
+                  f"cache hit {hit * 1000:8.1f} ms | {uncached / hit:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
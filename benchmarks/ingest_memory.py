@@ -0,0 +1,137 @@
+# benchmarks/ingest_memory.py
+#
+# Peak memory of importing a large stations file and works sheet: whole-file
+# reads (read_source + load) versus the chunked iter_source + load_stream path,
+# as the files grow. Each import runs in a fresh interpreter and reports its
+# peak RSS, and its peak anonymous (heap) memory, which leaves out the pages
+# of the database file SQLite memory-maps for reads (mmap_size).
+#
+#     python -m benchmarks.ingest_memory --rows 50000,200000,800000 --chunk-rows 20000
+
+import argparse
+import logging
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import numpy as np
+import pandas as pd
+from database import Database
+from ingest import BulkIngestor, PENDING_WITH_FILES, STATION_COLUMNS, WORK_COLUMNS
+
+ZONES = ["SWR", "SR", "CR", "WR", "NR", "ER"]
+SECTIONS = ["east", "west", "north", "south", "div"]
+
+
+def write_sources(folder: str, rows: int, block: int = 100_000):
+    """Write stations.csv and one works sheet of the given size, a block at a time."""
+    rng = np.random.default_rng(11)
+    station_headers = [source for source, _, _ in STATION_COLUMNS.values()]
+    works_key, works_file = next(iter(PENDING_WITH_FILES.items()))
+    works_headers = ["SN"] + [source for source, _, _ in WORK_COLUMNS.values()]
+
+    with open(os.path.join(folder, "stations.csv"), "w", newline="") as stations, \
+            open(os.path.join(folder, works_file), "w", newline="") as works:
+        works.write(f"{works_key},,,\n,,,\n")
+        for start in range(0, rows, block):
+            ids = np.arange(start, min(start + block, rows))
+            pd.DataFrame({
+                "Station code": [f"S{i:07d}" for i in ids],
+                "STATION NAME": [f"Station {i}" for i in ids],
+                "Categorisation": rng.choice(["NSG1", "NSG2", "NSG3", "NSG4", "NSG5", "HG1"], len(ids)),
+                "ZONE": rng.choice(ZONES, len(ids)),
+                "DIVISION": rng.choice(["SBC", "MYS", "UBL"], len(ids)),
+                "Section": rng.choice(SECTIONS, len(ids)),
+                "Earnings range": "", "Passenger range": "",
+                "Passenger footfall": rng.integers(0, 100_000, len(ids)),
+                "Platform Type": "HL",
+                "Number of Platforms": rng.integers(1, 10, len(ids)),
+            })[station_headers].to_csv(stations, index=False, header=start == 0)
+            pd.DataFrame({
+                "SN": ids,
+                "PROJECTID": [f"14.01.53.{i:09d}" for i in ids],
+                "Year of Sanction": rng.integers(2010, 2025, len(ids)),
+                "Date of Sanction": "01/04/2020",
+                "Short Name of Work": [f"Improvement to circulating area {i}" for i in ids],
+                "Block Section": "SEC: Stn: SBC", "Station": [f"S{i % 5000:07d}" for i in ids],
+                "ALLOCATION": "DF(1)", "Cost": rng.integers(100, 50_000, len(ids)),
+                "Expenditure upto date": rng.integers(0, 50_000, len(ids)),
+                "Financial Progress in %": rng.integers(0, 100, len(ids)),
+                "IF UMBRELLA?": "N", "PARENT WORK": "", "Section": rng.choice(SECTIONS, len(ids)),
+                "Remarks": "Work in progress", "Latest Remarks Civil": "", "Latest Remarks Electrical": "",
+                "Latest Remarks S&T": "", "Latest Remarks Civil As On (DD-MM-YYYY)": "",
+            })[works_headers].to_csv(works, index=False, header=start == 0)
+
+
+def anonymous_mb() -> float:
+    """Current anonymous resident memory in MB (Linux)."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def child(folder: str, chunk_rows: int):
+    """Import the folder once and print inserted rows, seconds, peak RSS and peak anonymous memory in MB."""
+    logging.getLogger().setLevel(logging.WARNING)
+    peak_anon = [anonymous_mb()]
+    done = threading.Event()
+
+    def sample():
+        while not done.wait(0.005):
+            peak_anon[0] = max(peak_anon[0], anonymous_mb())
+
+    sampler = threading.Thread(target=sample, daemon=True)
+    sampler.start()
+    db = Database(os.path.join(folder, f"import-{chunk_rows}.db"))
+    start = time.perf_counter()
+    report = db.write(lambda conn: (
+        conn.execute("PRAGMA foreign_keys = OFF;"),
+        BulkIngestor(conn).ingest_folder(folder, chunk_rows or None),
+    )[1])
+    elapsed = time.perf_counter() - start
+    done.set()
+    sampler.join()
+    db.close()
+    inserted = sum(entry["inserted"] for entry in report.values())
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # kilobytes on Linux
+    print(inserted, elapsed, peak_mb, peak_anon[0])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming ingest memory benchmark.")
+    parser.add_argument("--rows", default="50000,200000,800000", help="Comma-separated rows per file.")
+    parser.add_argument("--chunk-rows", type=int, default=20_000)
+    parser.add_argument("--child", nargs=2, metavar=("FOLDER", "CHUNK_ROWS"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(args.child[0], int(args.child[1]))
+        return
+
+    peaks = {}
+    for rows in (int(n) for n in args.rows.split(",")):
+        with tempfile.TemporaryDirectory() as folder:
+            write_sources(folder, rows)
+            size_mb = sum(os.path.getsize(os.path.join(folder, name)) for name in os.listdir(folder)) / 2**20
+            for label, chunk_rows in (("whole file", 0), ("streaming", args.chunk_rows)):
+                output = subprocess.run(
+                    [sys.executable, "-m", "benchmarks.ingest_memory", "--child", folder, str(chunk_rows)],
+                    check=True, capture_output=True, text=True,
+                ).stdout.split()
+                inserted, elapsed = int(output[0]), float(output[1])
+                peak_mb, peak_anon = float(output[2]), float(output[3])
+                peaks.setdefault(label, []).append(peak_anon)
+                print(f"{rows:>8} rows/file ({size_mb:6.1f} MB CSV) | {label:>10} | "
+                      f"{inserted:>8} rows inserted in {elapsed:6.2f}s | peak RSS {peak_mb:7.1f} MB, "
+                      f"anonymous {peak_anon:7.1f} MB")
+    for label, values in peaks.items():
+        print(f"{label:>10}: peak anonymous memory grew {values[-1] - values[0]:+7.1f} MB "
+              f"from the smallest to the largest files")
+
+
+if __name__ == "__main__":
+    main()
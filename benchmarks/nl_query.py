@@ -0,0 +1,173 @@
+# benchmarks/nl_query.py
+#
+# The rule-based question parser over a synthetic database: parsing a corpus
+# of questions cold, answering them again from the plan cache, and running
+# the compiled SQL. Checks the filters planned for the EXPECTED questions,
+# including ones that differ only in case. Prints each question's plan
+# with --show.
+#
+#     python -m benchmarks.nl_query --works 10000,100000 --rounds 20 --show
+
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+import numpy as np
+from database import Database
+from nl_query import NLQueryEngine
+
+SECTIONS = ["YNK-KQZ", "BWT Section", "SBC-MYS", "BNC-HSRA"]
+CATEGORIES = ["NSG-2", "NSG-3", "NSG-5", "HG-1", "Non-Commercial"]
+WORK_SECTIONS = ["east", "west", "north", "South", "Gati Sakthi", "east, west"]
+PENDING_WITH = ["Sr.DEN/E/SBC", "Sr.DEN/W/SBC", "Sr.DEN/S/SBC", "Divisional Works", "Sr.DCM/SBC"]
+TITLES = ["Provision of foot over bridge", "Provision of lifts", "Improvement to circulating area",
+          "Platform shelter extension", "Pay and use toilet block", "Drinking water taps on platforms",
+          "LED lighting at station", "Two wheeler parking"]
+AMENITIES = ["lifts", "escalators", "urinals", "drinking_water_taps", "seating"]
+
+CORPUS = [
+    "works in YNK-KQZ section sanctioned after 2020 with progress under 50%",
+    "stations without lifts in NSG-3 category",
+    "how many works pending with Sr.DEN/E/SBC",
+    "top 10 most expensive works in east section",
+    "works sanctioned between 2018 and 2021 not started",
+    "total cost of works in Gati Sakthi section",
+    "average progress of works sanctioned in 2022",
+    "foot over bridge works at S0007",
+    "stations with fewer than 4 urinals",
+    "how many stations without escalators in BWT section",
+    "completed lift works in west section",
+    "works with cost over 5000 sanctioned before 2019",
+    "latest 20 works pending with Divisional Works",
+    "stations with more than 4 platforms in SBC-MYS section",
+    "ongoing toilet works in NSG-2 category",
+    "busiest stations in HG-1 category",
+    "works with progress at least 75 percent in north section",
+    "\"circulating area\" works since 2021",
+    "stations with lifts",
+    "works at Station 12",
+    "how many works with progress over 90% in YNK-KQZ",
+    "cheapest 5 drinking water works",
+    "works in South section sanctioned in 2023",
+    "stations with passenger footfall over 50000 without escalators",
+    "parking works in BWT section",
+    "oldest works pending with Sr.DCM/SBC",
+    "lighting works in SBC-MYS section with progress below 25%",
+    "stations in NSG-5 category with at least 2 drinking water taps",
+    "count of shelter works sanctioned after 2017",
+    "works for platform shelter in BNC-HSRA section",
+]
+
+# (question, conditions its plan must contain, conditions it must not) in QueryPlan.understood.
+# Station codes count only in capitals, so questions differing only in case plan differently.
+EXPECTED = [
+    ("works at sbc", [], ["station SBC"]),
+    ("works at SBC", ["station SBC"], []),
+    ("foot over bridge works at s0007", ["about foot over bridge"], ["station S0007"]),
+    ("foot over bridge works at S0007", ["about foot over bridge", "station S0007"], []),
+    ("works in YNK-KQZ section sanctioned after 2020 with progress under 50%",
+     ["section YNK-KQZ", "sanctioned > 2020", "progress < 50%"], []),
+    ("stations without lifts in NSG-3 category", ["lifts = 0", "category NSG-3"], []),
+    ("how many works pending with Sr.DEN/E/SBC", ["count", "pending with Sr.DEN/E/SBC"], []),
+    ("top 10 most expensive works in east section",
+     ["sorted by cost descending", "section east", "at most 10 rows"], []),
+    ("works at Station 12", ["station S0012"], []),
+]
+
+
+def check_plans(engine: NLQueryEngine) -> list:
+    """Return how the plans of EXPECTED questions differ from what is expected."""
+    wrong = []
+    for question, present, absent in EXPECTED:
+        understood = engine.plan(question).understood
+        wrong += [f"{question!r} lacks {condition}" for condition in present if condition not in understood]
+        wrong += [f"{question!r} has {condition}" for condition in absent if condition in understood]
+    return wrong
+
+
+def seed(path: str, works: int):
+    rng = np.random.default_rng(22)
+    stations = [("SBC", "KSR Bengaluru", "NSG-1", "SWR", "SBC", SECTIONS[0], 200_000, 10)] + [
+        (f"S{i:04d}", f"Station {i}", CATEGORIES[i % len(CATEGORIES)], "SWR", "SBC", SECTIONS[i % len(SECTIONS)],
+         int(rng.integers(1000, 100_000)), int(rng.integers(1, 8)))
+        for i in range(2000)
+    ]
+    amenities = [
+        (code, amenity, f"PF{platform}", float(rng.integers(0, 4)))
+        for code, *_ in stations for amenity in AMENITIES for platform in range(1, 3)
+        if rng.random() < 0.6
+    ]
+    rows = [
+        (f"14.01.53.{i:08d}", PENDING_WITH[i % len(PENDING_WITH)], int(rng.integers(2015, 2025)),
+         f"{TITLES[i % len(TITLES)]} at S{i % 2000:04d}", f"S{i % 2000:04d}",
+         WORK_SECTIONS[i % len(WORK_SECTIONS)], float(rng.integers(100, 50_000)), float(rng.integers(0, 101)))
+        for i in range(works)
+    ]
+    db = Database(path)
+    db.write(lambda conn: conn.execute("PRAGMA foreign_keys = OFF;"))
+    db.write(lambda conn: conn.executemany(
+        "INSERT INTO stations (station_code, station_name, categorisation, zone, division, section, "
+        "passenger_footfall, number_of_platforms) VALUES (?, ?, ?, ?, ?, ?, ?, ?);", stations))
+    db.write(lambda conn: conn.executemany(
+        "INSERT INTO paavailability (station_code) VALUES (?);", [(code,) for code, *_ in stations]))
+    db.write(lambda conn: conn.execute("DELETE FROM station_amenities;"))
+    db.write(lambda conn: conn.executemany(
+        "INSERT INTO station_amenities (station_code, amenity, platform, quantity) VALUES (?, ?, ?, ?);",
+        amenities))
+    db.write(lambda conn: conn.executemany(
+        "INSERT INTO works (project_id, works_pending_with, year_of_sanction, short_name_of_work, station, "
+        "section, cost, financial_progress_percent) VALUES (?, ?, ?, ?, ?, ?, ?, ?);", rows))
+    db.close()
+
+
+def percentiles(seconds: list) -> str:
+    return (f"p50 {statistics.median(seconds) * 1000:7.3f} ms, "
+            f"p95 {float(np.percentile(seconds, 95)) * 1000:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Natural-language query benchmark.")
+    parser.add_argument("--works", default="10000,100000", help="Comma-separated works counts.")
+    parser.add_argument("--rounds", type=int, default=20, help="Cached passes over the corpus.")
+    parser.add_argument("--show", action="store_true", help="Print each question's plan and row count.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    for works in (int(n) for n in args.works.split(",")):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "bench.db")
+            seed(path, works)
+            db = Database(path)
+            engine = NLQueryEngine(db)
+            engine.vocabulary()
+
+            cold, cached, execute = [], [], []
+            for question in CORPUS:
+                start = time.perf_counter()
+                engine.plan(question)
+                cold.append(time.perf_counter() - start)
+            for _ in range(args.rounds):
+                for question in CORPUS:
+                    start = time.perf_counter()
+                    engine.plan(question)
+                    cached.append(time.perf_counter() - start)
+            for question in CORPUS:
+                start = time.perf_counter()
+                plan, result = engine.ask(question)
+                execute.append(time.perf_counter() - start)
+                if args.show:
+                    print(f"  {question}\n    -> {plan.target}: {'; '.join(plan.understood)} | {len(result)} rows"
+                          + (f" | ignored {plan.ignored}" if plan.ignored else ""))
+            # Cold and cached, in both cases, so a plan shared between them would show
+            wrong = check_plans(engine) + check_plans(engine)
+            assert not wrong, wrong
+            db.close()
+
+            print(f"{works:>7} works | parse {percentiles(cold)} | cached {percentiles(cached)} | "
+                  f"ask {percentiles(execute)} | {len(EXPECTED)} plans checked | {engine.stats()}")
+
+
+if __name__ == "__main__":
+    main()
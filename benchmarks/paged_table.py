@@ -0,0 +1,95 @@
+# benchmarks/paged_table.py
+#
+# The Station List over a synthetic database: the original view (every
+# station row and column read and sent on each rerun) versus paged_table
+# (one page of the shown columns). Times a rerun of each and measures what
+# it sends as CSV-encoded bytes, for the first page, a deep page reached by
+# OFFSET and the same page reached by keyset, sorted and text-filtered.
+#
+#     python -m benchmarks.paged_table --stations 10000,100000 --reruns 10
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+import pandas as pd
+from database import Database
+from paged_table import TABLE_PAGE_SIZE, station_list_source
+
+
+def seed(path: str, stations: int):
+    db = Database(path)
+    amenity_columns = [
+        column for _, column, *_ in db.connection.execute("PRAGMA table_info(paavailability);").fetchall()
+        if column not in ("id", "station_code")
+    ]
+    rows = [
+        (f"S{i:06d}", f"Station {i}", f"NSG-{i % 6 + 1}", "SWR", "SBC", f"SEC-{i % 40}", i * 7 % 100_000, i % 8 + 1)
+        for i in range(stations)
+    ]
+    db.write(lambda conn: conn.execute("PRAGMA foreign_keys = OFF;"))
+    db.write(lambda conn: conn.executemany(
+        "INSERT INTO stations (station_code, station_name, categorisation, zone, division, section, "
+        "passenger_footfall, number_of_platforms) VALUES (?, ?, ?, ?, ?, ?, ?, ?);", rows))
+    db.write(lambda conn: conn.executemany(
+        f"INSERT INTO paavailability (station_code, {', '.join(amenity_columns)}) "
+        f"VALUES (?{', ?' * len(amenity_columns)});",
+        [(code, *[f"PF1-{i % 5}, PF2-{i % 3}" for _ in amenity_columns]) for i, (code, *_) in enumerate(rows)]))
+    db.close()
+    return len(amenity_columns)
+
+
+def timed(read, reruns: int) -> tuple:
+    """Return (frame of the last run, mean seconds per run)."""
+    start = time.perf_counter()
+    for _ in range(reruns):
+        frame = read()
+    return frame, (time.perf_counter() - start) / reruns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paged table benchmark.")
+    parser.add_argument("--stations", default="10000,100000", help="Comma-separated station counts.")
+    parser.add_argument("--reruns", type=int, default=10)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    for stations in (int(n) for n in args.stations.split(",")):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "bench.db")
+            amenity_columns = seed(path, stations)
+            db = Database(path)
+            source = station_list_source(db)
+            columns = source.default_columns
+            deep = stations // TABLE_PAGE_SIZE // 2 * TABLE_PAGE_SIZE
+
+            # The cursor of the page before the deep one, as a user paging forward would hold it
+            _, cursor = source.page(columns, offset=deep - TABLE_PAGE_SIZE)
+            results = [
+                ("legacy stations", *timed(lambda: pd.read_sql_query("SELECT * FROM stations;", db.connection),
+                                           args.reruns)),
+                ("legacy joined", *timed(lambda: pd.read_sql_query(
+                    "SELECT * FROM stations s LEFT JOIN paavailability p ON p.station_code = s.station_code;",
+                    db.connection), max(1, args.reruns // 5))),
+                ("first page", *timed(lambda: source.page(columns)[0], args.reruns)),
+                ("deep, offset", *timed(lambda: source.page(columns, offset=deep)[0], args.reruns)),
+                ("deep, keyset", *timed(lambda: source.page(columns, after=cursor)[0], args.reruns)),
+                ("sorted", *timed(lambda: source.page(columns, sort="passenger_footfall", descending=True,
+                                                      offset=deep)[0], args.reruns)),
+                ("filtered", *timed(lambda: source.page(columns, filters={"categorisation": "NSG-3"},
+                                                        search="99")[0], args.reruns)),
+                ("count", *timed(lambda: pd.DataFrame({"n": [source.count({"categorisation": "NSG-3"})]}),
+                                 args.reruns)),
+            ]
+            db.close()
+
+            print(f"{stations} stations, {amenity_columns} paavailability columns")
+            for label, frame, seconds in results:
+                sent_kb = len(frame.to_csv(index=False).encode()) / 1024
+                print(f"  {label:>15} | {len(frame):>7} rows x {len(frame.columns):>3} columns | "
+                      f"{sent_kb:10.1f} KB | {seconds * 1000:9.2f} ms per rerun")
+
+
+if __name__ == "__main__":
+    main()
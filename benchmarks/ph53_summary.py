@@ -0,0 +1,67 @@
+# benchmarks/ph53_summary.py
+#
+# PH-53 summary tab: the original GROUP BY over the whole works table versus
+# reading the trigger-maintained ph53_summary rows, plus what the triggers
+# add to each edit.
+#
+#     python -m benchmarks.ph53_summary --rows 10000,100000
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+import numpy as np
+import pandas as pd
+from database import Database, PH53_SUMMARY_QUERY
+from works import WorksManager
+
+
+def seed(db: Database, rows: int):
+    rng = np.random.default_rng(3)
+    data = [
+        (f"Sr.DEN/{'EWSN'[i % 4]}/SBC", f"14.01.53.{i:08d}", float(rng.integers(0, 120)))
+        for i in range(rows)
+    ]
+    db.write(lambda conn: conn.execute("PRAGMA foreign_keys = OFF;"))
+    db.write(lambda conn: conn.executemany(
+        "INSERT INTO works (works_pending_with, project_id, financial_progress_percent) VALUES (?, ?, ?);", data))
+
+
+def timed(function, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PH-53 summary benchmark.")
+    parser.add_argument("--rows", default="10000,100000", help="Comma-separated works table sizes.")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as folder:
+        for rows in (int(n) for n in args.rows.split(",")):
+            db = Database(os.path.join(folder, f"works-{rows}.db"))
+            manager = WorksManager(db)
+            seed(db, rows)
+            assert manager.check_ph53_summary().empty
+
+            full = timed(lambda: pd.read_sql_query(PH53_SUMMARY_QUERY, db.connection), args.repeat)
+            materialized = timed(manager.summarize_ph53_works, args.repeat)
+            rng = np.random.default_rng(4)
+            edit = timed(lambda: manager.edit_work_record(
+                f"14.01.53.{int(rng.integers(0, rows)):08d}",
+                {"financial_progress_percent": float(rng.integers(0, 120))}), args.repeat)
+            assert manager.check_ph53_summary().empty
+            db.close()
+
+            print(f"{rows:>8} works | full GROUP BY {full * 1000:8.2f} ms | "
+                  f"materialized {materialized * 1000:6.2f} ms | {full / materialized:6.1f}x | "
+                  f"edit with triggers {edit * 1000:6.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
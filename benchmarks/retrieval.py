@@ -0,0 +1,96 @@
+# benchmarks/retrieval.py
+#
+# The offline BM25 retrieval index over a synthetic database: building it
+# from scratch, reopening it from disk (segment load plus a no-op sync),
+# top-k query latency, and an edit through WorksManager reaching the index.
+#
+#     python -m benchmarks.retrieval --works 10000,100000 --queries 200
+
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+import numpy as np
+from data_cache import cache
+from database import Database
+from retrieval import BM25Index, database_documents, load_retrieval_index
+from works import WorksManager
+
+WORDS = ["improvement", "circulating", "area", "provision", "platform", "shelter", "foot", "over", "bridge",
+         "lighting", "toilet", "drinking", "water", "booth", "parking", "surface", "coach", "indicator"]
+QUERIES = ["platform shelter", "foot over bridge SBC", "drinking water", "parking area improvement",
+           "coach indicator", "toilet block east", "lighting 2021"]
+
+
+def seed(path: str, works: int):
+    rng = np.random.default_rng(21)
+    stations = [(f"S{i:04d}", f"Station {i}", "NSG5", "SWR", "SBC", "east") for i in range(2000)]
+    rows = [
+        (f"14.01.53.{i:08d}", int(rng.integers(2015, 2025)),
+         " ".join(rng.choice(WORDS, 5)) + f" at S{i % 2000:04d}", f"S{i % 2000:04d}",
+         str(rng.choice(["east", "west", "north", "south"])), "Work in progress")
+        for i in range(works)
+    ]
+    db = Database(path)
+    db.write(lambda conn: conn.execute("PRAGMA foreign_keys = OFF;"))
+    db.write(lambda conn: conn.executemany(
+        "INSERT INTO stations (station_code, station_name, categorisation, zone, division, section) "
+        "VALUES (?, ?, ?, ?, ?, ?);", stations))
+    db.write(lambda conn: conn.executemany(
+        "INSERT INTO paavailability (station_code, foot_over_bridge, drinking_water_taps_pf_wise) VALUES (?, ?, ?);",
+        [(code, "1", "PF1-4, PF2-2") for code, *_ in stations]))
+    db.write(lambda conn: conn.executemany(
+        "INSERT INTO works (project_id, year_of_sanction, short_name_of_work, station, section, remarks) "
+        "VALUES (?, ?, ?, ?, ?, ?);", rows))
+    db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline retrieval index benchmark.")
+    parser.add_argument("--works", default="10000,100000", help="Comma-separated works counts.")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    for works in (int(n) for n in args.works.split(",")):
+        with tempfile.TemporaryDirectory() as folder:
+            path, directory = os.path.join(folder, "bench.db"), os.path.join(folder, "index")
+            seed(path, works)
+            db = Database(path)
+            manager = WorksManager(db)
+
+            start = time.perf_counter()
+            index = load_retrieval_index(db, manager, directory)
+            build = time.perf_counter() - start
+            index.close()
+            cache.invalidate()
+
+            start = time.perf_counter()
+            reopened = BM25Index.open(directory)
+            changes = reopened.sync(database_documents(db.connection))
+            reopen = time.perf_counter() - start
+            assert changes == {"added": 0, "removed": 0}, changes
+            reopened.close()
+
+            latencies = []
+            for i in range(args.queries):
+                start = time.perf_counter()
+                index.search(QUERIES[i % len(QUERIES)], k=10)
+                latencies.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            manager.edit_work_record("14.01.53.00000007", {"short_name_of_work": "Renovation of heritage clock tower"})
+            edit = time.perf_counter() - start
+            found = index.search("heritage clock tower", k=1)[0]["id"] == "work:14.01.53.00000007"
+            db.close()
+
+            print(f"{works:>7} works | build {build:6.2f}s | reopen+sync {reopen:6.2f}s | "
+                  f"query p50 {statistics.median(latencies) * 1000:6.2f} ms, "
+                  f"p95 {float(np.percentile(latencies, 95)) * 1000:6.2f} ms | "
+                  f"edit+index {edit * 1000:6.1f} ms (found: {found})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# benchmarks/search.py
+#
+# Lookup latency of SearchIndex against the list-comprehension / str.contains
+# filters it replaced, as the works table grows, over random titles and over
+# near-identical ones ("Provision of platform shelter {n}") where a word
+# matches every document. Results are checked against a full ranking of
+# every document.
+#
+#     python -m benchmarks.search --rows 10000,100000,300000
+
+import argparse
+import heapq
+import statistics
+import time
+import numpy as np
+import pandas as pd
+from search_index import SearchIndex, tokenize
+
+WORDS = [
+    "provision", "improvement", "circulating", "area", "platform", "shelter", "foot", "over",
+    "bridge", "lift", "escalator", "drinking", "water", "booth", "toilet", "pay", "use",
+    "extension", "raising", "surface", "coach", "indication", "board", "lighting", "station",
+    "building", "waiting", "hall", "parking", "ramp", "signage", "divyangjan", "amrit", "bharat",
+]
+QUERIES = ["circ", "platform shelter", "foot over bridge", "escalatr", "toilet sbc", "amrit bharat stn",
+           "lift", "drinking water booth", "parkng", "indication board"]
+SHELTER_QUERIES = ["shelter", "platfrom", "provision", "provision of platform", "platform shelter 123",
+                   "shel", "of", "4567", "pltform sheltr"]
+
+
+def synthetic_titles(rows: int) -> list:
+    rng = np.random.default_rng(11)
+    codes = [f"S{i:04d}".lower() for i in range(3000)]
+    titles = []
+    for i in range(rows):
+        words = rng.choice(WORDS, rng.integers(4, 9))
+        titles.append(f"{codes[i % len(codes)].upper()} - {' '.join(words).capitalize()} at {codes[(i * 7) % len(codes)].upper()}")
+    return titles
+
+
+def shelter_titles(rows: int) -> list:
+    return [f"Provision of platform shelter {n}" for n in range(rows)]
+
+
+def full_ranking(index: SearchIndex, query: str, limit: int) -> list:
+    """The top ids by the index's ranking, computed by scoring every document."""
+    token_matches = [index._matching_tokens(token) for token in dict.fromkeys(tokenize(query))]
+    phrase = " ".join(query.lower().split())
+    ranked = []
+    for doc_id, (lowered, tokens, key) in index._docs.items():
+        tiers = [min((matches[t] for t in tokens if t in matches), default=None) for matches in token_matches]
+        if None not in tiers:
+            ranked.append((sum(tiers), 0 if lowered.startswith(phrase) else 1, key, doc_id))
+    return [doc_id for *_, doc_id in heapq.nsmallest(limit, ranked)]
+
+
+def timed(func, repeat: int = 1):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Search index latency benchmark.")
+    parser.add_argument("--rows", default="10000,100000", help="Comma-separated works counts.")
+    args = parser.parse_args()
+
+    for rows in (int(n) for n in args.rows.split(",")):
+        for corpus, titles, queries in (("random", synthetic_titles(rows), QUERIES),
+                                        ("shelter", shelter_titles(rows), SHELTER_QUERIES)):
+            series = pd.Series(titles)
+
+            start = time.perf_counter()
+            index = SearchIndex(cache_size=0)
+            index.add_many(enumerate(titles))
+            build = time.perf_counter() - start
+
+            for q in queries:
+                assert index.search(q, limit=20) == full_ranking(index, q, 20), q
+            cold = [timed(lambda q=q: index.search(q, limit=20), repeat=3)[-1] for q in queries]
+            scan = [timed(lambda q=q: series[series.str.contains(q, case=False, na=False)])[0] for q in queries]
+            listcomp = [timed(lambda q=q: [t for t in titles if q.lower() in t.lower()])[0] for q in queries]
+
+            cached_index = SearchIndex()
+            cached_index.add_many(enumerate(titles))
+            for q in queries:
+                cached_index.search(q)
+            add = timed(lambda: cached_index.add(rows + 1, "Provision of lift at S0001 platform 2"), repeat=20)
+            kept = len(cached_index._cache)
+            cached = [timed(lambda q=q: cached_index.search(q), repeat=5)[-1] for q in queries]
+
+            slowest = max(zip(cold, queries))
+            print(f"{rows:>8} {corpus:>7} | build {build:6.2f}s | "
+                  f"index median {statistics.median(cold):7.3f} ms (max {slowest[0]:7.3f} for {slowest[1]!r}) | "
+                  f"cached median {statistics.median(cached):6.4f} ms | "
+                  f"str.contains median {statistics.median(scan):8.2f} ms | "
+                  f"list filter median {statistics.median(listcomp):8.2f} ms | "
+                  f"incremental add {statistics.median(add):6.4f} ms, {kept}/{len(queries)} cached queries kept")
+
+
+if __name__ == "__main__":
+    main()
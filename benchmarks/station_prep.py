@@ -0,0 +1,82 @@
+# benchmarks/station_prep.py
+#
+# Preparing a large synthetic stations file: the original per-page preparation
+# (fillna("") over every column, DISPLAY_NAME built with apply(axis=1)) versus
+# the shared prepare_station_data() (numeric columns kept numeric, vectorized
+# DISPLAY_NAME). Reports preparation time and the prepared frame's memory.
+#
+#     python -m benchmarks.station_prep --rows 100000,1000000
+
+import argparse
+import logging
+import os
+import tempfile
+import time
+import warnings
+import numpy as np
+import pandas as pd
+from data_loader import prepare_station_data
+
+
+def legacy_prepare(station_data: pd.DataFrame) -> pd.DataFrame:
+    """The preparation main.py, llm.py, na.py and DataLoader each used to do."""
+    station_data.columns = [col.strip().upper().replace(" ", "_") for col in station_data.columns]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)  # "" written into float columns
+        station_data.fillna("", inplace=True)
+    station_data["DISPLAY_NAME"] = station_data.apply(
+        lambda row: f"{row['STATION_NAME']} ({row['STATION_CODE']})", axis=1
+    )
+    return station_data
+
+
+def write_stations(path: str, template: pd.DataFrame, rows: int, block: int = 200_000):
+    """Write a stations file with the template's columns, drawing values from its own columns."""
+    rng = np.random.default_rng(3)
+    for start in range(0, rows, block):
+        ids = np.arange(start, min(start + block, rows))
+        frame = pd.DataFrame({
+            column: template[column].to_numpy()[rng.integers(0, len(template), len(ids))]
+            for column in template.columns
+        })
+        frame["Station code"] = [f"S{i:07d}" for i in ids]
+        frame["STATION NAME"] = [f"Station {i}" for i in ids]
+        frame.to_csv(path, mode="a", index=False, header=start == 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Station preparation time and memory benchmark.")
+    parser.add_argument("--stations", default="stations.csv", help="File whose columns and values are sampled.")
+    parser.add_argument("--rows", default="100000,1000000", help="Comma-separated station counts.")
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    template = pd.read_csv(args.stations)
+    for rows in (int(n) for n in args.rows.split(",")):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "stations.csv")
+            write_stations(path, template, rows)
+            raw = pd.read_csv(path)
+
+            results = {}
+            for label, prepare in (("legacy", legacy_prepare), ("shared", prepare_station_data)):
+                frame = raw.copy()
+                start = time.perf_counter()
+                prepared = prepare(frame)
+                elapsed = time.perf_counter() - start
+                results[label] = prepared
+                memory_mb = prepared.memory_usage(deep=True).sum() / 2**20
+                print(f"{rows:>8} stations | {label:>6} | prepared in {elapsed:6.2f}s | "
+                      f"frame {memory_mb:8.1f} MB")
+
+            legacy, shared = results["legacy"], results["shared"]
+            assert legacy["DISPLAY_NAME"].equals(shared["DISPLAY_NAME"])
+            for column in ("PASSENGER_FOOTFALL", "NUMBER_OF_PLATFORMS"):
+                before = legacy[column].memory_usage(deep=True) / 2**20
+                after = shared[column].memory_usage(deep=True) / 2**20
+                print(f"{'':>8}          {column:<20} {legacy[column].dtype} {before:7.1f} MB -> "
+                      f"{shared[column].dtype} {after:6.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
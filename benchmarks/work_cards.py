@@ -0,0 +1,80 @@
+# benchmarks/work_cards.py
+#
+# One rerun of the works card view: the original renderer (one st.markdown
+# per row from iterrows, CSS resent per call site) versus card_renderer (one
+# payload per page, cards reused from the fragment cache). Counts markdown
+# elements and bytes a rerun sends, and the time to build them.
+#
+#     python -m benchmarks.work_cards --rows 100,1000,10000 --reruns 20
+
+import argparse
+import logging
+import time
+import numpy as np
+import pandas as pd
+import card_renderer
+from card_renderer import PAGE_SIZE, WORK_CARD, cards_html
+
+
+def synthetic_works(rows: int) -> pd.DataFrame:
+    rng = np.random.default_rng(9)
+    return pd.DataFrame({
+        "PROJECTID": [f"14.01.53.{i:08d}" for i in range(rows)],
+        "Year of Sanction": rng.choice(["2019-2020", "2020-2021", "2021-2022"], rows),
+        "Short Name of Work": [f"Improvement to circulating area {i}" for i in range(rows)],
+        "Current Cost": rng.integers(100, 50_000, rows),
+        "Financial Progress": rng.integers(0, 100, rows),
+        "Remarks as on 14/06/24": "Work in progress",
+    })
+
+
+def legacy_messages(work_data: pd.DataFrame) -> list:
+    """The markdown elements the original render_work_cards sent, in order."""
+    messages = [WORK_CARD.css, '<div class="card-container">']
+    for _, row in work_data.iterrows():
+        messages.append(
+            f"""
+            <div class="card">
+                <h3>{row.get('Short Name of Work', 'No Title')}</h3>
+                <p><b>📅 Year of Sanction:</b> {row.get('Year of Sanction', 'N/A')}</p>
+                <p><b>💰 Current Cost:</b> {row.get('Current Cost', 'N/A')}</p>
+                <p><b>📊 Financial Progress:</b> {row.get('Financial Progress', 'N/A')}</p>
+                <p><b>📝 Remarks:</b> {row.get('Remarks as on 14/06/24', 'N/A')}</p>
+            </div>
+            """
+        )
+    messages.append("</div>")
+    return messages
+
+
+def timed(build, reruns: int) -> tuple:
+    """Return (messages of the last run, mean seconds per run)."""
+    start = time.perf_counter()
+    for _ in range(reruns):
+        messages = build()
+    return messages, (time.perf_counter() - start) / reruns
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Work card rendering benchmark.")
+    parser.add_argument("--rows", default="100,1000,10000", help="Comma-separated works counts.")
+    parser.add_argument("--reruns", type=int, default=20)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    for rows in (int(n) for n in args.rows.split(",")):
+        works = synthetic_works(rows)
+        card_renderer._fragments.clear()
+        page = works.iloc[:PAGE_SIZE]
+
+        results = [("legacy", *timed(lambda: legacy_messages(works), args.reruns))]
+        results.append(("first page", *timed(lambda: [cards_html(page, WORK_CARD)], 1)))
+        results.append(("cached page", *timed(lambda: [cards_html(page, WORK_CARD)], args.reruns)))
+        for label, messages, seconds in results:
+            sent_kb = sum(len(message.encode()) for message in messages) / 1024
+            print(f"{rows:>6} works | {label:>11} | {len(messages):>6} markdown elements | "
+                  f"{sent_kb:9.1f} KB | {seconds * 1000:8.2f} ms per rerun")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/works_explode.py
+#
+# Compare the shared vectorized explode_stations with the per-row
+# iterrows()/row.copy() loop it replaced, on synthetic works files.
+#
+#     python -m benchmarks.works_explode --rows 10000,100000,300000
+
+import argparse
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from data_loader import explode_stations
+
+
+def synthetic_works(rows: int, max_stations: int = 4) -> pd.DataFrame:
+    """Works shaped like works.csv with 1..max_stations station codes per row."""
+    rng = np.random.default_rng(7)
+    codes = np.array([f"S{i:04d}" for i in range(2000)])
+    counts = rng.integers(1, max_stations + 1, rows)
+    stations = [", ".join(rng.choice(codes, n)) for n in counts]
+    return pd.DataFrame({
+        "SN": np.arange(1, rows + 1),
+        "PROJECTID": [f"14.01.53.{i:08d}" for i in range(rows)],
+        "Year of Sanction": rng.choice(["2019-2020", "2021-2022", "2023-2024"], rows),
+        "Short Name of Work": [f"Improvement to circulating area {i}" for i in range(rows)],
+        "Station": stations,
+        "Current Cost": rng.integers(100, 50_000, rows),
+        "Expenditure upto date": rng.random(rows) * 10_000,
+        "Financial Progress": rng.random(rows) * 100,
+        "Section": rng.choice(["east", "west", "north", "south"], rows),
+    })
+
+
+def legacy_explode(works_data: pd.DataFrame, column: str = "Station") -> pd.DataFrame:
+    """The loop previously duplicated in llm.py, main.py, na.py and data_loader.py."""
+    expanded_rows = []
+    for _, row in works_data.iterrows():
+        stations = str(row[column]).split(",")
+        for station in stations:
+            station = station.strip()
+            new_row = row.copy()
+            new_row[column] = station
+            expanded_rows.append(new_row)
+    return pd.DataFrame(expanded_rows)
+
+
+def measure(func, works):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(works)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Works station explode benchmark.")
+    parser.add_argument("--rows", default="10000,100000", help="Comma-separated works counts.")
+    parser.add_argument("--legacy-max", type=int, default=20_000,
+                        help="Skip the row-by-row loop above this many works (it is slow).")
+    args = parser.parse_args()
+
+    for rows in (int(n) for n in args.rows.split(",")):
+        works = synthetic_works(rows)
+        result, fast, fast_mem = measure(explode_stations, works)
+        line = f"{rows:>8} works -> {len(result):>8} rows | vectorized {fast:7.3f}s {fast_mem:8.1f} MiB"
+        if rows <= args.legacy_max:
+            expected, slow, slow_mem = measure(legacy_explode, works)
+            assert expected.index.equals(result.index)
+            assert expected["Station"].tolist() == result["Station"].tolist()
+            line += f" | row loop {slow:8.3f}s {slow_mem:8.1f} MiB | speedup {slow / fast:7.1f}x"
+        print(line)
+        print(f"{'':>8} dtypes kept: {dict(result.dtypes.drop('Station').astype(str))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+# card_renderer.py
+
+import copy
+import hashlib
+import html
+import logging
+import re
+import threading
+from collections import OrderedDict
+import pandas as pd
+import streamlit as st
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s]: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Cards shown per page, and rendered cards kept across reruns and sessions
+PAGE_SIZE = 24
+FRAGMENT_CACHE_SIZE = 5000
+
+
+class CardTemplate:
+    """
+    How one kind of card looks: its stylesheet, card class and labelled fields.
+
+    The stylesheet is compacted once, when the template is created, and sent
+    with every page in the same payload as the cards. A field column ending
+    in "*" is a prefix, for columns whose name carries a date ("Remarks as on
+    14/06/24"); it is matched against the frame's columns by for_columns().
+    """
+
+    def __init__(self, name: str, css: str, card_class: str, title: tuple, fields: list, title_tag: str = "h3"):
+        """
+        Parameters:
+            name (str): Template name, used in widget keys.
+            css (str): Stylesheet for the grid (class "card-grid") and the cards.
+            card_class (str): CSS class of each card's <div>.
+            title (tuple): (column, default, prefix) of the card heading.
+            fields (list): (label, column, default) of each line below the heading;
+                           a column ending in "*" matches the first column with that prefix.
+            title_tag (str): Heading tag.
+        """
+        self.name = name
+        self.css = "<style>" + re.sub(r"\s+", " ", css).strip() + "</style>"
+        self.card_class = card_class
+        self.title = title
+        self.title_tag = title_tag
+        self._compile(fields)
+        self._resolved = {}
+
+    def _compile(self, fields: list):
+        self.fields = list(fields)
+        self.columns = list(dict.fromkeys([self.title[0], *(column for _, column, _ in self.fields)]))
+        # Fragments of different templates never share cache entries
+        self.signature = hashlib.blake2b(
+            repr((self.card_class, self.title, self.fields, self.title_tag)).encode(), digest_size=8
+        ).hexdigest()
+
+    def for_columns(self, columns) -> "CardTemplate":
+        """
+        Return the template with its prefix columns resolved against a frame's columns.
+
+        Prefixes nothing matches are left as they are, so their fields show the
+        default. One resolved template is kept per set of matches.
+
+        Parameters:
+            columns: Column names of the frame to render.
+
+        Returns:
+            CardTemplate: This template when it has no prefix columns, else a resolved copy.
+        """
+        resolved = tuple(_match_prefix(column, columns) for _, column, _ in self.fields)
+        if resolved == tuple(column for _, column, _ in self.fields):
+            return self
+        template = self._resolved.get(resolved)
+        if template is None:
+            template = copy.copy(self)
+            template._compile([(label, column, default)
+                               for (label, _, default), column in zip(self.fields, resolved)])
+            self._resolved[resolved] = template
+        return template
+
+    def fragment(self, values: dict) -> str:
+        """Return the HTML of one card from a column -> value mapping (values are escaped)."""
+        column, default, prefix = self.title
+        lines = [f"<{self.title_tag}>{prefix}{_cell(values.get(column), default)}</{self.title_tag}>"]
+        lines += [f"<p><b>{label}:</b> {_cell(values.get(column), default)}</p>" for label, column, default in self.fields]
+        return f'<div class="{self.card_class}">{"".join(lines)}</div>'
+
+
+def _match_prefix(column: str, columns) -> str:
+    """Resolve a "prefix*" column to the first of columns starting with the prefix."""
+    if not column.endswith("*"):
+        return column
+    return next((name for name in columns if str(name).startswith(column[:-1])), column)
+
+
+def _cell(value, default: str) -> str:
+    """Escape one card value; missing values show the default."""
+    if value is None or (isinstance(value, float) and value != value):
+        return html.escape(default)
+    return html.escape(str(value))
+
+
+_fragments = OrderedDict()
+_fragments_lock = threading.Lock()
+_fragment_stats = {"hits": 0, "misses": 0}
+
+
+def card_fragments(frame: pd.DataFrame, template: CardTemplate) -> list:
+    """
+    Return the HTML of each row's card, reusing cards rendered before.
+
+    Cards are cached process-wide under the template signature and a 64-bit
+    hash of the row's values in the template's columns, so a card is built
+    again only when one of the values it shows changes.
+
+    Parameters:
+        frame (pd.DataFrame): Rows to render (typically one page).
+        template (CardTemplate): Card layout.
+
+    Returns:
+        list: One HTML string per row, in row order.
+    """
+    template = template.for_columns(frame.columns)
+    columns = [column for column in template.columns if column in frame.columns]
+    if frame.empty:
+        return []
+    hashes = pd.util.hash_pandas_object(frame[columns], index=False).tolist() if columns else [0] * len(frame)
+
+    fragments, missing = [], []
+    with _fragments_lock:
+        for position, row_hash in enumerate(hashes):
+            key = (template.signature, row_hash)
+            fragment = _fragments.get(key)
+            if fragment is None:
+                missing.append(position)
+            else:
+                _fragments.move_to_end(key)
+            fragments.append(fragment)
+        _fragment_stats["hits"] += len(hashes) - len(missing)
+        _fragment_stats["misses"] += len(missing)
+
+    if missing:
+        rows = frame[columns].iloc[missing]
+        values = zip(*(rows[column].tolist() for column in columns)) if columns else ((),) * len(missing)
+        built = [template.fragment(dict(zip(columns, row))) for row in values]
+        with _fragments_lock:
+            for position, fragment in zip(missing, built):
+                fragments[position] = fragment
+                _fragments[(template.signature, hashes[position])] = fragment
+            while len(_fragments) > FRAGMENT_CACHE_SIZE:
+                _fragments.popitem(last=False)
+    return fragments
+
+
+def fragment_cache_stats() -> dict:
+    """Return the card cache's hits, misses and current size."""
+    with _fragments_lock:
+        return {**_fragment_stats, "size": len(_fragments)}
+
+
+def cards_html(frame: pd.DataFrame, template: CardTemplate, caption: str = "") -> str:
+    """Return one HTML payload with the stylesheet, an optional caption and the card grid."""
+    caption = f'<p class="card-grid-caption">{html.escape(caption)}</p>' if caption else ""
+    return f'{template.css}{caption}<div class="card-grid">{"".join(card_fragments(frame, template))}</div>'
+
+
+def render_cards(frame: pd.DataFrame, template: CardTemplate, key: str = None,
+                 page_size: int = PAGE_SIZE, empty_message: str = "No works found."):
+    """
+    Render a frame as a grid of cards, one page at a time.
+
+    Only the current page is rendered, and it is sent as a single markdown
+    element. A page selector is shown when there is more than one page.
+
+    Parameters:
+        frame (pd.DataFrame): Rows to show.
+        template (CardTemplate): Card layout.
+        key (str, optional): Widget key prefix; needed when one script shows several grids.
+        page_size (int): Cards per page.
+        empty_message (str): Warning shown when the frame is empty.
+    """
+    if frame.empty:
+        st.warning(empty_message)
+        return
+
+    pages = -(-len(frame) // page_size)
+    page = 1
+    if pages > 1:
+        page_key = f"{key or template.name}.page"
+        # A shorter result than last rerun must not leave the selector past its last page
+        if st.session_state.get(page_key, 1) > pages:
+            st.session_state[page_key] = pages
+        page = int(st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=page_key))
+
+    start = (page - 1) * page_size
+    rows = frame.iloc[start:start + page_size]
+    caption = f"Showing {start + 1}–{start + len(rows)} of {len(frame)}" if pages > 1 else ""
+    st.markdown(cards_html(rows, template, caption), unsafe_allow_html=True)
+
+
+# Card layout of the works views in main.py, llm.py and ui_renderer.py
+WORK_CARD_CSS = """
+    .card-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
+        gap: 20px;
+        margin-top: 20px;
+    }
+    .card-grid-caption {
+        color: #555;
+        margin: 0;
+    }
+    .card {
+        border: 1px solid #ddd;
+        border-radius: 15px;
+        background: linear-gradient(to bottom, #f8f9fa, #ffffff);
+        padding: 20px;
+        box-shadow: 0 8px 16px rgba(0, 0, 0, 0.2);
+        transition: transform 0.3s ease, box-shadow 0.3s ease;
+    }
+    .card:hover {
+        transform: translateY(-5px);
+        box-shadow: 0 12px 24px rgba(0, 0, 0, 0.3);
+    }
+    .card h3 {
+        font-size: 1.5rem;
+        color: #333;
+        margin-bottom: 10px;
+        text-align: center;
+        border-bottom: 2px solid #007BFF;
+        padding-bottom: 5px;
+    }
+    .card p {
+        font-size: 1rem;
+        color: #555;
+        margin: 8px 0;
+    }
+    .card p b {
+        color: #007BFF;
+    }
+"""
+
+WORK_CARD = CardTemplate(
+    "works", WORK_CARD_CSS, "card",
+    title=("Short Name of Work", "No Title", ""),
+    fields=[
+        ("📅 Year of Sanction", "Year of Sanction", "N/A"),
+        ("💰 Current Cost", "Current Cost", "N/A"),
+        ("📊 Financial Progress", "Financial Progress", "N/A"),
+        ("📝 Remarks", "Remarks as on*", "N/A"),
+    ],
+)
+
+# Card layout for works frames with upper-cased, underscored column names
+UPPER_WORK_CARD = CardTemplate(
+    "works.upper",
+    """
+    .card-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fill, minmax(300px, 1fr));
+        gap: 20px;
+        padding: 10px;
+    }
+    .card-grid-caption {
+        color: #555;
+        margin: 0;
+    }
+    .work-card {
+        background: #FFF;
+        border: 1px solid #DDD;
+        border-radius: 10px;
+        padding: 20px;
+        box-shadow: 0 4px 10px rgba(0, 0, 0, 0.1);
+    }
+    .work-card h4 {
+        font-size: 1.2rem;
+        color: #333;
+    }
+    .work-card p {
+        font-size: 1rem;
+        margin: 5px 0;
+        color: #555;
+    }
+    """,
+    "work-card",
+    title=("SHORT_NAME_OF_WORK", "N/A", "🛠 "),
+    fields=[
+        ("Project ID", "PROJECTID", "N/A"),
+        ("Current Cost", "CURRENT_COST", "N/A"),
+        ("Remarks", "REMARKS_AS_ON*", "N/A"),
+    ],
+    title_tag="h4",
+)
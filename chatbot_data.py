@@ -0,0 +1,188 @@
+# chatbot_data.py
+
+import logging
+import pandas as pd
+from card_renderer import UPPER_WORK_CARD, WORK_CARD, CardTemplate
+from data_cache import cache, file_fingerprint
+from data_index import DataIndex
+from data_loader import DataLoader
+from search_index import SearchIndex
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s]: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+
+class WorksSchema:
+    """
+    The works column names one entry point works with.
+
+    Every schema is a renamed view of the same prepared works frame, so the
+    entry points share one copy of the data whatever names they use. A
+    schema that fills blanks keeps its own filled copy, once per process
+    with its cached chatbot.
+    """
+
+    def __init__(self, name: str, card: CardTemplate, rename=None, station: str = "Station",
+                 year: str = "Year of Sanction", section: str = "Section", title: str = "Short Name of Work",
+                 fill_blanks: bool = False):
+        """
+        Parameters:
+            name (str): Schema name, part of the chatbot cache key.
+            card (CardTemplate): Card layout for works in this schema.
+            rename (callable, optional): Maps works.csv headers to this schema's names.
+            station (str): Column with one station code per row (after exploding).
+            year (str): Year of sanction column.
+            section (str): Section column.
+            title (str): Short name of work column.
+            fill_blanks (bool): Replace missing values with "" in every column, so cards,
+                                tables and filters never see NaN.
+        """
+        self.name = name
+        self.card = card
+        self.rename = rename
+        self.station = station
+        self.year = year
+        self.section = section
+        self.title = title
+        self.fill_blanks = fill_blanks
+
+    def view(self, works_data: pd.DataFrame) -> pd.DataFrame:
+        """Return the works frame with this schema's column names, sharing its data unless blanks are filled."""
+        if self.fill_blanks:
+            works_data = works_data.fillna("")
+        if self.rename is None:
+            return works_data
+        return works_data.rename(columns=self.rename, copy=False)
+
+
+def upper_column(column: str) -> str:
+    """"Year of Sanction" -> "YEAR_OF_SANCTION"."""
+    return column.strip().upper().replace(" ", "_")
+
+
+# works.csv headers as they are (main.py, llm.py)
+SOURCE_SCHEMA = WorksSchema("source", WORK_CARD)
+
+# Upper-cased, underscored headers, like the station columns, and blanks as "" (na.py)
+UPPER_SCHEMA = WorksSchema(
+    "upper", UPPER_WORK_CARD, rename=upper_column,
+    station="STATION", year="YEAR_OF_SANCTION", section="SECTION", title="SHORT_NAME_OF_WORK",
+    fill_blanks=True,
+)
+
+
+def load_dataset(station_csv: str = "stations.csv", works_csv: str = "works.csv") -> tuple:
+    """
+    Return the process-wide prepared station and works frames.
+
+    Frames are loaded once per process through DataLoader (and its on-disk
+    frame cache) and reloaded only when a CSV file changes. They are shared
+    by every session and schema and must be treated as read-only.
+
+    Returns:
+        tuple: (station frame, works frame with one row per station).
+    """
+    loader = DataLoader(station_csv, works_csv)
+    station_data = cache.get_or_load(
+        ("stations", station_csv), lambda: file_fingerprint(station_csv), loader.load_station_data
+    )
+    works_data = cache.get_or_load(
+        ("works", works_csv), lambda: file_fingerprint(works_csv), loader.load_works_data
+    )
+    return station_data, works_data
+
+
+class RailwayAmenitiesChatbot:
+    def __init__(self, station_csv: str = "stations.csv", works_csv: str = "works.csv",
+                 schema: WorksSchema = SOURCE_SCHEMA):
+        self.station_csv = station_csv
+        self.works_csv = works_csv
+        self.schema = schema
+        try:
+            logging.info("Loading station and works data...")
+            self.station_data, works_data = load_dataset(station_csv, works_csv)
+            self.works_data = schema.view(works_data)
+            logging.info("Station and works data loaded successfully.")
+            self._build_index()
+        except Exception as e:
+            logging.error(f"Failed to load or process data: {e}")
+            raise
+
+    def _build_index(self):
+        """Index stations and works once so lookups never scan the frames."""
+        schema = self.schema
+        self.index = DataIndex()
+        self.index.add("station", self.station_data, "STATION_CODE")
+        self.index.add("station.display", self.station_data, "DISPLAY_NAME")
+        self.index.add("works.station", self.works_data, schema.station)
+        self.index.add("works.year", self.works_data, schema.year)
+        self.index.add("works.section", self.works_data, schema.section)
+        self.station_search = SearchIndex()
+        self.station_search.add_many((name, name) for name in self.station_data["DISPLAY_NAME"])
+        works = self.works_data[~self.works_data.index.duplicated()]
+        self.works_search = SearchIndex()
+        self.works_search.add_many(zip(works.index, (
+            works[schema.title].fillna("").astype(str) + " "
+            + works[schema.section].fillna("").astype(str) + " "
+            + works[schema.year].fillna("").astype(str)
+        )))
+
+    def get_station_names(self):
+        """Return a list of station display names."""
+        return self.station_data["DISPLAY_NAME"].tolist()
+
+    def get_station_details(self, station_name):
+        """Retrieve details for a selected station."""
+        try:
+            station_row = self.index.first("station.display", station_name)
+            if station_row is not None:
+                return station_row.to_dict()
+            else:
+                return None
+        except Exception as e:
+            logging.error(f"Error retrieving station details: {e}")
+            return None
+
+    def get_station_works(self, station_name):
+        """Retrieve works for the selected station."""
+        try:
+            station_works = self.index.rows("works.station", station_name)
+            return station_works
+        except Exception as e:
+            logging.error(f"Error retrieving works for station: {e}")
+            return pd.DataFrame()
+
+    def filter_works(self, query=None, year=None, section=None):
+        """Filter works by query, year, or section."""
+        year_column, section_column = self.schema.year, self.schema.section
+        if query:
+            # Ranked title/section/year matches from the search index, then narrowed.
+            filtered_data = self.works_data.loc[self.works_search.search(query, limit=None)]
+            if year:
+                filtered_data = filtered_data[filtered_data[year_column] == year]
+            if section:
+                filtered_data = filtered_data[filtered_data[section_column] == section]
+            return filtered_data
+        if year:
+            filtered_data = self.index.rows("works.year", year)
+            if section:
+                filtered_data = filtered_data[filtered_data[section_column] == section]
+        elif section:
+            filtered_data = self.index.rows("works.section", section)
+        else:
+            filtered_data = self.works_data
+        return filtered_data
+
+
+def load_chatbot(station_csv: str = "stations.csv", works_csv: str = "works.csv",
+                 schema: WorksSchema = SOURCE_SCHEMA) -> RailwayAmenitiesChatbot:
+    """Return the process-wide chatbot for a schema, rebuilt only when either CSV file changes."""
+    return cache.get_or_load(
+        ("chatbot", schema.name, station_csv, works_csv),
+        lambda: file_fingerprint(station_csv, works_csv),
+        lambda: RailwayAmenitiesChatbot(station_csv, works_csv, schema),
+    )
@@ -0,0 +1,154 @@
+# compliance.py
+
+import sqlite3
+import numpy as np
+import pandas as pd
+from amenity_store import minimum_requirements
+from data_cache import cache, db_fingerprint
+from database import Database
+from norms import RailwayAmenities, normalize_category
+
+
+class ComplianceEngine:
+    """
+    Compare every station with the minimum-amenity norms in one vectorized pass.
+
+    The numeric NSG/HG norms are compiled once into a requirement matrix
+    (category x amenity). The availability matrix (station x amenity) comes
+    from one grouped query over the typed station_amenities rows, so the wide
+    paavailability text columns are never read or parsed again; the
+    requirement row of each station's category is gathered with one
+    fancy-indexing step into a ComplianceMatrices snapshot.
+    """
+
+    def __init__(self, norms: RailwayAmenities = None):
+        """
+        Compile the requirement matrix.
+
+        Parameters:
+            norms (RailwayAmenities, optional): Source of the norms; defaults to RailwayAmenities().
+        """
+        requirements = minimum_requirements(norms or RailwayAmenities())
+        self.categories = pd.Index(sorted({category for category, _, _, _ in requirements}))
+        self.amenities = list(dict.fromkeys(amenity for _, amenity, _, _ in requirements))
+        self.basis = {amenity: basis for _, amenity, basis, _ in requirements}
+
+        # The extra all-NaN last row is what get_indexer's -1 (unknown category) selects.
+        self.requirements = np.full((len(self.categories) + 1, len(self.amenities)), np.nan)
+        amenity_positions = {amenity: i for i, amenity in enumerate(self.amenities)}
+        for category, amenity, _, required in requirements:
+            self.requirements[self.categories.get_loc(category), amenity_positions[amenity]] = required
+
+    def requirement_frame(self) -> pd.DataFrame:
+        """Return the requirement matrix as a category x amenity frame."""
+        return pd.DataFrame(self.requirements[:-1], index=self.categories, columns=self.amenities)
+
+    def availability(self, conn: sqlite3.Connection, station_codes) -> np.ndarray:
+        """
+        Build the station x amenity availability matrix from the typed station_amenities rows.
+
+        One grouped query returns each station's total and worst platform per
+        amenity; per-platform norms use the worst platform, station norms the
+        total. An amenity with no rows for a station (absent, blank or
+        unparseable in paavailability) counts as 0.
+
+        Parameters:
+            conn (sqlite3.Connection): Database connection.
+            station_codes (array-like): Stations to build rows for, in order; must be unique.
+
+        Returns:
+            np.ndarray: One row per station code, one column per amenity in self.amenities.
+        """
+        rows = pd.read_sql_query(
+            "SELECT station_code, amenity, SUM(quantity) AS total, MIN(quantity) AS lowest "
+            f"FROM station_amenities WHERE amenity IN ({', '.join('?' for _ in self.amenities)}) "
+            "GROUP BY amenity, station_code;",
+            conn,
+            params=self.amenities,
+        )
+        available = np.zeros((len(station_codes), len(self.amenities)))
+        stations = pd.Index(station_codes).get_indexer(rows["station_code"])
+        amenities = pd.Index(self.amenities).get_indexer(rows["amenity"])
+        per_platform = np.array([self.basis[amenity] == "platform" for amenity in self.amenities])[amenities]
+        values = np.where(per_platform, rows["lowest"].to_numpy(), rows["total"].to_numpy())
+        known = stations >= 0
+        available[stations[known], amenities[known]] = values[known]
+        return available
+
+    def matrices(self, conn: sqlite3.Connection) -> "ComplianceMatrices":
+        """Read the surveyed stations and build their required and available matrices."""
+        stations = pd.read_sql_query(
+            "SELECT station_code, amenities AS category FROM paavailability ORDER BY station_code;", conn
+        )
+        codes = stations["station_code"].to_numpy()
+        required = self.requirements[self.categories.get_indexer(stations["category"].map(normalize_category))]
+        return ComplianceMatrices(codes, stations["category"].to_numpy(), self.amenities, required,
+                                  self.availability(conn, codes))
+
+
+class ComplianceMatrices:
+    """
+    The required and available station x amenity matrices of one version of the data.
+
+    Built once per data version (see load_compliance); the shortfalls are
+    computed with the matrices, so gaps() and shortfall_report() only index
+    arrays and never touch the database.
+    """
+
+    def __init__(self, station_codes: np.ndarray, categories: np.ndarray, amenities: list,
+                 required: np.ndarray, available: np.ndarray):
+        """
+        Parameters:
+            station_codes (np.ndarray): One code per matrix row.
+            categories (np.ndarray): Each station's category as surveyed.
+            amenities (list): One amenity per matrix column.
+            required (np.ndarray): Norm per station and amenity; NaN where the category has none.
+            available (np.ndarray): Available count per station and amenity.
+        """
+        self.station_codes = station_codes
+        self.categories = categories
+        self.amenities = amenities
+        self.required = required
+        self.available = available
+        # NaN requirements compare False, so stations without a norm never fall short
+        self.short_rows, self.short_amenities = np.nonzero(available < required)
+
+    def gaps(self) -> pd.DataFrame:
+        """
+        Return the station x amenity shortfall table.
+
+        Returns:
+            pd.DataFrame: Indexed by station_code, one column per amenity holding the
+                          shortfall (0 when compliant, NaN when there is no norm for the
+                          station's category).
+        """
+        shortfall = np.maximum(self.required - self.available, 0.0)
+        return pd.DataFrame(shortfall, index=self.station_codes, columns=self.amenities)
+
+    def shortfall_report(self) -> pd.DataFrame:
+        """
+        Return the gaps as one row per station and amenity that falls short.
+
+        Returns:
+            pd.DataFrame: station_code, category, amenity, required, available, shortfall.
+        """
+        rows, amenities = self.short_rows, self.short_amenities
+        required = self.required[rows, amenities]
+        available = self.available[rows, amenities]
+        return pd.DataFrame({
+            "station_code": self.station_codes[rows],
+            "category": self.categories[rows],
+            "amenity": np.array(self.amenities, dtype=object)[amenities],
+            "required": required,
+            "available": available,
+            "shortfall": required - available,
+        })
+
+
+def load_compliance(db: Database) -> ComplianceMatrices:
+    """Return the process-wide compliance matrices, rebuilt only when the database changes."""
+    return cache.get_or_load(
+        ("compliance", db.db_path),
+        lambda: db_fingerprint(db),
+        lambda: ComplianceEngine().matrices(db.connection),
+    )
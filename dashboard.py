@@ -0,0 +1,116 @@
+# dashboard.py
+
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+from data_cache import cache, db_fingerprint
+from database import Database
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s]: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Figure sets kept, one per distinct station summary
+FIGURE_CACHE_SIZE = 16
+
+_figures = OrderedDict()
+_figures_lock = threading.Lock()
+
+
+def _counts(summary: pd.DataFrame, dimension: str) -> pd.DataFrame:
+    """Rows of one dimension as (value, stations), largest first; '' (no value) is left out."""
+    rows = summary[(summary["dimension"] == dimension) & (summary["value"] != "")]
+    return rows[["value", "stations"]].sort_values(["stations", "value"], ascending=[False, True], kind="stable")
+
+
+class DashboardAggregates:
+    """
+    Every figure the dashboard's Overview and Analysis tabs show, from one read of station_summary.
+
+    station_summary is kept current by triggers on stations, so this costs
+    the same however many stations there are. The Plotly figures are built
+    once per distinct summary and kept, so reruns and writes that leave the
+    station counts unchanged (works edits, remarks) reuse the same objects.
+    """
+
+    def __init__(self, summary: pd.DataFrame):
+        """
+        Parameters:
+            summary (pd.DataFrame): station_summary rows (dimension, value, detail, stations).
+        """
+        summary = summary.sort_values(["dimension", "value", "detail"], kind="stable").reset_index(drop=True)
+        dimensions = summary["dimension"].value_counts()
+        self.metrics = {
+            "Total Stations": int(summary.loc[summary["dimension"] == "categorisation", "stations"].sum()),
+            "Total Categories": int(dimensions.get("categorisation", 0)),
+            "Total Zones": int(dimensions.get("zone", 0)),
+            "Total Sections": int(dimensions.get("section", 0)),
+        }
+
+        self.category_counts = _counts(summary, "categorisation").rename(
+            columns={"value": "categorisation", "stations": "count"})
+        self.zone_counts = _counts(summary, "zone").rename(columns={"value": "Zone", "stations": "Count"})
+        self.earnings_counts = _counts(summary, "earnings_range").rename(
+            columns={"value": "earnings_range", "stations": "count"})
+
+        # Section-wise analysis: station count and most common category per section
+        sections = _counts(summary, "section").sort_values("value", kind="stable")
+        pairs = summary[(summary["dimension"] == "section_category") & (summary["detail"] != "")]
+        common = (pairs.sort_values(["stations", "detail"], ascending=[False, True], kind="stable")
+                  .drop_duplicates("value").set_index("value")["detail"])
+        self.section_stats = pd.DataFrame({
+            "Section": sections["value"].to_numpy(),
+            "Station Count": sections["stations"].to_numpy(),
+            "Most Common Category": sections["value"].map(common).fillna("N/A").to_numpy(),
+        })
+
+        self.signature = hashlib.blake2b(
+            pd.util.hash_pandas_object(summary, index=False).to_numpy().tobytes(), digest_size=16
+        ).hexdigest()
+        self.figures = self._build_figures()
+
+    @classmethod
+    def from_db(cls, conn) -> "DashboardAggregates":
+        """Read station_summary and compute the aggregates."""
+        summary = pd.read_sql_query("SELECT dimension, value, detail, stations FROM station_summary;", conn)
+        return cls(summary)
+
+    def _build_figures(self) -> dict:
+        """Figures for this summary, built only the first time it is seen."""
+        with _figures_lock:
+            figures = _figures.get(self.signature)
+            if figures is not None:
+                _figures.move_to_end(self.signature)
+                return figures
+        figures = {
+            "categories": px.pie(self.category_counts, names="categorisation", values="count",
+                                 title="Distribution by Category", hole=0.4),
+            "zones": px.bar(self.zone_counts, x="Zone", y="Count", title="Stations by Zone"),
+            "earnings": px.bar(self.earnings_counts, x="earnings_range", y="count",
+                               title="Distribution of Stations by Earnings Range"),
+        }
+        with _figures_lock:
+            _figures[self.signature] = figures
+            while len(_figures) > FIGURE_CACHE_SIZE:
+                _figures.popitem(last=False)
+        return figures
+
+    def figure(self, name: str) -> go.Figure:
+        """Return a cached figure ("categories", "zones" or "earnings"); it is shared and must not be modified."""
+        return self.figures[name]
+
+
+def load_dashboard(db: Database) -> DashboardAggregates:
+    """Return the process-wide dashboard aggregates, re-read from station_summary when the database changes."""
+    return cache.get_or_load(
+        ("dashboard", db.db_path),
+        lambda: db_fingerprint(db),
+        lambda: DashboardAggregates.from_db(db.connection),
+    )
@@ -0,0 +1,251 @@
+# data_cache.py
+
+import logging
+import os
+import threading
+import time
+from database import Database
+from ingest import ImportJob
+from works import WorksManager
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s]: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+
+def file_fingerprint(*paths) -> tuple:
+    """
+    Fingerprint source files by modification time and size.
+
+    Parameters:
+        *paths (str): Files the cached value was built from.
+
+    Returns:
+        tuple: One (path, mtime_ns, size) entry per file; missing files give (path, None, None).
+    """
+    fingerprint = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            fingerprint.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            fingerprint.append((path, None, None))
+    return tuple(fingerprint)
+
+
+def db_fingerprint(db: Database, own_writes: bool = True) -> tuple:
+    """
+    Fingerprint the contents of a SQLite database.
+
+    The writer connection's ``PRAGMA data_version`` changes when another
+    process commits, and the Database's write counters change when this
+    process writes, so together they cover every change. The values are the
+    same from every thread, so all sessions share one cache entry.
+
+    Parameters:
+        db (Database): The database the cached value was read from.
+        own_writes (bool): Include writes whose listeners were notified. Pass False
+                           for values that WorksManager listeners keep up to date themselves.
+
+    Returns:
+        tuple: (db_path, data_version, write counter).
+    """
+    data_version, writes, unannounced_writes = db.versions()
+    return (db.db_path, data_version, writes if own_writes else unannounced_writes)
+
+
+def schema_fingerprint(db: Database) -> tuple:
+    """
+    Fingerprint the schema of a SQLite database.
+
+    ``PRAGMA schema_version`` moves with every CREATE, ALTER and DROP, from
+    any connection. db_fingerprint() does not cover these: the write counters
+    only move when a write changes rows.
+
+    Parameters:
+        db (Database): The database the cached value was read from.
+
+    Returns:
+        tuple: (db_path, schema_version).
+    """
+    return (db.db_path, db.connection.execute("PRAGMA schema_version;").fetchone()[0])
+
+
+class DataCache:
+    """
+    A process-wide cache of loaded data shared by every Streamlit session.
+
+    Each entry is stored with the fingerprint of its sources and reloaded when
+    the fingerprint changes. Values are shared between sessions and must be
+    treated as read-only by callers.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._key_locks = {}
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def _key_lock(self, key):
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _record(self, key, hit: bool, load_seconds: float = 0.0):
+        with self._lock:
+            entry = self._stats.setdefault(key, {"hits": 0, "misses": 0, "load_seconds": 0.0, "last_load_seconds": 0.0})
+            if hit:
+                entry["hits"] += 1
+            else:
+                entry["misses"] += 1
+                entry["load_seconds"] += load_seconds
+                entry["last_load_seconds"] = load_seconds
+
+    def get_or_load(self, key, fingerprint, loader, on_evict=None):
+        """
+        Return the cached value for a key, loading it when missing or stale.
+
+        Parameters:
+            key (hashable): Cache key.
+            fingerprint (callable): Returns the current fingerprint of the sources.
+            loader (callable): Builds the value on a miss.
+            on_evict (callable, optional): Called with the value once it is replaced
+                                           or invalidated, to release what it holds open.
+
+        Returns:
+            The cached or freshly loaded value.
+        """
+        current = fingerprint()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == current:
+            self._record(key, hit=True)
+            return entry[1]
+
+        # Only one session loads a given key; the others wait and then hit.
+        with self._key_lock(key):
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == current:
+                self._record(key, hit=True)
+                return entry[1]
+            start = time.perf_counter()
+            value = loader()
+            elapsed = time.perf_counter() - start
+            self._entries[key] = (current, value, on_evict)
+            self._record(key, hit=False, load_seconds=elapsed)
+            logging.info(f"Cache load for {key!r} took {elapsed:.3f}s.")
+        if entry is not None:
+            self._evict(key, entry)
+        return value
+
+    def _evict(self, key, entry):
+        _, value, on_evict = entry
+        if on_evict is None:
+            return
+        try:
+            on_evict(value)
+        except Exception as e:
+            logging.error(f"Error releasing cached value for {key!r}: {e}")
+
+    def invalidate(self, key=None):
+        """Drop one entry, or every entry when no key is given."""
+        with self._lock:
+            if key is None:
+                dropped = list(self._entries.items())
+                self._entries.clear()
+            else:
+                entry = self._entries.pop(key, None)
+                dropped = [(key, entry)] if entry is not None else []
+        for dropped_key, entry in dropped:
+            self._evict(dropped_key, entry)
+
+    def stats(self) -> dict:
+        """
+        Return hit, miss and load-time counters.
+
+        Returns:
+            dict: Totals under "total" and one entry per cache key under "keys".
+        """
+        with self._lock:
+            keys = {key: dict(counts) for key, counts in self._stats.items()}
+        total = {
+            "hits": sum(counts["hits"] for counts in keys.values()),
+            "misses": sum(counts["misses"] for counts in keys.values()),
+            "load_seconds": sum(counts["load_seconds"] for counts in keys.values()),
+        }
+        return {"total": total, "keys": keys}
+
+
+# Module-level instances live as long as the Streamlit server process.
+cache = DataCache()
+_databases = {}
+_managers = {}
+_imports = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(db_path: str = 'railways.db') -> Database:
+    """
+    Return the process-wide Database for a path, creating it (and its tables) once.
+
+    Parameters:
+        db_path (str): Path to the SQLite database file.
+
+    Returns:
+        Database: The shared Database instance.
+    """
+    with _databases_lock:
+        db = _databases.get(db_path)
+        if db is None:
+            db = Database(db_path)
+            _databases[db_path] = db
+        return db
+
+
+def get_works_manager(db: Database) -> WorksManager:
+    """
+    Return the process-wide WorksManager for a Database.
+
+    Sharing the manager keeps its write listeners registered across reruns.
+
+    Parameters:
+        db (Database): The shared Database instance.
+
+    Returns:
+        WorksManager: The shared WorksManager instance.
+    """
+    with _databases_lock:
+        manager = _managers.get(db.db_path)
+        if manager is None or manager.db is not db:
+            manager = WorksManager(db)
+            _managers[db.db_path] = manager
+        return manager
+
+
+def start_import_job(db: Database, csv_folder: str = '.') -> ImportJob:
+    """
+    Start the background CSV import for a database, once per process.
+
+    Later calls return the same job, running or finished, so every session
+    follows one import instead of starting its own.
+
+    Parameters:
+        db (Database): The shared Database instance.
+        csv_folder (str): Path to the folder containing CSV files.
+
+    Returns:
+        ImportJob: The process-wide import job.
+    """
+    with _databases_lock:
+        job = _imports.get(db.db_path)
+        if job is None:
+            job = ImportJob(db, csv_folder).start()
+            _imports[db.db_path] = job
+        return job
+
+
+def get_import_job(db: Database):
+    """Return the background import job of a database, or None if none was started."""
+    with _databases_lock:
+        return _imports.get(db.db_path)
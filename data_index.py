@@ -0,0 +1,112 @@
+# data_index.py
+
+import numpy as np
+import pandas as pd
+
+
+class KeyIndex:
+    """
+    Rows of a DataFrame grouped by one key column.
+
+    Building the index does not copy the frame: it keeps the row positions
+    ordered by key, so every group is a contiguous block of positions. A
+    lookup is a dict hit followed by an ``iloc`` take of that block, which
+    copies just those rows; the result is never a view of the frame.
+    """
+
+    def __init__(self, frame: pd.DataFrame, column: str):
+        """
+        Build the index.
+
+        Parameters:
+            frame (pd.DataFrame): Rows to index.
+            column (str): Key column. Keys are compared as stripped strings.
+        """
+        keys = frame[column].fillna("").astype(str).str.strip().to_numpy(dtype=object)
+        self.column = column
+        self.frame = frame
+        self.positions = np.argsort(keys, kind="stable")
+        sorted_keys = keys[self.positions]
+        unique_keys, starts = np.unique(sorted_keys, return_index=True)
+        ends = np.append(starts[1:], len(sorted_keys))
+        self._slices = {
+            key: (start, end) for key, start, end in zip(unique_keys.tolist(), starts.tolist(), ends.tolist())
+        }
+
+    def rows(self, key) -> pd.DataFrame:
+        """Return all rows for a key (an empty frame when the key is unknown)."""
+        bounds = self._slices.get(str(key).strip())
+        if bounds is None:
+            return self.frame.iloc[0:0]
+        return self.frame.iloc[self.positions[bounds[0]:bounds[1]]]
+
+    def first(self, key):
+        """Return the first row for a key as a Series, or None."""
+        bounds = self._slices.get(str(key).strip())
+        if bounds is None:
+            return None
+        return self.frame.iloc[self.positions[bounds[0]]]
+
+    def keys(self) -> list:
+        """Return the distinct keys in sorted order."""
+        return list(self._slices)
+
+    def __contains__(self, key) -> bool:
+        return str(key).strip() in self._slices
+
+
+class DataIndex:
+    """
+    Named KeyIndexes over the station, amenity and works frames.
+
+    Built once when the data loads and shared by every dashboard and chatbot
+    path, so lookups by station code, section, year or pending-with never scan
+    a whole frame.
+    """
+
+    def __init__(self):
+        self._indexes = {}
+        self._unindexed = {}
+
+    def add(self, name: str, frame: pd.DataFrame, column: str):
+        """
+        Index a frame by one column under the given name.
+
+        Columns missing from the frame are skipped, so one call site can serve
+        the different column conventions of the entry points.
+
+        Parameters:
+            name (str): Lookup name, e.g. "station" or "works.section".
+            frame (pd.DataFrame): Rows to index.
+            column (str): Key column.
+        """
+        if frame is not None and column in frame.columns:
+            self._indexes[name] = KeyIndex(frame, column)
+        elif frame is not None:
+            self._unindexed[name] = frame
+
+    def rows(self, name: str, key) -> pd.DataFrame:
+        """
+        Return all rows of the named index for a key.
+
+        A name whose column was missing gives an empty frame with the frame's
+        columns, and a name never added an empty frame without columns.
+        """
+        index = self._indexes.get(name)
+        if index is not None:
+            return index.rows(key)
+        frame = self._unindexed.get(name)
+        return frame.iloc[0:0] if frame is not None else pd.DataFrame()
+
+    def first(self, name: str, key):
+        """Return the first row of the named index for a key, or None."""
+        index = self._indexes.get(name)
+        return index.first(key) if index is not None else None
+
+    def keys(self, name: str) -> list:
+        """Return the non-empty keys of the named index."""
+        index = self._indexes.get(name)
+        return [key for key in index.keys() if key] if index is not None else []
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._indexes
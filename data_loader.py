@@ -1,40 +1,117 @@
+import math
+import numbers
 import pandas as pd
 import logging
+from frame_cache import cached_frame
+
+# Station columns kept numeric (NaN when blank) instead of being blanked into text
+STATION_NUMERIC_COLUMNS = {
+    "PASSENGER_FOOTFALL": "float64",
+    "NUMBER_OF_PLATFORMS": "float32",
+}
+
+# Version of prepare_station_data(); part of the frame cache key
+STATION_PREP_VERSION = 1
+
+
+def prepare_station_data(station_data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalize station data the same way for every page that shows stations.
+
+    Column names are upper-cased with spaces turned into underscores. Text
+    columns have blanks filled with "", while the columns in
+    STATION_NUMERIC_COLUMNS are parsed to numbers (values such as "PF-1" keep
+    their number) and keep NaN for blanks. DISPLAY_NAME ("NAME (CODE)") is
+    built with vectorized string operations.
+
+    Parameters:
+        station_data (pd.DataFrame): Stations as read from stations.csv.
+
+    Returns:
+        pd.DataFrame: The prepared frame (a new frame; the input is not modified).
+    """
+    station_data = station_data.rename(columns=lambda col: col.strip().upper().replace(" ", "_"))
+    prepared = {}
+    for column in station_data.columns:
+        values = station_data[column]
+        if column in STATION_NUMERIC_COLUMNS:
+            numbers = pd.to_numeric(values, errors="coerce")
+            unparsed = numbers.isna() & values.notna()
+            if unparsed.any():
+                text = values[unparsed].astype(str).str.extract(r"(\d+(?:\.\d+)?)", expand=False)
+                numbers[unparsed] = pd.to_numeric(text, errors="coerce")
+            prepared[column] = numbers.astype(STATION_NUMERIC_COLUMNS[column])
+        elif values.dtype == object:
+            prepared[column] = values.fillna("")
+        else:
+            prepared[column] = values
+    station_data = pd.DataFrame(prepared, index=station_data.index)
+    station_data["DISPLAY_NAME"] = (
+        station_data["STATION_NAME"].astype(str) + " (" + station_data["STATION_CODE"].astype(str) + ")"
+    )
+    return station_data
+
+
+def read_station_data(station_csv: str) -> pd.DataFrame:
+    """Read stations.csv and prepare it with prepare_station_data()."""
+    return prepare_station_data(pd.read_csv(station_csv))
+
+
+def format_number(value) -> str:
+    """Format a numeric station value for display: "" for missing, no ".0" on whole numbers."""
+    if isinstance(value, numbers.Real) and not isinstance(value, bool):
+        value = float(value)
+        if math.isnan(value):
+            return ""
+        return f"{int(value):,}" if value.is_integer() else f"{value:,.2f}"
+    return "" if value is None else str(value)
+
+
+def explode_stations(works_data: pd.DataFrame, column: str = "Station") -> pd.DataFrame:
+    """
+    Normalize works data so that each comma-separated station gets its own row.
+
+    The split and explode are vectorized; the other columns keep their dtypes and
+    every output row keeps the index label of the works row it came from.
+
+    Parameters:
+        works_data (pd.DataFrame): Works as read from works.csv.
+        column (str): Name of the station column ("Station" or "STATION").
+
+    Returns:
+        pd.DataFrame: One row per (work, station) pair.
+    """
+    stations = works_data[column].fillna("").astype(str).str.split(",")
+    exploded = works_data.assign(**{column: stations}).explode(column)
+    exploded[column] = exploded[column].str.strip()
+    return exploded
+
 
 class DataLoader:
     def __init__(self, station_csv: str, works_csv: str):
         self.station_csv = station_csv
         self.works_csv = works_csv
 
+    def _read_station_data(self):
+        return read_station_data(self.station_csv)
+
+    def _read_works_data(self):
+        return explode_stations(pd.read_csv(self.works_csv), "Station")
+
     def load_station_data(self):
-        """Load and prepare station data."""
+        """Load and prepare station data, from the on-disk frame cache when the CSV is unchanged."""
         try:
-            station_data = pd.read_csv(self.station_csv)
-            station_data.columns = [
-                col.strip().upper().replace(" ", "_") for col in station_data.columns
-            ]
-            station_data.fillna("", inplace=True)
-            station_data["DISPLAY_NAME"] = station_data.apply(
-                lambda row: f"{row['STATION_NAME']} ({row['STATION_CODE']})", axis=1
+            return cached_frame(
+                "stations.display", [self.station_csv], self._read_station_data, version=STATION_PREP_VERSION
             )
-            return station_data
         except Exception as e:
             logging.error(f"Error loading station data: {e}")
             raise
 
     def load_works_data(self):
-        """Load and normalize works data."""
+        """Load and normalize works data, from the on-disk frame cache when the CSV is unchanged."""
         try:
-            works_data = pd.read_csv(self.works_csv)
-            expanded_rows = []
-            for _, row in works_data.iterrows():
-                stations = str(row["Station"]).split(",")
-                for station in stations:
-                    station = station.strip()
-                    new_row = row.copy()
-                    new_row["Station"] = station
-                    expanded_rows.append(new_row)
-            return pd.DataFrame(expanded_rows)
+            return cached_frame("works.exploded", [self.works_csv], self._read_works_data)
         except Exception as e:
             logging.error(f"Error loading works data: {e}")
-            raise
\ No newline at end of file
+            raise
@@ -3,6 +3,11 @@
 import sqlite3
 import logging
 import os
+import queue
+import re
+import threading
+from concurrent.futures import Future
+from amenity_store import migrate_paavailability
 
 # Configure logging
 logging.basicConfig(
@@ -11,6 +16,271 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+# Applied to every connection. In WAL mode synchronous=NORMAL only syncs at
+# checkpoints, which is safe against application crashes.
+CONNECTION_PRAGMAS = (
+    "PRAGMA foreign_keys = ON;",
+    "PRAGMA busy_timeout = 5000;",
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA cache_size = -16000;",     # 16 MB page cache per connection
+    "PRAGMA mmap_size = 268435456;",   # memory-map up to 256 MB for reads
+    "PRAGMA temp_store = MEMORY;",
+)
+
+
+# Keys per "IN (...)" lookup, below SQLite's bound-parameter limit
+ID_CHUNK = 500
+
+# PH-53 status buckets by financial progress: summary column -> condition on a works row.
+# Works with no recorded progress are only counted in the total.
+PH53_BUCKETS = {
+    "works_completed_pending_cr_fcc_bill": "{row}financial_progress_percent >= 100",
+    "tender_to_be_called": "{row}financial_progress_percent < 100 AND {row}financial_progress_percent >= 50",
+    "tender_under_finalization_loa_issued": "{row}financial_progress_percent < 50 AND {row}financial_progress_percent >= 25",
+    "work_in_progress": "{row}financial_progress_percent < 25",
+}
+PH53_COLUMNS = ["total_pids_sanctioned", *PH53_BUCKETS]
+
+# Full recompute of the summary from works; NULL pending-with is grouped as ''.
+PH53_SUMMARY_QUERY = f"""
+    SELECT
+        COALESCE(works_pending_with, '') AS works_pending_with,
+        COUNT(*) AS total_pids_sanctioned,
+        {", ".join(f"SUM(CASE WHEN {condition.format(row='')} THEN 1 ELSE 0 END) AS {column}" for column, condition in PH53_BUCKETS.items())}
+    FROM works
+    GROUP BY COALESCE(works_pending_with, '')
+"""
+
+
+def _ph53_adjust(row: str, sign: str) -> str:
+    """Upsert that adds (sign '+') or removes (sign '-') one works row from its summary row."""
+    counts = ["1"] + [f"CASE WHEN {condition.format(row=row + '.')} THEN 1 ELSE 0 END" for condition in PH53_BUCKETS.values()]
+    return f"""
+        INSERT INTO ph53_summary (works_pending_with, {", ".join(PH53_COLUMNS)})
+        VALUES (COALESCE({row}.works_pending_with, ''), {", ".join(f"{sign}({count})" for count in counts)})
+        ON CONFLICT (works_pending_with) DO UPDATE SET
+            {", ".join(f"{column} = {column} + excluded.{column}" for column in PH53_COLUMNS)};
+        DELETE FROM ph53_summary
+        WHERE works_pending_with = COALESCE({row}.works_pending_with, '') AND total_pids_sanctioned = 0;
+    """
+
+
+def ph53_summary_triggers() -> list:
+    """CREATE TRIGGER statements that keep ph53_summary in step with every write to works."""
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS ph53_summary_insert AFTER INSERT ON works BEGIN {_ph53_adjust('NEW', '+')} END;",
+        f"CREATE TRIGGER IF NOT EXISTS ph53_summary_delete AFTER DELETE ON works BEGIN {_ph53_adjust('OLD', '-')} END;",
+        "CREATE TRIGGER IF NOT EXISTS ph53_summary_update "
+        "AFTER UPDATE OF works_pending_with, financial_progress_percent ON works "
+        f"BEGIN {_ph53_adjust('OLD', '-')} {_ph53_adjust('NEW', '+')} END;",
+    ]
+
+
+def rebuild_ph53_summary(conn: sqlite3.Connection):
+    """
+    Recompute ph53_summary from works; runs in the caller's transaction.
+
+    Each works row is upserted into its summary row instead of running
+    PH53_SUMMARY_QUERY: a GROUP BY sorts every row first, in memory with
+    temp_store = MEMORY, so its footprint grows with the table.
+    """
+    counts = ["1"] + [f"CASE WHEN {condition.format(row='')} THEN 1 ELSE 0 END" for condition in PH53_BUCKETS.values()]
+    conn.execute("DELETE FROM ph53_summary;")
+    conn.execute(f"""
+        INSERT INTO ph53_summary (works_pending_with, {", ".join(PH53_COLUMNS)})
+        SELECT COALESCE(works_pending_with, ''), {", ".join(counts)} FROM works WHERE true
+        ON CONFLICT (works_pending_with) DO UPDATE SET
+            {", ".join(f"{column} = {column} + excluded.{column}" for column in PH53_COLUMNS)};
+    """)
+
+
+# Station counts behind the dashboard: dimension -> (value, detail) expressions on a stations row.
+# NULLs are counted as ''. "section_category" counts each category within a section.
+STATION_SUMMARY_DIMENSIONS = {
+    "categorisation": ("{row}categorisation", "''"),
+    "zone": ("{row}zone", "''"),
+    "section": ("{row}section", "''"),
+    "earnings_range": ("{row}earnings_range", "''"),
+    "section_category": ("{row}section", "{row}categorisation"),
+}
+
+# Full recompute of the station summary from stations
+STATION_SUMMARY_QUERY = " UNION ALL ".join(
+    f"SELECT '{dimension}', COALESCE({value.format(row='')}, ''), COALESCE({detail.format(row='')}, ''), COUNT(*) "
+    f"FROM stations GROUP BY 2, 3"
+    for dimension, (value, detail) in STATION_SUMMARY_DIMENSIONS.items()
+)
+
+
+def _station_summary_adjust(row: str, sign: str) -> str:
+    """Upserts that add (sign '+') or remove (sign '-') one stations row from every summary dimension."""
+    statements = []
+    for dimension, (value, detail) in STATION_SUMMARY_DIMENSIONS.items():
+        value = f"COALESCE({value.format(row=row + '.')}, '')"
+        detail = f"COALESCE({detail.format(row=row + '.')}, '')"
+        statements.append(f"""
+            INSERT INTO station_summary (dimension, value, detail, stations)
+            VALUES ('{dimension}', {value}, {detail}, {sign}1)
+            ON CONFLICT (dimension, value, detail) DO UPDATE SET stations = stations + excluded.stations;
+            DELETE FROM station_summary
+            WHERE dimension = '{dimension}' AND value = {value} AND detail = {detail} AND stations = 0;
+        """)
+    return "".join(statements)
+
+
+def station_summary_triggers() -> list:
+    """CREATE TRIGGER statements that keep station_summary in step with every write to stations."""
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS station_summary_insert AFTER INSERT ON stations "
+        f"BEGIN {_station_summary_adjust('NEW', '+')} END;",
+        f"CREATE TRIGGER IF NOT EXISTS station_summary_delete AFTER DELETE ON stations "
+        f"BEGIN {_station_summary_adjust('OLD', '-')} END;",
+        "CREATE TRIGGER IF NOT EXISTS station_summary_update "
+        "AFTER UPDATE OF categorisation, zone, section, earnings_range ON stations "
+        f"BEGIN {_station_summary_adjust('OLD', '-')} {_station_summary_adjust('NEW', '+')} END;",
+    ]
+
+
+def rebuild_station_summary(conn: sqlite3.Connection):
+    """
+    Recompute station_summary from stations; runs in the caller's transaction.
+
+    Upserts row by row, one dimension at a time, for the reason given in
+    rebuild_ph53_summary(); STATION_SUMMARY_QUERY gives the same counts.
+    """
+    conn.execute("DELETE FROM station_summary;")
+    for dimension, (value, detail) in STATION_SUMMARY_DIMENSIONS.items():
+        conn.execute(f"""
+            INSERT INTO station_summary (dimension, value, detail, stations)
+            SELECT '{dimension}', COALESCE({value.format(row='')}, ''), COALESCE({detail.format(row='')}, ''), 1
+            FROM stations WHERE true
+            ON CONFLICT (dimension, value, detail) DO UPDATE SET stations = stations + excluded.stations;
+        """)
+
+
+# Trigger-maintained summaries of a table: table -> (CREATE TRIGGER statements, full rebuild)
+SUMMARIES = {
+    "stations": (station_summary_triggers, rebuild_station_summary),
+    "works": (ph53_summary_triggers, rebuild_ph53_summary),
+}
+
+
+def trigger_name(statement: str) -> str:
+    """Return the trigger a CREATE TRIGGER statement creates."""
+    return re.match(r"CREATE TRIGGER IF NOT EXISTS (\w+)", statement).group(1)
+
+
+class ConnectionPool:
+    """
+    Hands each thread its own SQLite connection.
+
+    Streamlit runs every session on its own script thread; a connection is
+    bound to the thread that first asks for it and handed to a new thread once
+    its owner has finished, so the pool stays as large as the number of live
+    threads.
+    """
+
+    def __init__(self, factory):
+        """
+        Parameters:
+            factory (callable): Opens a new, configured connection.
+        """
+        self._factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._owners = {}
+        self._idle = []
+
+    def get(self) -> sqlite3.Connection:
+        """Return the calling thread's connection, opening or reusing one if needed."""
+        conn = getattr(self._local, "connection", None)
+        if conn is not None:
+            return conn
+        with self._lock:
+            for thread in [thread for thread in self._owners if not thread.is_alive()]:
+                self._idle.append(self._owners.pop(thread))
+            conn = self._idle.pop() if self._idle else self._factory()
+            self._owners[threading.current_thread()] = conn
+        self._local.connection = conn
+        return conn
+
+    def size(self) -> int:
+        with self._lock:
+            return len(self._owners) + len(self._idle)
+
+    def close(self):
+        with self._lock:
+            for conn in list(self._owners.values()) + self._idle:
+                conn.close()
+            self._owners.clear()
+            self._idle.clear()
+
+
+class WriteQueue:
+    """
+    Runs every mutation on one writer thread with its own connection.
+
+    Jobs are executed in submission order, each inside its own transaction,
+    so concurrent sessions can never interleave statements or commits.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.lock = threading.RLock()
+        self.version = 0
+        self.unannounced_version = 0
+        self.data_version = conn.execute("PRAGMA data_version;").fetchone()[0]
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, job, announced: bool = False):
+        """
+        Run job(conn) on the writer thread and wait for its result.
+
+        Parameters:
+            job (callable): Receives the writer connection; runs in one transaction.
+            announced (bool): The caller tells listeners about this write itself.
+
+        Returns:
+            Whatever the job returns; its exceptions are re-raised here.
+        """
+        if threading.current_thread() is self._thread:
+            return self._execute(job, announced)
+        future = Future()
+        self._queue.put((job, announced, future))
+        return future.result()
+
+    def _execute(self, job, announced: bool):
+        with self.lock:
+            before = self.conn.total_changes
+            with self.conn:
+                result = job(self.conn)
+            if self.conn.total_changes != before:
+                self.version += 1
+                if not announced:
+                    self.unannounced_version += 1
+        return result
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            job, announced, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                future.set_result(self._execute(job, announced))
+            except BaseException as e:
+                future.set_exception(e)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+        self.conn.close()
+
+
 class Database:
     def __init__(self, db_path='railways.db'):
         """
@@ -20,27 +290,78 @@ class Database:
             db_path (str): Path to the SQLite database file.
         """
         self.db_path = db_path
-        self.connection = None
+        self.pool = None
+        self.writer = None
         self.connect()
         self.initialize_tables()
     
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row  # To access columns by name
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
     def connect(self):
-        """Establish a connection to the SQLite database."""
+        """Switch the database to WAL mode, start the writer thread and the per-thread reader pool."""
         try:
-            self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
-            self.connection.row_factory = sqlite3.Row  # To access columns by name
-            logging.info(f"Connected to SQLite database at {self.db_path}.")
+            writer = self._open()
+            journal_mode = writer.execute("PRAGMA journal_mode = WAL;").fetchone()[0]
+            self.writer = WriteQueue(writer)
+            self.pool = ConnectionPool(self._open)
+            logging.info(f"Connected to SQLite database at {self.db_path} (journal mode {journal_mode}).")
         except sqlite3.Error as e:
             logging.error(f"Error connecting to database: {e}")
             raise
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The calling thread's read connection."""
+        return self.pool.get()
+
+    def write(self, job, announced: bool = False):
+        """
+        Run a mutation on the single writer connection, in its own transaction.
+
+        Parameters:
+            job (callable): Called as job(conn).
+            announced (bool): The caller notifies listeners about this write itself
+                              (see WorksManager.add_listener).
+
+        Returns:
+            Whatever the job returns.
+        """
+        return self.writer.submit(job, announced)
+
+    def versions(self) -> tuple:
+        """
+        Return counters that change whenever the database contents change.
+
+        Returns:
+            tuple: (data_version of the writer connection, which moves when other
+                   processes or connections commit; writes committed through this
+                   Database; those of them not announced to listeners).
+        """
+        writer = self.writer
+        # Readers check these on every rerun, so they never wait out a running write
+        # job: its commit moves the write counter anyway, and data_version is read
+        # again on the first call after it.
+        if writer.lock.acquire(blocking=False):
+            try:
+                writer.data_version = writer.conn.execute("PRAGMA data_version;").fetchone()[0]
+            finally:
+                writer.lock.release()
+        return writer.data_version, writer.version, writer.unannounced_version
+
+    def close(self):
+        """Stop the writer thread and close every connection."""
+        self.writer.close()
+        self.pool.close()
     
     def initialize_tables(self):
         """Create tables if they do not exist."""
+        cursor = self.connection.cursor()
         try:
-            cursor = self.connection.cursor()
-        except Exception as e:
-            print(f"An error occurred: {e}")  # Handle the exception
-        finally:
             # Enable foreign key support
             cursor.execute("PRAGMA foreign_keys = ON;")
             
@@ -201,9 +522,79 @@ class Database:
                 );
             """)
             logging.info("Ensured 'remarks' table exists.")
+
+            # Normalized per-platform amenity quantities, migrated from paavailability.
+            # WITHOUT ROWID stores rows in primary-key order, so per-station lookups
+            # and the (amenity, station_code, quantity) index are both covering.
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS station_amenities (
+                    station_code TEXT NOT NULL,
+                    amenity TEXT NOT NULL,
+                    platform TEXT NOT NULL DEFAULT '',
+                    quantity REAL NOT NULL,
+                    PRIMARY KEY (station_code, amenity, platform),
+                    FOREIGN KEY (station_code) REFERENCES paavailability(station_code) ON DELETE CASCADE ON UPDATE CASCADE
+                ) WITHOUT ROWID;
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_station_amenities_amenity
+                ON station_amenities (amenity, station_code, quantity);
+            """)
+            logging.info("Ensured 'station_amenities' table exists.")
+
+            # One-time migration for databases created before station_amenities existed,
+            # run like every other mutation on the writer connection
+            has_amenities = cursor.execute("SELECT 1 FROM station_amenities LIMIT 1;").fetchone()
+            has_paavailability = cursor.execute("SELECT 1 FROM paavailability LIMIT 1;").fetchone()
+            if has_paavailability and not has_amenities:
+                self.write(migrate_paavailability)
+
+            # Materialized PH-53 summary, kept current by triggers on works
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ph53_summary (
+                    works_pending_with TEXT PRIMARY KEY,
+                    total_pids_sanctioned INTEGER NOT NULL DEFAULT 0,
+                    works_completed_pending_cr_fcc_bill INTEGER NOT NULL DEFAULT 0,
+                    tender_to_be_called INTEGER NOT NULL DEFAULT 0,
+                    tender_under_finalization_loa_issued INTEGER NOT NULL DEFAULT 0,
+                    work_in_progress INTEGER NOT NULL DEFAULT 0
+                );
+            """)
+            for trigger in ph53_summary_triggers():
+                cursor.execute(trigger)
+            logging.info("Ensured 'ph53_summary' table and triggers exist.")
+
+            # One-time population for databases created before ph53_summary existed
+            has_summary = cursor.execute("SELECT 1 FROM ph53_summary LIMIT 1;").fetchone()
+            has_works = cursor.execute("SELECT 1 FROM works LIMIT 1;").fetchone()
+            if has_works and not has_summary:
+                self.write(rebuild_ph53_summary)
+
+            # Materialized station counts for the dashboard, kept current by triggers on stations
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS station_summary (
+                    dimension TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    detail TEXT NOT NULL DEFAULT '',
+                    stations INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (dimension, value, detail)
+                ) WITHOUT ROWID;
+            """)
+            for trigger in station_summary_triggers():
+                cursor.execute(trigger)
+            logging.info("Ensured 'station_summary' table and triggers exist.")
+
+            # One-time population for databases created before station_summary existed
+            has_station_summary = cursor.execute("SELECT 1 FROM station_summary LIMIT 1;").fetchone()
+            has_stations = cursor.execute("SELECT 1 FROM stations LIMIT 1;").fetchone()
+            if has_stations and not has_station_summary:
+                self.write(rebuild_station_summary)
             
             self.connection.commit()
             logging.info("Database tables initialized successfully.")
+        except sqlite3.Error as e:
+            logging.error(f"Error initializing database tables: {e}")
+            raise
 
     if __name__ == "__main__":
         # Initialize the database when running this script directly
@@ -0,0 +1,210 @@
+# export.py
+
+import csv
+import hashlib
+import logging
+import os
+import threading
+import time
+import streamlit as st
+from openpyxl import Workbook
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from data_cache import file_fingerprint
+from database import Database
+from paged_table import QuerySource
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s]: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Where finished exports are kept, rows read from SQLite at a time, and exports kept per source
+EXPORT_DIR = os.environ.get("EXPORT_CACHE_DIR", ".export_cache")
+CHUNK_ROWS = 5000
+EXPORTS_PER_SOURCE = 8
+
+FORMATS = {
+    "csv": ("CSV", "text/csv"),
+    "xlsx": ("Excel", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+_build_locks = {}
+_locks_lock = threading.Lock()
+
+
+def data_version(db: Database) -> tuple:
+    """
+    A version of the database contents that holds across processes.
+
+    Every commit grows the WAL file or, after a checkpoint, rewrites the
+    database file, so their modification times and sizes move with the data.
+    """
+    return file_fingerprint(db.db_path, f"{db.db_path}-wal")
+
+
+def export_fingerprint(source: QuerySource, view: dict, fmt: str) -> str:
+    """
+    Fingerprint of one export: the source, the view's filters, columns and sort, the format and the data version.
+
+    Parameters:
+        source (QuerySource): Source of the rows.
+        view (dict): View as returned by render_paged_table.
+        fmt (str): "csv" or "xlsx".
+
+    Returns:
+        str: Hex digest naming the export file.
+    """
+    key = (
+        source.name, source.from_sql, tuple(view["columns"]), repr(sorted((view.get("filters") or {}).items())),
+        view.get("search", ""), view.get("sort"), view.get("descending"), fmt, data_version(source.db),
+    )
+    return hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+
+
+def export_path(source: QuerySource, view: dict, fmt: str, export_dir: str = None) -> str:
+    """Return where the export of a view of the current data is (or would be) stored."""
+    return os.path.join(export_dir or EXPORT_DIR, f"{source.name}-{export_fingerprint(source, view, fmt)}.{fmt}")
+
+
+def _rows(source: QuerySource, view: dict, chunk_rows: int):
+    """Yield the header, then the view's rows in chunks, without the cursor columns."""
+    sql, params, _ = source.select_sql(view["columns"], view.get("filters"), view.get("search", ""),
+                                       view.get("sort"), view.get("descending"))
+    width = len(view["columns"])
+    yield list(view["columns"])
+    cursor = source.db.connection.execute(sql + ";", params)
+    try:
+        while True:
+            chunk = cursor.fetchmany(chunk_rows)
+            if not chunk:
+                break
+            for row in chunk:
+                yield row[:width]
+    finally:
+        cursor.close()
+
+
+def write_csv(rows, path: str) -> int:
+    """Write rows (header first) to a CSV file; returns the number of data rows."""
+    count = -1
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return max(count, 0)
+
+
+def write_xlsx(rows, path: str) -> int:
+    """
+    Write rows (header first) to an XLSX file with openpyxl's write-only
+    workbook, which streams rows to disk instead of keeping every cell.
+
+    Returns:
+        int: The number of data rows.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("data")
+    count = -1
+    for row in rows:
+        # Control characters are not allowed in XLSX cells
+        sheet.append([ILLEGAL_CHARACTERS_RE.sub("", value) if isinstance(value, str) else value for value in row])
+        count += 1
+    workbook.save(path)
+    return max(count, 0)
+
+
+_WRITERS = {"csv": write_csv, "xlsx": write_xlsx}
+
+
+def _build_lock(path: str) -> threading.Lock:
+    with _locks_lock:
+        return _build_locks.setdefault(path, threading.Lock())
+
+
+def export_file(source: QuerySource, view: dict, fmt: str, export_dir: str = None,
+                chunk_rows: int = CHUNK_ROWS) -> str:
+    """
+    Return the path of an export of a view, writing it only if it is not already on disk.
+
+    Rows are streamed from SQLite in chunks straight into the file, so no
+    frame of the whole view is built. Exports are named by their
+    fingerprint; the same view of the same data is written once and then
+    served from disk, to every session and after restarts. Only the newest
+    EXPORTS_PER_SOURCE exports of a source are kept.
+
+    Parameters:
+        source (QuerySource): Source of the rows.
+        view (dict): View as returned by render_paged_table.
+        fmt (str): "csv" or "xlsx".
+        export_dir (str, optional): Export directory; defaults to EXPORT_DIR.
+        chunk_rows (int): Rows fetched from SQLite at a time.
+
+    Returns:
+        str: Path of the export file.
+    """
+    export_dir = export_dir or EXPORT_DIR
+    path = export_path(source, view, fmt, export_dir)
+    with _build_lock(path):
+        if os.path.isfile(path):
+            logging.info(f"Export cache hit for {source.name} ({fmt}).")
+            return path
+        os.makedirs(export_dir, exist_ok=True)
+        start = time.perf_counter()
+        temporary = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            rows = _WRITERS[fmt](_rows(source, view, chunk_rows), temporary)
+            os.replace(temporary, path)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+    logging.info(f"Exported {rows} {source.name} rows to {fmt} in {time.perf_counter() - start:.3f}s.")
+
+    prefix = f"{source.name}-"
+    exports = sorted(
+        (os.path.join(export_dir, name) for name in os.listdir(export_dir)
+         if name.startswith(prefix) and ".tmp-" not in name),
+        key=os.path.getmtime, reverse=True,
+    )
+    for stale in exports[EXPORTS_PER_SOURCE:]:
+        try:
+            os.remove(stale)
+        except OSError:
+            pass
+    return path
+
+
+def render_export_buttons(source: QuerySource, view: dict, key: str, file_name: str):
+    """
+    Render CSV and Excel export buttons for a view.
+
+    Nothing is written until a button is pressed. Once the file for the
+    current view and data exists, from this session or any other, its
+    download button is shown directly.
+
+    Parameters:
+        source (QuerySource): Source of the rows.
+        view (dict): View as returned by render_paged_table; no buttons when None.
+        key (str): Widget key prefix.
+        file_name (str): Download name without extension.
+    """
+    if view is None:
+        return
+    for column, (fmt, (label, mime)) in zip(st.columns(len(FORMATS)), FORMATS.items()):
+        with column:
+            path = export_path(source, view, fmt)
+            if not os.path.isfile(path):
+                if not st.button(f"Prepare {label}", key=f"{key}.{fmt}.prepare"):
+                    continue
+                with st.spinner(f"Writing {label} file..."):
+                    path = export_file(source, view, fmt)
+            try:
+                with open(path, "rb") as f:
+                    st.download_button(f"Download {label}", f, f"{file_name}.{fmt}", mime,
+                                       key=f"{key}.{fmt}.download")
+            except FileNotFoundError:
+                # Pruned by another session's export since the check; the next rerun offers it again
+                continue
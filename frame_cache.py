@@ -0,0 +1,188 @@
+# frame_cache.py
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import numpy as np
+import pandas as pd
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s]: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Where prepared frames are kept, and the on-disk layout version (bump to drop old entries)
+CACHE_DIR = os.environ.get("FRAME_CACHE_DIR", ".frame_cache")
+FORMAT_VERSION = 1
+
+_HASH_BLOCK = 1 << 20
+
+
+def source_hash(paths, version=0) -> str:
+    """
+    Hash the contents of the source files a frame is prepared from.
+
+    Parameters:
+        paths (list): Source file paths, in a fixed order.
+        version: Version of the preparation code; part of the hash so a change to it
+                 invalidates earlier entries.
+
+    Returns:
+        str: Hex digest; identical files give the same digest wherever they live.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{FORMAT_VERSION}:{version}".encode())
+    for path in paths:
+        digest.update(b"\0")
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK), b""):
+                digest.update(block)
+    return digest.hexdigest()
+
+
+def _save_array(directory: str, name: str, values: pd.Series) -> dict:
+    """Write one column; numbers as a plain .npy, text as codes plus its distinct values."""
+    if values.dtype.kind in "biuf":
+        np.save(os.path.join(directory, f"{name}.npy"), values.to_numpy())
+        return {"kind": "array"}
+    if values.dtype != object:
+        raise TypeError(f"unsupported dtype {values.dtype}")
+    codes, uniques = pd.factorize(values)
+    # Distinct values go to JSON, which keeps the "" and numbers mixed into text columns apart
+    uniques = [value.item() if isinstance(value, np.generic) else value for value in uniques]
+    if not all(isinstance(value, (str, int, float, bool)) for value in uniques):
+        raise TypeError(f"column {values.name!r} holds values other than text and numbers")
+    np.save(os.path.join(directory, f"{name}.codes.npy"), codes.astype(np.int32))
+    with open(os.path.join(directory, f"{name}.values.json"), "w", encoding="utf-8") as f:
+        json.dump(uniques, f)
+    return {"kind": "objects"}
+
+
+def _load_array(directory: str, name: str, kind: str) -> np.ndarray:
+    """Read one column written by _save_array; numeric columns are memory-mapped."""
+    if kind == "array":
+        return np.asarray(np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r"))
+    codes = np.load(os.path.join(directory, f"{name}.codes.npy"), mmap_mode="r")
+    with open(os.path.join(directory, f"{name}.values.json"), encoding="utf-8") as f:
+        values = json.load(f)
+    lookup = np.empty(len(values) + 1, dtype=object)
+    lookup[:-1] = values
+    lookup[-1] = np.nan  # code -1 (missing) picks the trailing NaN
+    return lookup.take(codes)
+
+
+def save_frame(frame: pd.DataFrame, directory: str):
+    """
+    Write a frame as one file per column plus a meta.json describing them.
+
+    Parameters:
+        frame (pd.DataFrame): Frame with numeric, boolean or text columns.
+        directory (str): Entry directory to create.
+
+    Raises:
+        TypeError: If a column cannot be stored (e.g. mixed-type objects).
+    """
+    os.makedirs(directory)
+    columns = []
+    for position, name in enumerate(frame.columns):
+        entry = _save_array(directory, f"c{position}", frame.iloc[:, position])
+        columns.append({"name": name, **entry})
+    if isinstance(frame.index, pd.RangeIndex):
+        index = {"kind": "range", "start": frame.index.start, "stop": frame.index.stop, "step": frame.index.step}
+    else:
+        index = _save_array(directory, "index", frame.index.to_series())
+    with open(os.path.join(directory, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"format": FORMAT_VERSION, "rows": len(frame), "columns": columns, "index": index}, f)
+
+
+def load_frame(directory: str) -> pd.DataFrame:
+    """Read a frame written by save_frame()."""
+    with open(os.path.join(directory, "meta.json"), encoding="utf-8") as f:
+        meta = json.load(f)
+    arrays = {
+        position: _load_array(directory, f"c{position}", column["kind"])
+        for position, column in enumerate(meta["columns"])
+    }
+    index = meta["index"]
+    if index["kind"] == "range":
+        index = pd.RangeIndex(index["start"], index["stop"], index["step"])
+    else:
+        index = pd.Index(_load_array(directory, "index", index["kind"]))
+    frame = pd.DataFrame(arrays, index=index, copy=False)
+    frame.columns = [column["name"] for column in meta["columns"]]
+    return frame
+
+
+_build_lock = threading.Lock()
+
+
+def cached_frame(name: str, paths: list, builder, version=0, cache_dir: str = None) -> pd.DataFrame:
+    """
+    Return a prepared frame from the on-disk cache, building and storing it on a miss.
+
+    Entries are keyed by the name and a hash of the source files' contents, so
+    an edited source builds a new entry (older entries of the same name are
+    removed) and an untouched one is read back without re-parsing or
+    re-preparing. Build and hit timings are logged. Frames that cannot be
+    stored are returned uncached.
+
+    Parameters:
+        name (str): Name of the prepared frame, e.g. "stations.display".
+        paths (list): Source files the frame is built from.
+        builder (callable): Builds the frame from the sources.
+        version: Version of the builder's preparation logic.
+        cache_dir (str, optional): Cache directory; defaults to CACHE_DIR.
+
+    Returns:
+        pd.DataFrame: The prepared frame. Numeric columns of a cache hit are
+                      memory-mapped read-only arrays.
+    """
+    cache_dir = cache_dir or CACHE_DIR
+    start = time.perf_counter()
+    entry = os.path.join(cache_dir, f"{name}-{source_hash(paths, version)}")
+    hashed = time.perf_counter()
+    if os.path.isfile(os.path.join(entry, "meta.json")):
+        try:
+            frame = load_frame(entry)
+            logging.info(
+                f"Frame cache hit for {name}: {len(frame)} rows loaded in {time.perf_counter() - hashed:.3f}s "
+                f"(hashing sources {hashed - start:.3f}s)."
+            )
+            return frame
+        except (OSError, ValueError, KeyError) as e:
+            logging.warning(f"Frame cache entry {entry} is unreadable, rebuilding: {e}")
+            shutil.rmtree(entry, ignore_errors=True)
+
+    frame = builder()
+    built = time.perf_counter()
+    with _build_lock:
+        temporary = f"{entry}.tmp-{os.getpid()}-{threading.get_ident()}"
+        try:
+            save_frame(frame, temporary)
+            os.replace(temporary, entry)
+        except TypeError as e:
+            logging.warning(f"Frame {name} cannot be cached: {e}")
+            shutil.rmtree(temporary, ignore_errors=True)
+            return frame
+        except OSError as e:
+            shutil.rmtree(temporary, ignore_errors=True)
+            if not os.path.isdir(entry):
+                logging.warning(f"Frame {name} could not be stored in {cache_dir}: {e}")
+                return frame
+            # Otherwise another process stored the same entry first
+        prefix = f"{name}-"
+        for other in os.listdir(cache_dir):
+            stale = os.path.join(cache_dir, other)
+            if other.startswith(prefix) and stale != entry and ".tmp-" not in other:
+                shutil.rmtree(stale, ignore_errors=True)
+    logging.info(
+        f"Frame cache miss for {name}: built {len(frame)} rows in {built - hashed:.3f}s, "
+        f"stored in {time.perf_counter() - built:.3f}s."
+    )
+    return frame
@@ -0,0 +1,894 @@
+# ingest.py
+
+import sqlite3
+import csv
+import functools
+import io
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from amenity_store import migrate_paavailability
+from database import SUMMARIES, trigger_name
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s]: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Column maps: target column -> (source CSV header, kind, default).
+# Kinds are "text", "category" (low-cardinality text such as zone or section,
+# held as pandas categoricals while in memory), "int" and "real".
+# Source headers are matched after collapsing whitespace and ignoring case,
+# so 'Passenger footfall ' and ' Amenities' in the division sheets still map.
+STATION_COLUMNS = {
+    "station_code": ("Station code", "text", ""),
+    "station_name": ("STATION NAME", "text", ""),
+    "categorisation": ("Categorisation", "category", ""),
+    "zone": ("ZONE", "category", ""),
+    "division": ("DIVISION", "category", ""),
+    "section": ("Section", "category", ""),
+    "earnings_range": ("Earnings range", "text", ""),
+    "passenger_range": ("Passenger range", "text", ""),
+    "passenger_footfall": ("Passenger footfall", "int", 0),
+    "platform_type": ("Platform Type", "text", "Unknown"),
+    "number_of_platforms": ("Number of Platforms", "int", 0),
+}
+
+PAAVAILABILITY_COLUMNS = {
+    "station_code": ("Stations", "text", ""),
+    "amenities": ("Amenities", "text", ""),
+    "platforms_hl_ml_rl": ("Platforms -HL/ML/RL", "text", ""),
+    "number_of_platforms_length_each_pf": ("No. of Platforms (Length of Each PF)", "text", ""),
+    "foot_over_bridge": ("Foot over bridge (with Ramp or Steps)", "text", ""),
+    "drinking_water_taps_pf_wise": ("Drinking water taps (PF wise)", "text", ""),
+    "seating_arrangement": ("Seating Arrangement (no. of passenger/PF)", "text", ""),
+    "platform_shelter_sqm": ("Platform Shelter ((PF wise: in sqm)", "text", ""),
+    "urinals": ("Urinals (including W/R's & Pay & Use Toilet)", "text", ""),
+    "latrines": ("Latrines", "text", ""),
+    "toilet_facility": ("Toilet Facility/Pay & Use toilet in Circulating area", "text", ""),
+    "number_of_pay_use_toilet_units": ("No. of Pay & Use toilet units (Platform wise)", "text", ""),
+    "gps_clock": ("GPS Clock", "text", ""),
+    "water_cooler_ro_plant_pf_wise": ("Water Cooler/RO Palnt PF wise", "text", ""),
+    "dustbins": ("Dustbins (Dry & Wet In Pairs)", "text", ""),
+    "announcement_system": ("Announcement System (Computerised/Manual)", "text", ""),
+    "two_wheeler_parking_capacity": ("2 Wheeler Parking (Capacity)", "int", 0),
+    "four_wheeler_parking_capacity": ("4 Wheeler Parking (Capacity)", "int", 0),
+    "pre_paid_taxi_auto_booth": ("Pre Paid Taxi/Auto Booth", "text", ""),
+    "national_flag": ("100ft tall National flag in Circulating area", "text", ""),
+    "no_of_daily_trains": ("No. of Daily Trains (Ordinary & Express) (---- / ----)", "text", ""),
+    "no_of_non_daily_trains": ("No. of non-daily Trains (Ordinary & Express) (---- / ----)", "text", ""),
+    "no_of_functional_uts_counters": ("No. of functional UTS Counters", "int", 0),
+    "no_of_functional_prs_counters": ("No. of functional PRS Counters", "int", 0),
+    "ladies_sr_citizen_pwd_uts_counter": ("Ladies/Sr.Citizen/PWD (Divyangjan) UTS Counter (Yes/No)", "text", ""),
+    "no_of_atvm_available": ("No. of ATVM available", "int", 0),
+    "no_of_atvm_facilitators": ("No. of ATVM Facilitators", "int", 0),
+    "enquiry_counter": ("Enquiry Counter (Yes/No)", "text", ""),
+    "current_reservation_facility": ("Current Reservation Facility (Yes/No)", "text", ""),
+    "no_of_coaches_longest_stopping_train": ("No. of Coaches of Longest stopping train", "int", 0),
+    "paid_lounge_ac": ("Paid Lounge (A/C)", "text", ""),
+    "paid_lounge_non_ac": ("Paid Lounge (Non-A/C)", "text", ""),
+    "waiting_hall_ticketing_area": ("Waiting Hall/Ticketing area", "text", ""),
+    "retiring_room_nos_ac": ("Retiring Room Nos. (AC)", "int", 0),
+    "retiring_room_nos_non_ac": ("Retiring Room Nos. (Non AC)", "int", 0),
+    "dormitory_gents_beds": ("Dormitoty for Gents (No. of Beds)", "int", 0),
+    "dormitory_ladies_beds": ("Dormitoty for Ladies (No. of Beds)", "int", 0),
+    "parcel_office": ("Parcel Office (Yes/No)", "text", ""),
+    "no_of_staffs_at_po": ("No. of Staffs at PO", "int", 0),
+    "parcel_packing_available": ("Parcel Packing: Available or not", "text", ""),
+    "reserved_vip_lounge_seating_capacity": ("Reserved/VIP Lounge (Seating Capacity)", "int", 0),
+    "upper_class_waiting_room_seating_capacity": ("Upper Class Waiting Room (Seating Capacity)", "int", 0),
+    "ac_waiting_room_seating_capacity": ("AC Waiting Room (Seating Capacity)", "int", 0),
+    "general_waiting_room_seating_capacity": ("General Waiting Room (Seating Capacity)", "int", 0),
+    "ladies_waiting_room_seating_capacity": ("Ladies Waiting Room (Seating Capacity)", "int", 0),
+    "baby_feeding_corner": ("Baby feeding Corner (Yes/No)", "text", ""),
+    "medical_emergency_centre": ("Free Medical Emergency Centre / Ambulance: Name of Hospital backed by", "text", ""),
+    "first_aid_provision": ("First Aid Provision", "text", ""),
+    "pharmacy": ("Pharmacy", "text", ""),
+    "battery_operated_cars": ("Battery Operated Cars (Nos. & Tariff per Passenger)", "text", ""),
+    "wheel_chair": ("Wheel Chair (Nos.)", "int", 0),
+    "trolley_path": ("Trolley Path (Available at 1 end or Both Or not available)", "text", ""),
+    "divyang_toilet": ("Divyang Toilet", "text", ""),
+    "water_sink_pedestal_for_pwd": ("Water sink/pedestal for PWD (Divyangjan) (atleast 1 unit)", "text", ""),
+    "no_of_railway_sahayak": ("No. of Railway Sahayak (Licensed porters)", "int", 0),
+    "no_of_catering_stall_pf_wise": ("No. of Catering stall (PF Wise)", "int", 0),
+    "no_of_milk_stall_pf_wise": ("No. of Milk stall (PF Wise)", "int", 0),
+    "no_of_multipurpose_stall_pf_wise": ("No. of Multipurpose stall (PF Wise)", "int", 0),
+    "ticket_checking_staff_strength": ("Ticket Checking staffs strength", "int", 0),
+    "osop_stall_location_commodity": ("OSOP stall (Location & Commodity)", "text", ""),
+    "no_of_book_stall_pf_wise": ("No. of Book stall (PF Wise)", "int", 0),
+    "ttdc": ("TTDC", "text", ""),
+    "hpmc": ("HPMC", "text", ""),
+    "food_plaza_irctc": ("Food Plaza (IRCTC)", "text", ""),
+    "jana_aahar_irctc": ("Jana Aahar (IRCTC)", "text", ""),
+    "fast_food_unit_irctc": ("Fast Food Unit (IRCTC)", "text", ""),
+    "refreshment_room_irctc": ("Refreshment Room (IRCTC)", "text", ""),
+    "vrr_nvrr": ("VRR/NVRR", "text", ""),
+    "electronic_train_indicator_board": ("Electronic Train indicator Board", "text", ""),
+    "electronic_coach_indication_board": ("Electronic Coach Indication Board", "text", ""),
+    "rdn_video_wall": ("RDN Video Wall (Nos. with Location)", "text", ""),
+    "manual_coach_indication_board": ("Manual Coach Indication Board", "text", ""),
+    "rdn_cctv": ("RDN CCTV (Train Arr./Dep.)", "text", ""),
+    "wifi_facility": ("Wi-Fi Facility (Yes/No)", "text", ""),
+    "lifts_with_location_pf_no": ("Lifts with Location/PF No.", "text", ""),
+    "escalator_with_location_pf_no": ("Escalator with Location/PF No.", "text", ""),
+    "brailee_signage": ("Brailee Signage (Station Map & Plates)", "text", ""),
+    "atm_facility": ("ATM Facility", "text", ""),
+    "grp_out_post": ("GRP out post", "text", ""),
+    "rpf_post": ("RPF post", "text", ""),
+    "sbi_card_kiosk": ("SBI Card KIOSK", "text", ""),
+    "gaming_zone": ("Gaming Zone", "text", ""),
+    "cleanliness_of_station": ("Cleanliness of Station (DEnHM or Station Imprest)", "text", ""),
+    "cloak_room": ("Cloak Room", "text", ""),
+    "subway": ("Subway", "text", ""),
+    "mobile_charging_points": ("Mobile charging points", "text", ""),
+    "bottle_crusher": ("Bottle Crusher", "text", ""),
+}
+
+WORK_COLUMNS = {
+    "project_id": ("PROJECTID", "text", ""),
+    "year_of_sanction": ("Year of Sanction", "int", 0),
+    "date_of_sanction": ("Date of Sanction", "text", ""),
+    "short_name_of_work": ("Short Name of Work", "text", ""),
+    "block_section": ("Block Section", "text", ""),
+    "station": ("Station", "text", ""),
+    "allocation": ("ALLOCATION", "text", ""),
+    "cost": ("Cost", "real", 0.0),
+    "expenditure_up_to_date": ("Expenditure upto date", "real", 0.0),
+    "financial_progress_percent": ("Financial Progress in %", "real", 0.0),
+    "if_umbrella": ("IF UMBRELLA?", "text", ""),
+    "parent_work": ("PARENT WORK", "text", ""),
+    "section": ("Section", "category", ""),
+    "remarks": ("Remarks", "text", ""),
+    "latest_remarks_civil": ("Latest Remarks Civil", "text", ""),
+    "latest_remarks_electrical": ("Latest Remarks Electrical", "text", ""),
+    "latest_remarks_s_t": ("Latest Remarks S&T", "text", ""),
+    "latest_remarks_civil_as_on": ("Latest Remarks Civil As On (DD-MM-YYYY)", "text", ""),
+}
+
+REMARK_COLUMNS = {
+    "date": ("Date", "text", ""),
+    "works_pending_with": ("Works Pending with", "text", ""),
+    "project_id": ("PROJECTID", "text", ""),
+    "department": ("Department", "text", ""),
+    "remark": ("Remark", "text", ""),
+}
+
+# Works pending-with authority -> source CSV file
+PENDING_WITH_FILES = {
+    "Sr.DEN/E/SBC": "Sr.DEN_E_SBC.csv",
+    "Sr.DEN/W/SBC": "Sr.DEN_W_SBC.csv",
+    "Sr.DEN/S/SBC": "Sr.DEN_S_SBC.csv",
+    "Sr.DEN/N/SBC": "Sr.DEN_N_SBC.csv",
+    "Divisional Works": "Divisional_Works.csv",
+    "Dy.CE/GSU/SBC": "Dy_CE_GSU_SBC.csv",
+    "Sr.DCM/SBC": "Sr.DCM.csv"
+}
+
+# Header spellings used across the division works sheets, matched against
+# header_key() of each cell. A column's own WORK_COLUMNS header is always tried
+# first; synonyms are tried in order afterwards, and each sheet column is used
+# at most once, so a repeated "Latest Remarks Civil <date>" fills
+# latest_remarks_civil and then latest_remarks_civil_as_on.
+WORK_SYNONYMS = {
+    "project_id": (r"project ?id",),
+    "year_of_sanction": (r"year of sanction",),
+    "date_of_sanction": (r"date of sanction",),
+    "short_name_of_work": (r"(short )?name of work",),
+    "block_section": (r"block section( station)?",),
+    "station": (r"station",),
+    "allocation": (r"allocation",),
+    "cost": (r"(current )?cost",),
+    "expenditure_up_to_date": (r"(expenditure|exp\.?) up ?to date",),
+    "financial_progress_percent": (r"financial progress( in %)?",),
+    "if_umbrella": (r"if (umbrella|ub) ?\??",),
+    "parent_work": (r"parent work",),
+    "section": (r"section",),
+    "remarks": (r"remarks", r"latest remarks( as on .*)?", r"remarks as on .*", r"remarks of .*", r"engg\. remarks.*"),
+    "latest_remarks_civil": (r"latest remarks civil.*",),
+    "latest_remarks_electrical": (r"latest remarks electrical.*",),
+    "latest_remarks_s_t": (r"latest remarks s ?& ?t.*",),
+    "latest_remarks_civil_as_on": (r"latest remarks civil.*",),
+}
+
+# Rows searched for the header row; the division sheets have a few title rows above it
+HEADER_SCAN_ROWS = 50
+# Rows per typed chunk yielded by WorksSheetReader
+CHUNK_ROWS = 5000
+
+_YEAR = re.compile(r"(\d{4})")
+# Text pandas reads as missing; a numeric cell holding one is blank, not unparseable
+MISSING_VALUES = {"#N/A", "#NA", "<NA>", "N/A", "NA", "NULL", "None", "n/a", "null"}
+
+
+def header_key(header) -> str:
+    """Normalize a CSV header for matching: collapse whitespace, strip, lowercase."""
+    return " ".join(str(header).replace("﻿", "").split()).lower()
+
+
+def map_columns(df: pd.DataFrame, column_map: dict):
+    """
+    Clean and map a raw CSV frame onto a table's columns using vectorized operations.
+
+    Columns already parsed at read time (numbers, categoricals; see iter_source)
+    only have their blanks filled.
+
+    Parameters:
+        df (pd.DataFrame): Raw frame read with ``dtype=str``, or with read_dtypes().
+        column_map (dict): Target column -> (source header, kind, default).
+
+    Returns:
+        tuple: (mapped DataFrame, number of non-empty values that could not be parsed as numbers).
+    """
+    lookup = {}
+    for col in df.columns:
+        lookup.setdefault(header_key(col), col)
+
+    mapped = {}
+    coerced = 0
+    for target, (source, kind, default) in column_map.items():
+        col = lookup.get(header_key(source))
+        if col is None:
+            mapped[target] = pd.Series(default, index=df.index)
+            continue
+        if kind in ("int", "real") and pd.api.types.is_numeric_dtype(df[col]):
+            numbers = df[col].fillna(default)
+            mapped[target] = numbers.astype("int64") if kind == "int" else numbers.astype("float64")
+            continue
+        if kind == "category" and isinstance(df[col].dtype, pd.CategoricalDtype):
+            mapped[target] = _clean_categories(df[col], default)
+            continue
+        text = df[col].fillna("").astype(str).str.strip()
+        if kind == "text":
+            mapped[target] = text.mask(text == "", default) if default else text
+        elif kind == "category":
+            mapped[target] = (text.mask(text == "", default) if default else text).astype("category")
+        else:
+            numbers = pd.to_numeric(text.str.replace(",", "", regex=False), errors="coerce")
+            coerced += int((numbers.isna() & (text != "")).sum())
+            numbers = numbers.fillna(default)
+            mapped[target] = numbers.astype("int64") if kind == "int" else numbers.astype("float64")
+    return pd.DataFrame(mapped, index=df.index), coerced
+
+
+def _clean_categories(series: pd.Series, default: str) -> pd.Series:
+    """Strip a categorical column read at read time and fill its blanks, on the categories alone."""
+    categories = series.cat.categories.astype(str).str.strip()
+    blank = default or ""
+    if default:
+        categories = categories.where(categories != "", default)
+    cleaned = pd.Index(list(dict.fromkeys([*categories, blank])))
+    codes = series.cat.codes.to_numpy()
+    remap = np.append(cleaned.get_indexer(categories), cleaned.get_loc(blank))
+    # Code -1 (missing) picks the blank appended last
+    return pd.Series(pd.Categorical.from_codes(remap[codes], cleaned), index=series.index)
+
+
+def _parse_number(value: str, unparsed: list) -> float:
+    """Parse one numeric cell as read_csv hands it over, counting text that is not a number."""
+    text = value.strip().replace(",", "")
+    if not text or text in MISSING_VALUES:
+        return np.nan
+    try:
+        return float(text)
+    except ValueError:
+        unparsed[0] += 1
+        return np.nan
+
+
+def read_dtypes(header, column_map: dict) -> tuple:
+    """
+    Pick the CSV columns a column map uses and how read_csv should parse each.
+
+    Categories are read as categoricals and numbers through _parse_number, so
+    a chunk never holds them as one string per cell.
+
+    Parameters:
+        header: Column names of the CSV file.
+        column_map (dict): Target column -> (source header, kind, default).
+
+    Returns:
+        tuple: (column positions, dtypes by header, converters by header,
+                one-item list counting unparseable numbers).
+    """
+    kinds = {header_key(source): kind for source, kind, _ in column_map.values()}
+    positions, dtypes, converters, unparsed = [], {}, {}, [0]
+    seen = set()
+    for position, column in enumerate(header):
+        key = header_key(column)
+        if key not in kinds or key in seen:
+            continue
+        seen.add(key)
+        positions.append(position)
+        if kinds[key] in ("int", "real"):
+            converters[column] = functools.partial(_parse_number, unparsed=unparsed)
+        else:
+            dtypes[column] = "category" if kinds[key] == "category" else str
+    return positions, dtypes, converters, unparsed
+
+
+def _match_columns(headers: list) -> dict:
+    """Map works columns to positions in a header row (see WORK_SYNONYMS)."""
+    keys = [header_key(header) for header in headers]
+    patterns = {
+        target: [re.escape(header_key(WORK_COLUMNS[target][0]))] if target in WORK_COLUMNS else []
+        for target in WORK_SYNONYMS
+    }
+    for target, synonyms in WORK_SYNONYMS.items():
+        patterns[target] += list(synonyms)
+
+    matched, claimed = {}, set()
+    for rank in range(max(len(options) for options in patterns.values())):
+        for target, options in patterns.items():
+            if target in matched or rank >= len(options):
+                continue
+            pattern = re.compile(options[rank])
+            for position, key in enumerate(keys):
+                if position not in claimed and key and pattern.fullmatch(key):
+                    matched[target] = position
+                    claimed.add(position)
+                    break
+    return matched
+
+
+class WorksSheetReader:
+    """
+    Stream a works sheet (CSV or Excel) as typed frames, in one pass over the rows.
+
+    Title rows above the header ("Sr.DEN/EAST", "PH-53-Position of Sanctioned
+    Works") are skipped, the header row is recognised by its column names and
+    mapped onto the works schema through WORK_SYNONYMS, and section banners
+    between the data rows ("Completed works pending for Closure", "Work in
+    Progress") are tracked and attached to the rows below them as "banner".
+    Only CHUNK_ROWS raw rows are held at a time.
+    """
+
+    def __init__(self, source, filename: str = None, pending_with: str = None,
+                 chunk_rows: int = CHUNK_ROWS, fill_missing: bool = False):
+        """
+        Parameters:
+            source: File path or file-like object (e.g. a Streamlit upload).
+            filename (str, optional): Name used to pick the format when source is file-like.
+            pending_with (str, optional): Works pending-with authority to set on every row.
+            chunk_rows (int): Data rows per yielded frame.
+            fill_missing (bool): Add works columns the sheet lacks with their defaults.
+        """
+        self.source = source
+        self.name = os.path.basename(filename or getattr(source, "name", None) or str(source))
+        self.pending_with = pending_with
+        self.chunk_rows = chunk_rows
+        self.fill_missing = fill_missing
+        self.title = None
+        self.header_row = None
+        self.columns = {}
+        self.unmapped = []
+        self.banners = {}
+        self.rows = 0
+        self.coerced = 0
+
+    def _lines(self):
+        """Yield each row of the sheet as a list of strings."""
+        if os.path.splitext(self.name)[1].lower() in (".xlsx", ".xlsm"):
+            from openpyxl import load_workbook
+            workbook = load_workbook(self.source, read_only=True, data_only=True)
+            try:
+                for row in workbook.active.iter_rows(values_only=True):
+                    yield ["" if value is None else str(value) for value in row]
+            finally:
+                workbook.close()
+        elif isinstance(self.source, (str, os.PathLike)):
+            with open(self.source, newline="", encoding="utf-8-sig") as f:
+                yield from csv.reader(f)
+        else:
+            self.source.seek(0)
+            data = self.source.read()
+            text = data.decode("utf-8-sig") if isinstance(data, bytes) else data
+            yield from csv.reader(io.StringIO(text, newline=""))
+
+    def _typed(self, rows: list, banners: list) -> pd.DataFrame:
+        """Convert raw rows into a typed frame of the matched works columns."""
+        raw = pd.DataFrame({
+            target: [row[position] if position < len(row) else "" for row in rows]
+            for target, position in self.columns.items()
+        })
+        if "year_of_sanction" in raw:
+            # "2012-2013" and "2022- 2023" are sanctioned in their first year
+            raw["year_of_sanction"] = raw["year_of_sanction"].str.extract(_YEAR, expand=False)
+        column_map = {
+            target: (target, kind, default) for target, (_, kind, default) in WORK_COLUMNS.items()
+            if target in raw or self.fill_missing
+        }
+        frame, coerced = map_columns(raw, column_map)
+        self.coerced += coerced
+        if self.pending_with is not None:
+            frame.insert(0, "works_pending_with", self.pending_with)
+        frame["banner"] = banners
+        return frame
+
+    def chunks(self):
+        """
+        Yield typed frames of up to chunk_rows data rows.
+
+        Raises:
+            ValueError: If no header row with a PROJECTID column is found.
+        """
+        lines = self._lines()
+        for position, row in enumerate(lines):
+            if position >= HEADER_SCAN_ROWS:
+                break
+            matched = _match_columns(row)
+            if "project_id" in matched and len(matched) >= 2:
+                self.header_row, self.columns = position + 1, matched
+                self.unmapped = [cell.strip() for i, cell in enumerate(row) if cell.strip() and i not in matched.values()]
+                break
+            cells = [cell.strip() for cell in row if cell.strip()]
+            if cells and self.title is None:
+                self.title = cells[0]
+        if self.header_row is None:
+            raise ValueError(f"{self.name}: no header row with a PROJECTID column in the first {HEADER_SCAN_ROWS} rows.")
+
+        key = self.columns["project_id"]
+        banner, rows, banners = "", [], []
+        for row in lines:
+            first = row[0].strip() if row else ""
+            if not first and not any(cell.strip() for cell in row):
+                continue
+            if first and not first.replace(".", "", 1).isdigit() and not (row[key].strip() if key < len(row) else ""):
+                # A section banner: no project ID and text in the first (serial number) column
+                banner = first
+                self.banners.setdefault(banner, 0)
+                continue
+            rows.append(row)
+            banners.append(banner)
+            if banner:
+                self.banners[banner] += 1
+            if len(rows) >= self.chunk_rows:
+                self.rows += len(rows)
+                yield self._typed(rows, banners)
+                rows, banners = [], []
+        if rows or self.rows == 0:
+            self.rows += len(rows)
+            yield self._typed(rows, banners)
+
+    def read(self) -> pd.DataFrame:
+        """Read the whole sheet into one typed frame."""
+        frame = pd.concat(list(self.chunks()), ignore_index=True)
+        self.log()
+        return frame
+
+    def log(self):
+        """Log what was recognised in the sheet."""
+        sections = ", ".join(f"{name} ({count})" for name, count in self.banners.items()) or "none"
+        logging.info(
+            f"{self.name}: header on row {self.header_row}, {len(self.columns)} works columns mapped, "
+            f"{self.rows} data rows; sections: {sections}."
+        )
+        if self.unmapped:
+            logging.info(f"{self.name}: columns not imported: {', '.join(self.unmapped)}.")
+
+
+# Table -> (column map, key column that must be present and unique within a file)
+SOURCES = {
+    "stations": (STATION_COLUMNS, "station_code"),
+    "paavailability": (PAAVAILABILITY_COLUMNS, "station_code"),
+    "works": (WORK_COLUMNS, "project_id"),
+    "remarks": (REMARK_COLUMNS, None),
+}
+
+
+def source_files(csv_folder: str = '.') -> list:
+    """
+    List the CSV files to import from a folder, in dependency order.
+
+    Parameters:
+        csv_folder (str): Path to the folder containing CSV files.
+
+    Returns:
+        list: (table, path, pending_with) tuples for the files that exist;
+              pending_with is only set for works files.
+    """
+    candidates = [("stations", 'stations.csv', None), ("paavailability", 'paavailability.csv', None)]
+    candidates += [("works", filename, key) for key, filename in PENDING_WITH_FILES.items()]
+    candidates.append(("remarks", 'remarks.csv', None))
+
+    files = []
+    for table, filename, pending_with in candidates:
+        path = os.path.join(csv_folder, filename)
+        if os.path.isfile(path):
+            files.append((table, path, pending_with))
+        elif pending_with is not None:
+            logging.warning(f"'{filename}' not found in {csv_folder}. Skipping works initialization for {pending_with}.")
+        else:
+            logging.warning(f"'{filename}' not found in {csv_folder}. Skipping {table} initialization.")
+    logging.info(f"Picked up {len(files)} source files from {csv_folder}: "
+                 f"{', '.join(os.path.basename(path) for _, path, _ in files) or 'none'}.")
+    return files
+
+
+def read_source(table: str, path: str, pending_with: str = None) -> tuple:
+    """
+    Read and clean one CSV file without touching the database.
+
+    Safe to run on worker threads; the result is handed to BulkIngestor.load().
+
+    Parameters:
+        table (str): Target table, a key of SOURCES.
+        path (str): CSV file path; works sheets are read with WorksSheetReader.
+        pending_with (str, optional): Works pending-with authority for works files.
+
+    Returns:
+        tuple: (cleaned frame, rows read, rows rejected, unparseable numbers).
+    """
+    column_map, key = SOURCES[table]
+    if table == "works":
+        reader = WorksSheetReader(path, pending_with=pending_with, fill_missing=True)
+        frame = reader.read().drop(columns="banner")
+        rows_read, coerced = reader.rows, reader.coerced
+    else:
+        raw = pd.read_csv(path, dtype=str)
+        frame, coerced = map_columns(raw, column_map)
+        rows_read = len(raw)
+    frame, rejected = _drop_bad_keys(frame, key)
+    return frame, rows_read, rejected, coerced
+
+
+def _drop_bad_keys(frame: pd.DataFrame, key: str):
+    """Drop rows with an empty key or a key repeated within the frame (first one wins)."""
+    if key is None:
+        return frame, 0
+    valid = (frame[key] != "") & ~frame[key].duplicated()
+    return frame[valid], int((~valid).sum())
+
+
+def iter_source(table: str, path: str, pending_with: str = None, chunk_rows: int = CHUNK_ROWS):
+    """
+    Read and clean one CSV file in bounded chunks, for files too large to hold at once.
+
+    Only the mapped columns are parsed, straight into their dtypes (numbers as
+    float64, zone, division, section and categorisation as categoricals; see
+    read_dtypes), and only one chunk is held at a time. Repeated keys are
+    dropped within a chunk; a key repeated in a later chunk is left to
+    INSERT OR IGNORE and reported as already present.
+
+    Parameters:
+        table (str): Target table, a key of SOURCES.
+        path (str): CSV file path.
+        pending_with (str, optional): Works pending-with authority for works files.
+        chunk_rows (int): Rows per chunk.
+
+    Yields:
+        tuple: (cleaned frame, rows read, rows rejected, unparseable numbers) per chunk,
+               the same shape as read_source() returns for a whole file.
+    """
+    column_map, key = SOURCES[table]
+    if table == "works":
+        reader = WorksSheetReader(path, pending_with=pending_with, chunk_rows=chunk_rows, fill_missing=True)
+        coerced = 0
+        for frame in reader.chunks():
+            rows_read = len(frame)
+            cleaned, rejected = _drop_bad_keys(frame.drop(columns="banner"), key)
+            del frame
+            yield cleaned, rows_read, rejected, reader.coerced - coerced
+            # Let go of this chunk before the reader builds the next one
+            del cleaned
+            coerced = reader.coerced
+        reader.log()
+        return
+
+    header = pd.read_csv(path, nrows=0).columns
+    usecols, dtypes, converters, unparsed = read_dtypes(header, column_map)
+    chunks = pd.read_csv(path, usecols=usecols or None, dtype=dtypes, converters=converters,
+                         chunksize=chunk_rows)
+    for raw in chunks:
+        rows_read = len(raw)
+        frame, coerced = map_columns(raw, column_map)
+        del raw
+        cleaned, rejected = _drop_bad_keys(frame, key)
+        del frame
+        yield cleaned, rows_read, rejected, coerced + unparsed[0]
+        del cleaned
+        unparsed[0] = 0
+
+
+class BulkIngestor:
+    """
+    Load the division CSV files into SQLite with one ``executemany`` per table,
+    all inside a single transaction.
+
+    The triggers that keep ph53_summary and station_summary current fire once
+    per row, so they are dropped while a table loads; its summary is then
+    rebuilt with one grouped query and the triggers restored, in the same
+    transaction.
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        """
+        Initialize the BulkIngestor with an open SQLite connection.
+
+        Parameters:
+            conn (sqlite3.Connection): Connection whose tables were created by Database.
+        """
+        self.conn = conn
+        self.report = {}
+        self.timings = {}
+
+    def _foreign_keys_enabled(self) -> bool:
+        return bool(self.conn.execute("PRAGMA foreign_keys;").fetchone()[0])
+
+    def _existing_keys(self, table: str, column: str) -> set:
+        return {row[0] for row in self.conn.execute(f"SELECT {column} FROM {table};")}
+
+    def _insert(self, table: str, frame: pd.DataFrame, rows_read: int, rejected: int, coerced: int):
+        """Insert a cleaned frame with one executemany and record its report entry."""
+        columns = list(frame.columns)
+        placeholders = ", ".join("?" for _ in columns)
+        sql = f"INSERT OR IGNORE INTO {table} ({', '.join(columns)}) VALUES ({placeholders});"
+        # Column-wise tolist() yields native Python values far faster than to_dict("records").
+        rows = zip(*(frame[col].tolist() for col in columns))
+        # rowcount, unlike total_changes, leaves out rows written by triggers (ph53_summary)
+        inserted = max(self.conn.executemany(sql, rows).rowcount, 0)
+
+        entry = self.report.setdefault(table, {"rows": 0, "inserted": 0, "rejected": 0, "existing": 0, "coerced": 0})
+        entry["rows"] += rows_read
+        entry["inserted"] += inserted
+        entry["rejected"] += rejected
+        entry["existing"] += len(frame) - inserted
+        entry["coerced"] += coerced
+
+    def _with_parents(self, frame: pd.DataFrame, column: str, parents: set, allow_empty: bool = True):
+        """Drop rows whose foreign key does not match an existing parent row."""
+        if not self._foreign_keys_enabled():
+            return frame, 0
+        valid = frame[column].isin(parents)
+        if allow_empty:
+            valid |= frame[column] == ""
+        return frame[valid], int((~valid).sum())
+
+    def _parents(self, table: str) -> list:
+        """Return (column, parent keys, allow empty) for each foreign key checked before inserting into a table."""
+        checks = []
+        if table == "paavailability":
+            checks.append(("station_code", self._existing_keys("stations", "station_code"), False))
+        elif table in ("works", "remarks"):
+            checks.append(("works_pending_with", self._existing_keys("paavailability", "station_code"), True))
+        if table == "remarks":
+            checks.append(("project_id", self._existing_keys("works", "project_id"), True))
+        return checks
+
+    def _insert_checked(self, table: str, source: tuple, parents: list):
+        """Reject rows without parent rows, then insert the rest."""
+        frame, rows_read, rejected, coerced = source
+        for column, keys, allow_empty in parents:
+            frame, orphans = self._with_parents(frame, column, keys, allow_empty)
+            rejected += orphans
+        self._insert(table, frame, rows_read, rejected, coerced)
+
+    def _timed(self, step: str, start: float):
+        self.timings[step] = self.timings.get(step, 0.0) + time.perf_counter() - start
+
+    def _before_load(self, table: str):
+        """Drop the summary triggers of a table for the duration of its load."""
+        if table not in SUMMARIES:
+            return
+        if not self.conn.in_transaction:
+            # DDL would otherwise commit on its own, outside the caller's transaction
+            self.conn.execute("BEGIN;")
+        triggers, _ = SUMMARIES[table]
+        for statement in triggers():
+            self.conn.execute(f"DROP TRIGGER IF EXISTS {trigger_name(statement)};")
+
+    def _after_load(self, table: str):
+        start = time.perf_counter()
+        if table in SUMMARIES:
+            triggers, rebuild = SUMMARIES[table]
+            rebuild(self.conn)
+            for statement in triggers():
+                self.conn.execute(statement)
+            self._timed("summaries", start)
+        elif table == "paavailability":
+            migrated = migrate_paavailability(self.conn)
+            self.report["station_amenities"] = {
+                "rows": migrated["stations"], "inserted": migrated["rows"], "rejected": 0,
+                "existing": 0, "coerced": migrated["unparsed"],
+            }
+            self._timed("station_amenities", start)
+
+    def load(self, table: str, source: tuple):
+        """
+        Insert a file prepared by read_source() into its table.
+
+        Rows whose parent rows are missing are rejected up front, and importing
+        paavailability also rebuilds station_amenities. Runs in the caller's
+        transaction, which must roll back on error (as Database.write does) so
+        that dropped summary triggers come back.
+
+        Parameters:
+            table (str): Target table, a key of SOURCES.
+            source (tuple): The result of read_source().
+        """
+        self._before_load(table)
+        start = time.perf_counter()
+        self._insert_checked(table, source, self._parents(table))
+        self._timed("insert", start)
+        self._after_load(table)
+
+    def load_stream(self, table: str, chunks):
+        """
+        Insert a file chunk by chunk as iter_source() reads it.
+
+        Parent keys are read once per file; each chunk is checked, inserted with
+        one executemany and released before the next is read, so memory stays
+        bounded by the chunk size. Runs in the caller's transaction.
+
+        Parameters:
+            table (str): Target table, a key of SOURCES.
+            chunks: The iterator returned by iter_source().
+        """
+        parents = self._parents(table)
+        self._before_load(table)
+        for source in chunks:
+            start = time.perf_counter()
+            self._insert_checked(table, source, parents)
+            del source
+            self._timed("insert", start)
+        self._after_load(table)
+
+    def log_report(self):
+        for table, counts in self.report.items():
+            logging.info(
+                f"{table}: {counts['rows']} rows read, {counts['inserted']} inserted, "
+                f"{counts['rejected']} rejected, {counts['existing']} already present, "
+                f"{counts['coerced']} unparseable numbers."
+            )
+        if self.timings:
+            logging.info("Import steps: " + ", ".join(f"{step} {seconds:.3f}s" for step, seconds in self.timings.items()))
+
+    def ingest_folder(self, csv_folder: str = '.', chunk_rows: int = None) -> dict:
+        """
+        Import stations, paavailability, works and remarks CSV files from a folder.
+
+        Parameters:
+            csv_folder (str): Path to the folder containing CSV files.
+            chunk_rows (int, optional): Stream each file in chunks of this many rows
+                                        (see iter_source) instead of reading it whole.
+
+        Returns:
+            dict: Per-table counts of rows read, inserted, rejected, already existing
+                  and numeric values that could not be parsed.
+        """
+        self.report = {}
+        self.timings = {}
+        start = time.perf_counter()
+        with self.conn:
+            for table, path, pending_with in source_files(csv_folder):
+                if chunk_rows:
+                    self.load_stream(table, iter_source(table, path, pending_with, chunk_rows))
+                else:
+                    self.load(table, read_source(table, path, pending_with))
+        self.log_report()
+        logging.info(f"Bulk CSV import completed in {time.perf_counter() - start:.3f}s.")
+        return self.report
+
+
+class ImportJob:
+    """
+    Import a CSV folder in the background while the app keeps serving.
+
+    Every source file is read and cleaned by its own task on a thread pool.
+    A coordinator thread hands each file to the database's single writer in
+    dependency order (stations, paavailability, works, remarks) and commits
+    after each one, so finished tables are visible to readers right away.
+    """
+
+    def __init__(self, db, csv_folder: str = '.', max_workers: int = 4):
+        """
+        Parameters:
+            db (Database): Database whose writer connection performs the inserts.
+            csv_folder (str): Path to the folder containing CSV files.
+            max_workers (int): Number of file-reading threads.
+        """
+        self.db = db
+        self.csv_folder = csv_folder
+        self.max_workers = max_workers
+        self.files = source_files(csv_folder)
+        self.tasks = [
+            {"table": table, "file": os.path.basename(path), "bytes": os.path.getsize(path),
+             "state": "queued", "rows": 0, "inserted": 0, "rejected": 0, "error": None}
+            for table, path, _ in self.files
+        ]
+        self.report = {}
+        self.error = None
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        """Start the import; calling it again while running does nothing."""
+        with self._lock:
+            if self._thread is not None:
+                return self
+            self.started_at = time.time()
+            self._thread = threading.Thread(target=self._run, name="csv-import", daemon=True)
+            self._thread.start()
+        return self
+
+    def _set(self, position: int, **values):
+        with self._lock:
+            self.tasks[position].update(values)
+
+    def _read(self, position: int, table: str, path: str, pending_with: str):
+        self._set(position, state="reading")
+        source = read_source(table, path, pending_with)
+        self._set(position, state="read")
+        return source
+
+    def _run(self):
+        ingestor = self.db.write(BulkIngestor)
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="csv-read") as pool:
+                futures = [
+                    pool.submit(self._read, position, table, path, pending_with)
+                    for position, (table, path, pending_with) in enumerate(self.files)
+                ]
+                for position, ((table, _, _), future) in enumerate(zip(self.files, futures)):
+                    try:
+                        source = future.result()
+                        self._set(position, state="inserting")
+                        before = dict(ingestor.report.get(table, {}))
+                        self.db.write(lambda conn: ingestor.load(table, source))
+                        after = ingestor.report[table]
+                        self._set(
+                            position, state="done",
+                            rows=after["rows"] - before.get("rows", 0),
+                            inserted=after["inserted"] - before.get("inserted", 0),
+                            rejected=after["rejected"] - before.get("rejected", 0),
+                        )
+                    except Exception as e:
+                        logging.error(f"Background import of {self.tasks[position]['file']} failed: {e}")
+                        self._set(position, state="failed", error=str(e))
+        except Exception as e:
+            logging.error(f"Background import failed: {e}")
+            self.error = str(e)
+        finally:
+            with self._lock:
+                self.report = ingestor.report
+                self.finished_at = time.time()
+            ingestor.log_report()
+            logging.info(f"Background CSV import completed in {self.finished_at - self.started_at:.3f}s.")
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self.finished_at is None
+
+    def progress(self) -> dict:
+        """
+        Return a snapshot of the import's progress.
+
+        Progress is weighted by file size: a file counts as half done once read
+        and fully done once inserted. The ETA extrapolates the elapsed time.
+
+        Returns:
+            dict: "fraction" (0..1), "eta_seconds" (None until measurable),
+                  "elapsed_seconds", "finished" and a copy of the per-file "tasks".
+        """
+        with self._lock:
+            tasks = [dict(task) for task in self.tasks]
+            finished = self.finished_at is not None
+            end = self.finished_at or time.time()
+        weights = {"queued": 0.0, "reading": 0.0, "read": 0.5, "inserting": 0.5, "done": 1.0, "failed": 1.0}
+        total = sum(task["bytes"] for task in tasks) or 1
+        fraction = 1.0 if finished else sum(task["bytes"] * weights[task["state"]] for task in tasks) / total
+        elapsed = end - self.started_at if self.started_at else 0.0
+        eta = None
+        if finished:
+            eta = 0.0
+        elif fraction > 0:
+            eta = elapsed * (1 - fraction) / fraction
+        return {"fraction": fraction, "eta_seconds": eta, "elapsed_seconds": elapsed, "finished": finished, "tasks": tasks}
@@ -0,0 +1,576 @@
+# nl_query.py
+
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+import pandas as pd
+from amenity_store import AMENITY_COLUMNS
+from data_cache import cache, db_fingerprint
+from database import Database
+from ingest import PENDING_WITH_FILES
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s]: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Compiled plans kept per engine, and rows returned when a question sets no limit
+PLAN_CACHE_SIZE = 1024
+DEFAULT_LIMIT = 200
+
+# Comparison words -> SQL operator
+_COMPARISONS = [
+    (r"at least|not less than|minimum of|>=", ">="),
+    (r"at most|not more than|maximum of|up to|<=", "<="),
+    (r"under|below|less than|lower than|fewer than|<", "<"),
+    (r"over|above|more than|greater than|higher than|exceeding|>", ">"),
+    (r"exactly|equal to|=", "="),
+]
+_COMPARISON = "|".join(f"(?:{words})" for words, _ in _COMPARISONS)
+_NUMBER = r"(\d+(?:\.\d+)?)"
+
+# Subjects of the works titles, matched as phrases; the pattern is what the title is searched for
+WORK_TOPICS = {
+    "foot over bridge": "foot over bridge", "fob": "fob", "lift": "lift", "escalator": "escalator",
+    "toilet": "toilet", "urinal": "urinal", "shelter": "shelter", "lighting": "light", "platform": "platform",
+    "parking": "parking", "drinking water": "water", "waiting hall": "waiting", "waiting room": "waiting",
+    "circulating area": "circulating", "coach indicator": "coach", "signage": "signage", "seating": "seat",
+    "booking office": "booking", "road over bridge": "road over bridge", "subway": "subway",
+}
+
+# Amenity names as written in questions -> normalized amenity in station_amenities
+AMENITY_WORDS = {
+    **{name.replace("_", " ").rstrip("s"): name for name in AMENITY_COLUMNS},
+    **{name.replace("_", " "): name for name in AMENITY_COLUMNS},
+    "drinking water": "drinking_water_taps", "water taps": "drinking_water_taps", "taps": "drinking_water_taps",
+    "benches": "seating", "seats": "seating", "shelter": "platform_shelter_sqm", "toilets": "pay_use_toilets",
+    "water coolers": "water_cooler", "lift": "lifts", "escalator": "escalators", "wheelchairs": "wheel_chairs",
+    "wheel chairs": "wheel_chairs", "atvms": "atvm", "uts counters": "uts_counters", "prs counters": "prs_counters",
+}
+
+# Words that carry no filter; anything else left over is reported as not understood
+_STOPWORDS = set("""
+a all an and any are at by can do does find for from get give have how i in is it list me of on or please
+sanctioned sanction show that the there these those to under was were what which who with works work projects
+project stations station section sections year years whose where having has been being their them list
+""".split())
+
+
+def _normalize(question: str) -> str:
+    """
+    Collapse whitespace; questions that normalize alike share a plan.
+
+    Case is kept: station codes are recognised only in capitals, so "works at
+    sbc" and "works at SBC" can plan differently.
+    """
+    return " ".join(str(question).split())
+
+
+def _operator(words: str) -> str:
+    for pattern, operator in _COMPARISONS:
+        if re.fullmatch(pattern, words.strip()):
+            return operator
+    raise ValueError(f"unknown comparison {words!r}")
+
+
+def _words(value: str) -> str:
+    """Regex for a phrase with any spacing or hyphenation between its words."""
+    return r"[\s\-]*".join(re.escape(part) for part in re.split(r"[\s\-]+", value.strip().lower()) if part)
+
+
+def _key(text: str) -> str:
+    """Lookup key of a matched phrase: "YNK-KQZ" and "ynk kqz" both give "ynk kqz"."""
+    return " ".join(part for part in re.split(r"[\s\-]+", text.strip().lower()) if part)
+
+
+def _alternation(names) -> str:
+    """One regex group matching any of the names, longest first so "NSG-1" never matches inside "NSG-10"."""
+    names = sorted({_key(name) for name in names if _key(name)}, key=len, reverse=True)
+    return "(?:" + "|".join(_words(name) for name in names) + ")" if names else r"(?!x)x"
+
+
+# Ordering words -> (sort key, direction)
+_ORDERINGS = [
+    (r"\b(?:most expensive|costliest|highest cost|by cost)", ("cost", "DESC")),
+    (r"\b(?:cheapest|least expensive|lowest cost)", ("cost", "ASC")),
+    (r"\b(?:most progress|highest progress|most advanced|by progress)", ("progress", "DESC")),
+    (r"\b(?:least progress|lowest progress|least advanced)", ("progress", "ASC")),
+    (r"\b(?:latest|newest|most recent|by year)", ("year", "DESC")),
+    (r"\b(?:oldest|earliest)", ("year", "ASC")),
+    (r"\b(?:busiest|by footfall|highest footfall)", ("footfall", "DESC")),
+]
+
+_AMENITY = rf"(?P<amenity>{_alternation(AMENITY_WORDS)})s?(?![\w-])"
+_AMENITY_ABSENT = re.compile(rf"\b(?:without|no|lacking|missing)\s+(?:any\s+)?{_AMENITY}")
+_AMENITY_COUNT = re.compile(rf"\bwith\s+(?P<op>{_COMPARISON})\s+{_NUMBER}\s+{_AMENITY}")
+_AMENITY_PRESENT = re.compile(rf"\b(?:with|having)\s+(?:an?\s+)?{_AMENITY}")
+_TOPIC_PATTERN = re.compile(rf"(?<![\w-])(?P<topic>{_alternation(WORK_TOPICS)})s?(?![\w-])")
+
+
+class Vocabulary:
+    """
+    Names a question can refer to, read from the database.
+
+    Sections, categories, divisions, zones, station names and the works
+    pending-with authorities are compiled into one pattern each, so parsing
+    costs the same however many stations there are. The signature changes
+    only when one of these names does, so edits to other columns keep the
+    compiled plans.
+    """
+
+    def __init__(self, conn):
+        """
+        Parameters:
+            conn (sqlite3.Connection): Connection to read the names from.
+        """
+        def distinct(sql):
+            return sorted({str(value).strip() for (value,) in conn.execute(sql).fetchall()
+                           if value is not None and str(value).strip()})
+
+        work_sections = distinct("SELECT DISTINCT section FROM works;")
+        self.station_sections = distinct("SELECT DISTINCT section FROM stations;")
+        self.categories = distinct("SELECT DISTINCT categorisation FROM stations;")
+        self.divisions = distinct("SELECT DISTINCT division FROM stations;")
+        self.zones = distinct("SELECT DISTINCT zone FROM stations;")
+        self.pending_with = distinct("SELECT DISTINCT works_pending_with FROM works;") or sorted(PENDING_WITH_FILES)
+        stations = conn.execute("SELECT station_code, station_name FROM stations;").fetchall()
+        self.station_codes = {str(code).strip().upper() for code, _ in stations if code}
+        self.station_names = {_key(str(name)): str(code).strip().upper()
+                              for code, name in stations if code and name and len(str(name).strip()) > 3}
+
+        # A works section holds one or more comma-separated names ("east, west");
+        # station sections may end in " Section", which questions may leave out.
+        names = {part.strip() for value in work_sections for part in value.split(",") if part.strip()}
+        self.sections = {}
+        for section in sorted(names | set(self.station_sections)):
+            self.sections.setdefault(_key(re.sub(r"\s+section$", "", section, flags=re.IGNORECASE)), section)
+        self.lookup = {
+            "category": {_key(name): name for name in self.categories},
+            "division": {_key(name): name for name in self.divisions},
+            "zone": {_key(name): name for name in self.zones},
+            "pending_with": {_key(name): name for name in self.pending_with},
+        }
+
+        self.section_pattern = re.compile(
+            rf"(?:\bsection\s+)?(?<![\w-])(?P<name>{_alternation(self.sections)})(?![\w-])(?:\s+section\b)?")
+        self.category_pattern = re.compile(
+            rf"(?<![\w-])(?P<name>{_alternation(self.categories)})(?![\w-])(?:\s+category\b)?")
+        self.place_patterns = {
+            column: re.compile(rf"(?<![\w-])(?P<name>{_alternation(names)})\s+{column}\b"
+                               rf"|\b{column}\s+(?P<after>{_alternation(names)})(?![\w-])")
+            for column, names in (("division", self.divisions), ("zone", self.zones))
+        }
+        self.pending_pattern = re.compile(
+            rf"\b(?:pending with|with)\s+(?P<name>{_alternation(self.pending_with)})(?![\w-])")
+        self.station_pattern = re.compile(rf"(?<![\w-]){_alternation(self.station_names)}(?![\w-])")
+        self.signature = hashlib.blake2b(repr((
+            sorted(self.sections.items()), self.categories, self.divisions, self.zones, self.pending_with,
+            sorted(self.station_codes), sorted(self.station_names.items()),
+        )).encode(), digest_size=12).hexdigest()
+
+
+class QueryPlan:
+    """
+    A question compiled to one parameterized SQL statement.
+
+    Attributes:
+        target (str): "works", "stations" or "amenities".
+        sql (str): The statement; every value is a ? parameter.
+        params (tuple): Parameter values.
+        understood (list): Plain descriptions of the filters, ordering and limit applied.
+        ignored (list): Words of the question that were not understood.
+    """
+
+    def __init__(self, target: str, sql: str, params: tuple, understood: list, ignored: list):
+        self.target = target
+        self.sql = sql
+        self.params = params
+        self.understood = understood
+        self.ignored = ignored
+
+    def __repr__(self):
+        return f"QueryPlan({self.target!r}, {self.sql!r}, {self.params!r})"
+
+
+class _Question:
+    """The question text with the parts already understood blanked out."""
+
+    def __init__(self, question: str):
+        self.original = " ".join(str(question).split())
+        self.text = self.original.lower()
+
+    def take(self, pattern: str, flags=0):
+        """Find and blank out the first match (searched case-insensitively); returns the match or None."""
+        match = re.search(pattern, self.text, flags)
+        if match:
+            self._blank(match.start(), match.end())
+        return match
+
+    def take_all(self, pattern: str) -> list:
+        matches = list(re.finditer(pattern, self.text))
+        for match in matches:
+            self._blank(match.start(), match.end())
+        return matches
+
+    def _blank(self, start: int, end: int):
+        self.text = self.text[:start] + " " * (end - start) + self.text[end:]
+        self.original = self.original[:start] + " " * (end - start) + self.original[end:]
+
+    def leftover(self) -> list:
+        return [word for word in re.findall(r"[a-z0-9][a-z0-9.\-/%]*", self.text) if word not in _STOPWORDS]
+
+
+class QueryParser:
+    """
+    Rule-based parser from English questions to QueryPlans.
+
+    Each rule recognises one kind of phrase ("sanctioned after 2020",
+    "progress under 50%", "in YNK-KQZ section", "without lifts", "top 10 by
+    cost") and adds a condition with its values as parameters; the question
+    text never reaches the SQL. Rules run in a fixed order and blank out what
+    they matched, so later rules do not see it again.
+    """
+
+    def __init__(self, vocabulary: Vocabulary):
+        self.vocabulary = vocabulary
+
+    def parse(self, question: str, limit: int = DEFAULT_LIMIT) -> QueryPlan:
+        """
+        Compile a question.
+
+        Parameters:
+            question (str): The question, e.g. "works in YNK-KQZ section sanctioned after 2020 with progress under 50%".
+            limit (int): Rows returned when the question does not ask for a number.
+
+        Returns:
+            QueryPlan: The compiled plan.
+        """
+        q = _Question(question)
+        conditions, params, understood = [], [], []
+
+        def where(condition, values, description):
+            conditions.append(condition)
+            params.extend(values)
+            understood.append(description)
+
+        aggregate = self._aggregate(q, understood)
+        order, limit = self._order_and_limit(q, understood, limit)
+        target, amenity = self._target(q)
+
+        if amenity is not None:
+            name, operator, quantity = amenity
+            where(f"COALESCE(a.quantity, 0) {operator} ?", [quantity], f"{name.replace('_', ' ')} {operator} {quantity:g}")
+        if target == "works":
+            self._works_filters(q, where)
+        else:
+            self._station_number_filters(q, where)
+        self._place_filters(q, where, target)
+
+        if target == "works":
+            sql, select_params = self._works_sql(conditions, aggregate, order)
+        else:
+            sql, select_params = self._stations_sql(conditions, aggregate, order, amenity)
+        params = select_params + params
+        if not aggregate:
+            sql += " LIMIT ?"
+            params.append(limit)
+            understood.append(f"at most {limit} rows")
+        return QueryPlan(target, sql + ";", tuple(params), understood, q.leftover())
+
+    def _aggregate(self, q: _Question, understood: list):
+        if q.take(r"\b(how many|number of|count of|count)\b"):
+            understood.append("count")
+            return "count"
+        if q.take(r"\b(total|sum of|combined) (current )?cost\b"):
+            understood.append("total cost")
+            return "total_cost"
+        if q.take(r"\b(average|mean|avg)( financial)? progress\b"):
+            understood.append("average progress")
+            return "average_progress"
+        return None
+
+    def _order_and_limit(self, q: _Question, understood: list, limit: int) -> tuple:
+        order = None
+        match = q.take(r"\b(?:top|first|largest|biggest) (\d+)\b")
+        if match:
+            limit = int(match.group(1))
+        for pattern, rule in _ORDERINGS:
+            # "latest 20 works", "cheapest 5"
+            match = q.take(pattern + r"(?:\s+(\d+))?\b")
+            if match:
+                order = rule
+                if match.group(match.re.groups):
+                    limit = int(match.group(match.re.groups))
+                understood.append(f"sorted by {rule[0]} {'descending' if rule[1] == 'DESC' else 'ascending'}")
+                break
+        return order, limit
+
+    def _target(self, q: _Question) -> tuple:
+        """Decide what the question lists; returns (target, amenity condition or None)."""
+        if re.search(r"\b(works?|projects?|pids?)\b", q.text):
+            return "works", None
+        amenity = self._amenity(q)
+        if amenity is not None:
+            return "amenities", amenity
+        if re.search(r"\bstations?\b", q.text):
+            return "stations", None
+        return "works", None
+
+    @staticmethod
+    def _amenity(q: _Question):
+        """Match "without lifts", "with fewer than 4 urinals", "with escalators"; returns (amenity, op, quantity)."""
+        match = q.take(_AMENITY_ABSENT)
+        if match:
+            return AMENITY_WORDS[_key(match.group("amenity"))], "=", 0.0
+        match = q.take(_AMENITY_COUNT)
+        if match:
+            return AMENITY_WORDS[_key(match.group("amenity"))], _operator(match.group("op")), float(match.group(2))
+        match = q.take(_AMENITY_PRESENT)
+        if match:
+            return AMENITY_WORDS[_key(match.group("amenity"))], ">", 0.0
+        return None
+
+    def _works_filters(self, q: _Question, where):
+        # Pending-with first, so its "with" is not read by the rules below
+        match = q.take(self.vocabulary.pending_pattern)
+        if match:
+            authority = self.vocabulary.lookup["pending_with"][_key(match.group("name"))]
+            where("w.works_pending_with = ?", [authority], f"pending with {authority}")
+        else:
+            match = q.take(r"\bpending with\s+([\w.&/\-]+)")
+            if match:
+                where("w.works_pending_with LIKE ?", [match.group(1) + "%"], f"pending with {match.group(1)}*")
+
+        # Cost before years, so "cost over 5000" is not a year
+        match = q.take(rf"\b(?:current\s+)?cost(?:ing)?\s+(?:is\s+|of\s+)?({_COMPARISON})\s+(?:rs\.?\s*)?{_NUMBER}")
+        if match:
+            operator, value = _operator(match.group(1)), float(match.group(2))
+            where(f"w.cost {operator} ?", [value], f"cost {operator} {value:g}")
+
+        progress = r"(?:financial\s+)?(?:progress|completion|complete)"
+        match = q.take(rf"\b{progress}\s+(?:is\s+|of\s+)?({_COMPARISON})\s+{_NUMBER}\s*(?:%|percent)?")
+        if match is None:
+            match = q.take(rf"\b({_COMPARISON})\s+{_NUMBER}\s*(?:%|percent)\s*(?:{progress})?")
+        if match:
+            operator, value = _operator(match.group(1)), float(match.group(2))
+            where(f"w.financial_progress_percent {operator} ?", [value], f"progress {operator} {value:g}%")
+        elif q.take(r"\bnot (?:yet )?started\b"):
+            where("COALESCE(w.financial_progress_percent, 0) = 0", [], "not started")
+        elif q.take(r"\b(?:incomplete|not completed|ongoing|in progress|unfinished)\b"):
+            where("COALESCE(w.financial_progress_percent, 0) < 100", [], "not completed")
+        elif q.take(r"\b(?:completed|complete|finished)\b"):
+            where("w.financial_progress_percent >= 100", [], "completed")
+
+        # Years of sanction, whole ("2021") or financial ("2021-22", taken as its first year)
+        year = r"((?:19|20)\d{2})(?:\s*-\s*\d{2,4})?"
+        match = q.take(rf"\b(?:sanctioned\s+)?between\s+{year}\s+and\s+{year}\b")
+        if match:
+            low, high = sorted((int(match.group(1)), int(match.group(2))))
+            where("w.year_of_sanction BETWEEN ? AND ?", [low, high], f"sanctioned {low}–{high}")
+        for words, operator in (("after|since|from|later than", ">"), ("before|until|earlier than|prior to", "<")):
+            match = q.take(rf"\b(?:sanctioned\s+)?({words})\s+{year}\b")
+            if match:
+                operator = ">=" if match.group(1) in ("since", "from") else operator
+                where(f"w.year_of_sanction {operator} ?", [int(match.group(2))], f"sanctioned {operator} {match.group(2)}")
+        match = q.take(rf"\b(?:sanctioned\s+)?(?:in|during|of)\s+(?:fy\s*)?{year}\b") or q.take(rf"\b{year}\b")
+        if match:
+            where("w.year_of_sanction = ?", [int(match.group(1))], f"sanctioned in {match.group(1)}")
+
+        for match in q.take_all(r"\"([^\"]+)\"|'([^']+)'"):
+            phrase = match.group(1) or match.group(2)
+            where("w.short_name_of_work LIKE ?", [f"%{phrase}%"], f'title contains "{phrase}"')
+        for match in q.take_all(_TOPIC_PATTERN):
+            topic = _key(match.group("topic"))
+            where("w.short_name_of_work LIKE ?", [f"%{WORK_TOPICS[topic]}%"], f"about {topic}")
+
+    @staticmethod
+    def _station_number_filters(q: _Question, where):
+        match = q.take(rf"\b(?:with\s+)?({_COMPARISON})\s+{_NUMBER}\s+platforms?\b")
+        if match:
+            operator = _operator(match.group(1))
+            where(f"s.number_of_platforms {operator} ?", [float(match.group(2))], f"platforms {operator} {match.group(2)}")
+        match = q.take(rf"\b(?:passenger\s+)?footfall\s+(?:is\s+|of\s+)?({_COMPARISON})\s+{_NUMBER}")
+        if match:
+            operator = _operator(match.group(1))
+            where(f"s.passenger_footfall {operator} ?", [float(match.group(2))], f"footfall {operator} {match.group(2)}")
+
+    def _place_filters(self, q: _Question, where, target: str):
+        """Section, category, division, zone and station conditions."""
+        vocabulary = self.vocabulary
+
+        def of_stations(condition):
+            # Works name their stations by code, one or several comma-separated in works.station.
+            # The single-code case is a set lookup; only lists fall back to matching codes one by one.
+            if target != "works":
+                return condition
+            return (
+                f"(w.station IN (SELECT s.station_code FROM stations s WHERE {condition}) OR "
+                f"(w.station LIKE '%,%' AND EXISTS (SELECT 1 FROM stations s WHERE {condition} AND "
+                "(',' || REPLACE(w.station, ' ', '') || ',') LIKE ('%,' || s.station_code || ',%'))))"
+            )
+
+        match = q.take(vocabulary.section_pattern)
+        if match:
+            section = vocabulary.sections[_key(match.group("name"))]
+            if target == "works":
+                where(
+                    "((',' || REPLACE(LOWER(w.section), ', ', ',') || ',') LIKE ? OR "
+                    + of_stations("s.section = ? COLLATE NOCASE") + ")",
+                    [f"%,{section.lower()},%", section, section], f"section {section}",
+                )
+            else:
+                where("s.section = ? COLLATE NOCASE", [section], f"section {section}")
+
+        match = q.take(vocabulary.category_pattern)
+        if match:
+            category = vocabulary.lookup["category"][_key(match.group("name"))]
+            values = [category, category] if target == "works" else [category]
+            where(of_stations("s.categorisation = ?"), values, f"category {category}")
+
+        for column, pattern in vocabulary.place_patterns.items():
+            match = q.take(pattern)
+            if match:
+                name = vocabulary.lookup[column][_key(match.group("name") or match.group("after"))]
+                values = [name, name] if target == "works" else [name]
+                where(of_stations(f"s.{column} = ? COLLATE NOCASE"), values, f"{column} {name}")
+
+        codes = [vocabulary.station_names[_key(match.group(0))] for match in q.take_all(vocabulary.station_pattern)]
+        # Station codes count only when written in capitals, so "at" or "in" never match one
+        for match in re.finditer(r"(?<![\w-])[A-Z][A-Z0-9]{1,5}(?![\w-])", q.original):
+            if match.group(0) in vocabulary.station_codes:
+                codes.append(match.group(0))
+                q._blank(match.start(), match.end())
+        if codes:
+            codes = list(dict.fromkeys(codes))
+            if target == "works":
+                condition = " OR ".join("(',' || REPLACE(w.station, ' ', '') || ',') LIKE ?" for _ in codes)
+                where(f"({condition})", [f"%,{code},%" for code in codes], f"station {', '.join(codes)}")
+            else:
+                where(f"s.station_code IN ({', '.join('?' for _ in codes)})", codes, f"station {', '.join(codes)}")
+
+    @staticmethod
+    def _works_sql(conditions: list, aggregate, order) -> tuple:
+        if aggregate == "count":
+            select = "SELECT COUNT(*) AS works"
+        elif aggregate == "total_cost":
+            select = "SELECT COUNT(*) AS works, SUM(w.cost) AS total_cost"
+        elif aggregate == "average_progress":
+            select = "SELECT COUNT(*) AS works, AVG(w.financial_progress_percent) AS average_progress"
+        else:
+            select = (
+                "SELECT w.project_id, w.short_name_of_work, w.station, w.section, w.year_of_sanction, "
+                "w.cost, w.financial_progress_percent, w.works_pending_with"
+            )
+        sql = f"{select} FROM works w"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        columns = {"cost": "w.cost", "progress": "w.financial_progress_percent", "year": "w.year_of_sanction"}
+        if not aggregate:
+            column, direction = (columns.get(order[0]), order[1]) if order else (None, None)
+            sql += f" ORDER BY {column} {direction}, w.project_id" if column else " ORDER BY w.project_id"
+        return sql, []
+
+    @staticmethod
+    def _stations_sql(conditions: list, aggregate, order, amenity) -> tuple:
+        params = []
+        if aggregate:
+            select = "SELECT COUNT(*) AS stations"
+        else:
+            select = (
+                "SELECT s.station_code, s.station_name, s.categorisation, s.section, s.division, s.zone, "
+                "s.number_of_platforms, s.passenger_footfall"
+            )
+            if amenity is not None:
+                select += ", COALESCE(a.quantity, 0) AS quantity"
+        sql = f"{select} FROM stations s"
+        if amenity is not None:
+            # Only surveyed stations (with a paavailability row) can be said to lack an amenity
+            sql += (
+                " JOIN paavailability p ON p.station_code = s.station_code"
+                " LEFT JOIN (SELECT station_code, SUM(quantity) AS quantity FROM station_amenities"
+                " WHERE amenity = ? GROUP BY station_code) a ON a.station_code = s.station_code"
+            )
+            params.append(amenity[0])
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        if not aggregate:
+            columns = {"footfall": "s.passenger_footfall"}
+            column = columns.get(order[0]) if order else None
+            sql += f" ORDER BY {column} {order[1]}, s.station_code" if column else " ORDER BY s.station_code"
+        return sql, params
+
+
+class NLQueryEngine:
+    """
+    Answers questions about works, stations and amenities from the database.
+
+    Plans are cached per question (whitespace collapsed, case kept) and
+    vocabulary signature, so a repeated question skips parsing; the
+    vocabulary is re-read only when the database changes.
+    """
+
+    def __init__(self, db: Database, cache_size: int = PLAN_CACHE_SIZE):
+        """
+        Parameters:
+            db (Database): Database to query.
+            cache_size (int): Plans kept in the plan cache.
+        """
+        self.db = db
+        self._plans = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0}
+
+    def vocabulary(self) -> Vocabulary:
+        """Return the process-wide vocabulary of the database, re-read when it changes."""
+        return cache.get_or_load(
+            ("nl_vocabulary", self.db.db_path),
+            lambda: db_fingerprint(self.db),
+            lambda: Vocabulary(self.db.connection),
+        )
+
+    def plan(self, question: str, limit: int = DEFAULT_LIMIT) -> QueryPlan:
+        """Return the compiled plan of a question, from the plan cache when it was seen before."""
+        vocabulary = self.vocabulary()
+        key = (_normalize(question), limit, vocabulary.signature)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self._stats["hits"] += 1
+                return plan
+        plan = QueryParser(vocabulary).parse(question, limit)
+        with self._lock:
+            self._stats["misses"] += 1
+            self._plans[key] = plan
+            while len(self._plans) > self._cache_size:
+                self._plans.popitem(last=False)
+        return plan
+
+    def ask(self, question: str, limit: int = DEFAULT_LIMIT) -> tuple:
+        """
+        Answer a question.
+
+        Parameters:
+            question (str): The question.
+            limit (int): Rows returned when the question does not ask for a number.
+
+        Returns:
+            tuple: (QueryPlan, pd.DataFrame of results).
+        """
+        plan = self.plan(question, limit)
+        return plan, pd.read_sql_query(plan.sql, self.db.connection, params=plan.params)
+
+    def stats(self) -> dict:
+        """Return plan cache hits, misses and size."""
+        with self._lock:
+            return {**self._stats, "size": len(self._plans)}
+
+
+def load_query_engine(db: Database) -> NLQueryEngine:
+    """Return the process-wide query engine of a database, so every session shares its plan cache."""
+    return cache.get_or_load(("nl_query", db.db_path), lambda: db.db_path, lambda: NLQueryEngine(db))
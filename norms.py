@@ -1,177 +1,109 @@
 # norms.py
+import json
+import os
+import sys
+from functools import lru_cache
+from types import MappingProxyType
+
+# Norms data file and the format versions this module can read
+NORMS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'norms.json')
+SUPPORTED_VERSIONS = (1,)
+
+
+def _freeze(value):
+    """Recursively turn dicts into read-only mappings with interned keys and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({sys.intern(key): _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, str):
+        return sys.intern(value)
+    return value
+
+
+def _resolve(tables: dict) -> dict:
+    """
+    Expand categories that extend another one.
+
+    A category such as ``{"extends": "NSG1", "waiting_hall_sqm": 125}`` starts
+    from a copy of NSG1 and replaces the listed amenities.
+    """
+    resolved = {}
+
+    def expand(category, seen=()):
+        if category in resolved:
+            return resolved[category]
+        if category in seen:
+            raise ValueError(f"Circular 'extends' in norms: {' -> '.join(seen + (category,))}")
+        entry = dict(tables[category])
+        base = entry.pop('extends', None)
+        amenities = dict(expand(base, seen + (category,))) if base else {}
+        amenities.update(entry)
+        resolved[category] = amenities
+        return amenities
+
+    for category in tables:
+        expand(category)
+    return resolved
+
+
+def load_norms(path: str = NORMS_FILE) -> dict:
+    """
+    Load and compile a versioned norms data file.
+
+    Parameters:
+        path (str): Path to the JSON norms file.
+
+    Returns:
+        dict: "version", plus "minimum_essential" and "desirable" lookup tables
+              (category -> amenity -> norm) as read-only mappings that can be
+              shared between threads and sessions without copying.
+    """
+    with open(path, encoding='utf-8') as f:
+        document = json.load(f)
+    version = document.get('version')
+    if version not in SUPPORTED_VERSIONS:
+        raise ValueError(f"Unsupported norms file version {version!r} in {path}; expected one of {SUPPORTED_VERSIONS}.")
+    return {
+        'version': version,
+        'minimum_essential': _freeze(_resolve(document['minimum_essential'])),
+        'desirable': _freeze(_resolve(document['desirable'])),
+    }
+
+
+# Compiled once at import
+_NORMS = load_norms()
+NORMS_VERSION = _NORMS['version']
+MINIMUM_ESSENTIAL_AMENITIES = _NORMS['minimum_essential']
+DESIRABLE_AMENITIES = _NORMS['desirable']
+_NO_NORMS = MappingProxyType({})
+
+
+@lru_cache(maxsize=256)
+def normalize_category(station_category) -> str:
+    """Normalize a category code for lookup: 'NSG-1' and 'nsg1 ' both become 'NSG1'."""
+    return str(station_category).replace('-', '').strip().upper()
+
+
+def get_minimum_amenities(station_category):
+    """Return the read-only minimum essential amenities for a category (empty if unknown)."""
+    return MINIMUM_ESSENTIAL_AMENITIES.get(normalize_category(station_category), _NO_NORMS)
+
+
+def get_desirable_amenities(station_category):
+    """Return the read-only desirable amenities for a category (empty if unknown)."""
+    return DESIRABLE_AMENITIES.get(normalize_category(station_category), _NO_NORMS)
+
+
 class RailwayAmenities:
+    """Access to the compiled norms tables; instances are cheap and share the same data."""
+
     def __init__(self):
-        self.minimum_essential_amenities = {
-            'NSG1': {
-                'drinking_water_taps': {'quantity': 20, 'note': 'One tap for disabled persons on alternate water booths'},
-                'waiting_hall_sqm': 250,
-                'seating_per_platform': 150,
-                'platform_shelter_sqm': 500,
-                'urinals': {'quantity': 12, 'auto_flush': True, 'note': '1/3rd for ladies'},
-                'latrines': {'quantity': 12, 'auto_flush': True, 'note': '1/3rd for ladies'},
-                'platform_level': 'High Level',
-                'lighting': 'As per Board standards',
-                'fans': {'note': 'One row for 6-9m width platform, two rows for >9m'},
-                'foot_over_bridge': {'required': True, 'with_cover': True, 'width': '6m minimum'},
-                'time_table': 'As per extant instructions',
-                'clock': 'As per zonal railways',
-                'water_cooler': '2 on each PF',
-                'public_address_system': 'As per extant instructions',
-                'parking_area': 'With lights',
-                'train_indicator': 'As per extant instructions',
-                'signage': {'required': True, 'note': 'Standardized per Board guidelines'},
-                'dustbins': {'spacing': '50m', 'note': 'Uniformly designed'}
-            }
-        }
-        
-        # Copy NSG1 amenities to NSG2-6 with modifications
-        for category in ['NSG2', 'NSG3', 'NSG4', 'NSG5', 'NSG6']:
-            self.minimum_essential_amenities[category] = self.minimum_essential_amenities['NSG1'].copy()
-            
-            if category == 'NSG3':
-                self.minimum_essential_amenities[category].update({
-                    'waiting_hall_sqm': 125,
-                    'seating_per_platform': 125,
-                    'platform_shelter_sqm': 400,
-                    'urinals': {'quantity': 10, 'auto_flush': True, 'note': '1/3rd for ladies'},
-                    'latrines': {'quantity': 10, 'auto_flush': True, 'note': '1/3rd for ladies'}
-                })
-            elif category == 'NSG4':
-                self.minimum_essential_amenities[category].update({
-                    'waiting_hall_sqm': 75,
-                    'seating_per_platform': 100,
-                    'platform_shelter_sqm': 200,
-                    'urinals': {'quantity': 4, 'auto_flush': False, 'note': '1/3rd for ladies'},
-                    'latrines': {'quantity': 6, 'auto_flush': False, 'note': '1/3rd for ladies'},
-                    'foot_over_bridge': {'required': True, 'with_cover': False}
-                })
-            elif category == 'NSG5':
-                self.minimum_essential_amenities[category].update({
-                    'drinking_water_taps': {'quantity': 8, 'note': 'One tap for disabled persons'},
-                    'waiting_hall_sqm': 30,
-                    'seating_per_platform': 50,
-                    'platform_shelter_sqm': 50,
-                    'urinals': {'quantity': 4, 'auto_flush': False, 'note': '1/3rd for ladies'},
-                    'latrines': {'quantity': 4, 'auto_flush': False, 'note': '1/3rd for ladies'},
-                    'water_cooler': '1 on main PF'
-                })
-            elif category == 'NSG6':
-                self.minimum_essential_amenities[category].update({
-                    'drinking_water_taps': {'quantity': 2, 'note': 'Alternative arrangement where piped water not feasible'},
-                    'waiting_hall_sqm': 15,
-                    'seating_per_platform': 10,
-                    'platform_shelter_sqm': 50,
-                    'urinals': {'quantity': 1, 'auto_flush': False, 'note': '1/3rd for ladies'},
-                    'latrines': {'quantity': 1, 'auto_flush': False, 'note': '1/3rd for ladies'},
-                    'water_cooler': '1 on main PF',
-                    'dustbins': {'spacing': 'As required', 'note': 'Adequate numbers'},
-                    'train_indicator': False
-                })
-
-        # Add Halt stations (HG) amenities
-        self.minimum_essential_amenities.update({
-            'HG1': {
-                'drinking_water': 'Appropriate facility',
-                'waiting_hall': '10 sqm booking office cum waiting hall',
-                'platform_shelter': 'Bus type modular shelter',
-                'platform_level': 'High Level',
-                'lighting': 'As per Board standards',
-                'foot_over_bridge': {'required': True, 'note': 'For double line section'},
-                'time_table': 'As per instructions',
-                'clock': True,
-                'dustbins': 'As per instructions'
-            },
-            'HG2': {
-                'drinking_water': 'Appropriate facility',
-                'waiting_hall': '10 sqm booking office cum waiting hall',
-                'platform_shelter': 'Shady trees',
-                'platform_level': 'High Level',
-                'lighting': 'For night trains',
-                'foot_over_bridge': {'required': True, 'note': 'For double line section'},
-                'dustbins': 'As per instructions'
-            },
-            'HG3': {
-                'drinking_water': 'Appropriate facility',
-                'platform_shelter': 'Shady trees',
-                'platform_level': 'High Level',
-                'lighting': 'For night trains',
-                'foot_over_bridge': {'required': True, 'note': 'For double line section'},
-                'dustbins': 'As per instructions'
-            }
-        })
+        self.minimum_essential_amenities = MINIMUM_ESSENTIAL_AMENITIES
+        self.desirable_amenities = DESIRABLE_AMENITIES
 
     def get_minimum_amenities(self, station_category):
-        # Remove hyphen from category code if present
-        category = station_category.replace('-', '')
-        return self.minimum_essential_amenities.get(category, {})
+        return get_minimum_amenities(station_category)
 
     def get_desirable_amenities(self, station_category):
-        # Remove hyphen from category code if present
-        category = station_category.replace('-', '')
-        
-        desirable_amenities = {
-            'NSG1': {
-                'retiring_room': True,
-                'waiting_room_with_bath': True,
-                'cloak_room': True,
-                'enquiry_counter': True,
-                'ntes': True,
-                'ivrs': True,
-                'public_address_system': True,
-                'book_stalls': True,
-                'refreshment_room': True,
-                'parking_area': True,
-                'train_indicator': True,
-                'touch_screen': True,
-                'water_vending': True,
-                'escalators': True,
-                'travellator': True,
-                'signage': True,
-                'modular_catering': True,
-                'automatic_vending': True,
-                'pay_use_toilets': True,
-                'cyber_cafe': True,
-                'atm': True,
-                'executive_lounge': True,
-                'food_plaza': True,
-                'train_coach_indication': True,
-                'cctv': True,
-                'coin_operated_ticket': True,
-                'pre_paid_taxi': True,
-                'access_control': True,
-                'bio_toilets': True,
-                'bottle_crushers': True,
-                'wifi': True,
-                'second_entry': True,
-                'senior_citizen_waiting': True,
-                'wheelchair_facilities': True,
-                'water_fountain': True
-            }
-        }
-        
-        # Copy NSG1 amenities to NSG2-3 with modifications
-        for cat in ['NSG2', 'NSG3']:
-            desirable_amenities[cat] = desirable_amenities['NSG1'].copy()
-        
-        # NSG4-6 have fewer desirable amenities
-        desirable_amenities['NSG4'] = {
-            'pay_use_toilets': True,
-            'atm': True,
-            'bio_toilets': True,
-            'wifi': True,
-            'second_entry': True
-        }
-        
-        desirable_amenities['NSG5'] = {
-            'pay_use_toilets': True,
-            'atm': True,
-            'bio_toilets': True
-        }
-        
-        desirable_amenities['NSG6'] = {
-            'pay_use_toilets': True,
-            'atm': True,
-            'bio_toilets': True
-        }
-        
-        return desirable_amenities.get(category, {})
\ No newline at end of file
+        return get_desirable_amenities(station_category)
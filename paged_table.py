@@ -0,0 +1,312 @@
+# paged_table.py
+
+import logging
+import pandas as pd
+import streamlit as st
+from data_cache import cache, db_fingerprint, schema_fingerprint
+from database import Database
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s]: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Rows fetched and sent per page
+TABLE_PAGE_SIZE = 50
+
+
+def _like(text: str) -> str:
+    """LIKE pattern matching text anywhere, with its own % and _ taken literally."""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class QuerySource:
+    """
+    A database table (or join) paged with SQL.
+
+    Only the requested columns of one page are read. Filtering, the text
+    search and sorting run in SQLite, so a page costs the same however many
+    rows match. Pages after the first continue from the previous page's last
+    row (keyset) when the sort column can never be NULL, and use OFFSET
+    otherwise.
+    """
+
+    def __init__(self, db: Database, name: str, from_sql: str, tables: list, key: str,
+                 default_columns: list, sort: str = None, descending: bool = False):
+        """
+        Parameters:
+            db (Database): Database to read from.
+            name (str): Source name, part of cache keys.
+            from_sql (str): FROM clause, e.g. "stations s LEFT JOIN paavailability p ON ...".
+            tables (list): (table, alias) pairs whose columns are offered, in order; a column
+                           name already taken by an earlier table is skipped.
+            key (str): Unique, non-NULL column that breaks sort ties.
+            default_columns (list): Columns shown before the user picks any.
+            sort (str, optional): Default sort column; the key when omitted.
+            descending (bool): Default sort direction.
+        """
+        self.db = db
+        self.name = name
+        self.from_sql = from_sql
+        self.key = key
+        self.sort = sort or key
+        self.descending = descending
+        self.expressions, self.not_null, self.text_columns = {}, set(), set()
+        for table, alias in tables:
+            for _, column, column_type, not_null, _, primary_key in db.connection.execute(
+                    f"PRAGMA table_info({table});").fetchall():
+                if column in self.expressions:
+                    continue
+                self.expressions[column] = f'{alias}."{column}"'
+                # Columns of joined tables are NULL for rows without a match, whatever they declare
+                if (not_null or primary_key) and alias == tables[0][1]:
+                    self.not_null.add(column)
+                if not column_type or "CHAR" in column_type.upper() or "TEXT" in column_type.upper():
+                    self.text_columns.add(column)
+        self.column_names = list(self.expressions)
+        self.default_columns = [column for column in default_columns if column in self.expressions]
+
+    def version(self):
+        """Changes whenever the database does; cached counts and cursors are dropped with it."""
+        return db_fingerprint(self.db)
+
+    def _column(self, column: str) -> str:
+        # Column names come from widgets; only the table's own are ever put in SQL
+        if column not in self.expressions:
+            raise ValueError(f"Unknown column for {self.name}: {column!r}")
+        return self.expressions[column]
+
+    def _where(self, filters: dict, search: str, search_columns: list) -> tuple:
+        conditions, params = [], []
+        for column, value in (filters or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                values = list(value)
+                conditions.append(f"{self._column(column)} IN ({', '.join('?' for _ in values)})")
+                params.extend(values)
+            else:
+                conditions.append(f"{self._column(column)} = ?")
+                params.append(value)
+        searched = [column for column in search_columns or [] if column in self.text_columns]
+        if search and searched:
+            conditions.append("(" + " OR ".join(f"{self._column(column)} LIKE ? ESCAPE '\\'" for column in searched) + ")")
+            params.extend([_like(search)] * len(searched))
+        return (" WHERE " + " AND ".join(conditions) if conditions else ""), params
+
+    def count(self, filters: dict = None, search: str = "", search_columns: list = None) -> int:
+        """Return the number of rows matching the filters and search."""
+        where, params = self._where(filters, search, search_columns)
+        return self.db.connection.execute(f"SELECT COUNT(*) FROM {self.from_sql}{where};", params).fetchone()[0]
+
+    def select_sql(self, columns: list, filters: dict = None, search: str = "", sort: str = None,
+                   descending: bool = None, after=None) -> tuple:
+        """
+        Build the ordered SELECT of a view, without LIMIT.
+
+        Every row has the requested columns followed by "__sort" and "__key",
+        which page() uses for its cursor.
+
+        Returns:
+            tuple: (sql, params, whether pages can continue by keyset).
+        """
+        sort = sort or self.sort
+        descending = self.descending if descending is None else descending
+        direction = "DESC" if descending else "ASC"
+        sort_sql, key_sql = self._column(sort), self._column(self.key)
+        where, params = self._where(filters, search, columns)
+        keyset = sort in self.not_null
+        if after is not None and keyset:
+            comparison = f"({sort_sql}, {key_sql}) {'<' if descending else '>'} (?, ?)"
+            where = f"{where} AND {comparison}" if where else f" WHERE {comparison}"
+            params.extend(after)
+
+        select = ", ".join(f'{self._column(column)} AS "{column}"' for column in columns)
+        sql = (f'SELECT {select}{", " if select else ""}{sort_sql} AS "__sort", {key_sql} AS "__key" '
+               f"FROM {self.from_sql}{where} ORDER BY {sort_sql} {direction}, {key_sql} {direction}")
+        return sql, params, keyset
+
+    def page(self, columns: list, filters: dict = None, search: str = "", sort: str = None,
+             descending: bool = None, limit: int = TABLE_PAGE_SIZE, offset: int = 0, after=None) -> tuple:
+        """
+        Read one page.
+
+        Parameters:
+            columns (list): Columns to return.
+            filters (dict, optional): Column -> value (or list of values) the rows must equal.
+            search (str): Text that one of the shown text columns must contain.
+            sort (str, optional): Sort column; the source default when omitted.
+            descending (bool, optional): Sort direction; the source default when omitted.
+            limit (int): Rows per page; None reads every matching row.
+            offset (int): Rows to skip, used when after is None.
+            after (tuple, optional): Cursor returned for the previous page.
+
+        Returns:
+            tuple: (pd.DataFrame of the page, cursor for the next page or None).
+        """
+        sql, params, keyset = self.select_sql(columns, filters, search, sort, descending, after)
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([limit, 0 if after is not None and keyset else offset])
+        frame = pd.read_sql_query(sql + ";", self.db.connection, params=params)
+        cursor = None
+        if keyset and limit is not None and len(frame) == limit:
+            cursor = tuple(value.item() if hasattr(value, "item") else value
+                           for value in (frame["__sort"].iloc[-1], frame["__key"].iloc[-1]))
+        return frame.drop(columns=["__sort", "__key"]), cursor
+
+
+class FrameSource:
+    """
+    An in-memory DataFrame paged the same way as a QuerySource.
+
+    For views backed by CSV frames rather than the database: the frame is
+    filtered, sorted and sliced before anything is sent, so the page payload
+    stays the same size as the frame grows.
+    """
+
+    def __init__(self, frame: pd.DataFrame, name: str, default_columns: list = None,
+                 sort: str = None, descending: bool = False):
+        """
+        Parameters:
+            frame (pd.DataFrame): Rows to page; not modified.
+            name (str): Source name.
+            default_columns (list, optional): Columns shown before the user picks any; all when omitted.
+            sort (str, optional): Default sort column; frame order when omitted.
+            descending (bool): Default sort direction.
+        """
+        self.frame = frame
+        self.name = name
+        self.column_names = [str(column) for column in frame.columns]
+        self.default_columns = [column for column in default_columns or self.column_names
+                                if column in self.column_names]
+        self.sort = sort
+        self.descending = descending
+        self.text_columns = {str(column) for column in frame.columns if frame[column].dtype == object}
+
+    def version(self):
+        return (id(self.frame), len(self.frame))
+
+    def _matching(self, filters: dict, search: str, search_columns: list) -> pd.DataFrame:
+        frame = self.frame
+        for column, value in (filters or {}).items():
+            if isinstance(value, (list, tuple, set)):
+                frame = frame[frame[column].isin(list(value))]
+            else:
+                frame = frame[frame[column] == value]
+        searched = [column for column in search_columns or [] if column in self.text_columns]
+        if search and searched:
+            mask = pd.Series(False, index=frame.index)
+            for column in searched:
+                mask |= frame[column].astype(str).str.contains(search, case=False, regex=False, na=False)
+            frame = frame[mask]
+        return frame
+
+    def count(self, filters: dict = None, search: str = "", search_columns: list = None) -> int:
+        return len(self._matching(filters, search, search_columns))
+
+    def page(self, columns: list, filters: dict = None, search: str = "", sort: str = None,
+             descending: bool = None, limit: int = TABLE_PAGE_SIZE, offset: int = 0, after=None) -> tuple:
+        """Read one page; same parameters as QuerySource.page, with after ignored."""
+        frame = self._matching(filters, search, columns)
+        sort = sort or self.sort
+        if sort:
+            descending = self.descending if descending is None else descending
+            frame = frame.sort_values(sort, ascending=not descending, kind="stable", na_position="last")
+        if limit is not None:
+            frame = frame.iloc[offset:offset + limit]
+        return frame[columns], None
+
+
+def station_list_source(db: Database) -> QuerySource:
+    """
+    Stations with their paavailability columns, showing the station columns by default.
+
+    Rebuilt when the schema changes, so columns added by a migration, and
+    whether they can be NULL, are picked up.
+    """
+    return cache.get_or_load(
+        ("table_source", "stations", db.db_path), lambda: schema_fingerprint(db),
+        lambda: QuerySource(
+            db, "stations",
+            "stations s LEFT JOIN paavailability p ON p.station_code = s.station_code",
+            [("stations", "s"), ("paavailability", "p")], key="station_code",
+            default_columns=["station_code", "station_name", "categorisation", "zone", "division", "section",
+                             "passenger_footfall", "platform_type", "number_of_platforms"],
+        ),
+    )
+
+
+def remarks_source(db: Database) -> QuerySource:
+    """Works remarks, newest first."""
+    return cache.get_or_load(
+        ("table_source", "remarks", db.db_path), lambda: schema_fingerprint(db),
+        lambda: QuerySource(
+            db, "remarks", "remarks r", [("remarks", "r")], key="id",
+            default_columns=["date", "project_id", "works_pending_with", "department", "remark"],
+            sort="date", descending=True,
+        ),
+    )
+
+
+def render_paged_table(source, key: str, filters: dict = None, page_size: int = TABLE_PAGE_SIZE,
+                       empty_message: str = "No rows found."):
+    """
+    Render a source as a table, one page at a time.
+
+    The user picks the columns, a text filter, the sort column and the page;
+    only that page of those columns is read and sent.
+
+    Parameters:
+        source (QuerySource or FrameSource): Rows to show.
+        key (str): Widget key prefix; distinct for every table on a page.
+        filters (dict, optional): Column -> value the rows must equal, e.g. from sidebar selections.
+        page_size (int): Rows per page.
+        empty_message (str): Warning shown when no rows match.
+
+    Returns:
+        dict: The view shown (columns, filters, search, sort, descending), or None when no rows are.
+    """
+    columns = st.multiselect("Columns", source.column_names, default=source.default_columns, key=f"{key}.columns")
+    if not columns:
+        st.info("Select at least one column.")
+        return None
+    col1, col2, col3 = st.columns([3, 2, 1])
+    with col1:
+        search = st.text_input("Filter rows", key=f"{key}.search", placeholder="Text in any shown column")
+    with col2:
+        sort_options = [source.sort] if source.sort and source.sort not in columns else []
+        sort_options += columns
+        sort = st.selectbox("Sort by", sort_options, key=f"{key}.sort")
+    with col3:
+        descending = st.checkbox("Descending", value=bool(source.descending), key=f"{key}.descending")
+
+    # Counts and keyset cursors hold only while the query and the data stay the same
+    signature = (source.name, repr(sorted((filters or {}).items())), search, tuple(columns), sort, descending,
+                 page_size, source.version())
+    state = st.session_state.get(f"{key}.state")
+    if state is None or state["signature"] != signature:
+        state = {"signature": signature, "total": source.count(filters, search, columns), "cursors": {}}
+        st.session_state[f"{key}.state"] = state
+    total = state["total"]
+    if total == 0:
+        st.warning(empty_message)
+        return None
+
+    pages = -(-total // page_size)
+    page = 1
+    if pages > 1:
+        page_key = f"{key}.page"
+        if st.session_state.get(page_key, 1) > pages:
+            st.session_state[page_key] = pages
+        page = int(st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, step=1, key=page_key))
+
+    offset = (page - 1) * page_size
+    rows, cursor = source.page(columns, filters, search, sort, descending, page_size, offset,
+                               after=state["cursors"].get(page))
+    if cursor is not None:
+        state["cursors"][page + 1] = cursor
+    st.dataframe(rows, hide_index=True)
+    st.caption(f"Rows {offset + 1}–{offset + len(rows)} of {total}")
+    return {"columns": columns, "filters": filters or {}, "search": search, "sort": sort, "descending": descending}
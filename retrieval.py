@@ -0,0 +1,504 @@
+# retrieval.py
+
+import hashlib
+import json
+import logging
+import math
+import os
+import threading
+import time
+from collections import Counter
+import numpy as np
+import pandas as pd
+from data_cache import cache, db_fingerprint
+from database import Database
+from search_index import tokenize
+from works import WorksManager
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s]: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+# Where indexes are kept (one subdirectory per database) and the on-disk layout version
+INDEX_DIR = os.environ.get("RETRIEVAL_INDEX_DIR", ".retrieval_index")
+FORMAT_VERSION = 1
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+# Journal entries after which the next write folds them into a new segment
+COMPACT_AFTER = 2000
+
+KINDS = ("station", "amenities", "work")
+
+_SEGMENT = "segment.npz"
+_JOURNAL = "journal.jsonl"
+
+
+def document_hash(kind: str, title: str, text: str) -> str:
+    """Return the digest a document is compared by; equal digests are not re-indexed."""
+    return hashlib.blake2b(f"{kind}\0{title}\0{text}".encode(), digest_size=8).hexdigest()
+
+
+class BM25Index:
+    """
+    An offline BM25 index over station, amenity and works documents.
+
+    Documents live in numbered slots. Postings of the documents present at
+    the last compaction form a read-only base segment in CSR form (one slice
+    of slot and term-frequency arrays per term); documents added since then
+    go to an in-memory delta. Replacing or removing a document only marks its
+    slot dead, so writes cost one tokenization. A query scores every matching
+    slot with a few numpy operations per query term.
+
+    When opened from a directory, every change is appended to a journal and
+    compaction writes a new segment file and empties the journal, so the
+    index survives restarts without being rebuilt.
+    """
+
+    def __init__(self):
+        self.directory = None
+        self._lock = threading.RLock()
+        self._journal = None
+        self._journal_entries = 0
+        self._reset()
+
+    def _reset(self):
+        self._ids, self._titles, self._hashes = [], [], []
+        self._slots = {}
+        self._count = 0
+        self._kinds = np.zeros(1024, dtype=np.int8)
+        self._lengths = np.zeros(1024, dtype=np.float32)
+        self._alive = np.zeros(1024, dtype=bool)
+        self._total_length = 0.0
+        self._vocab = {}
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._post_slots = np.zeros(0, dtype=np.int32)
+        self._post_tf = np.zeros(0, dtype=np.float32)
+        self._delta = {}
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, doc_id) -> bool:
+        return doc_id in self._slots
+
+    def _append(self, doc_id, kind: str, title: str, digest: str, length: int) -> int:
+        slot = self._count
+        if slot == len(self._alive):
+            for name in ("_kinds", "_lengths", "_alive"):
+                array = getattr(self, name)
+                grown = np.zeros(len(array) * 2, dtype=array.dtype)
+                grown[:len(array)] = array
+                setattr(self, name, grown)
+        self._ids.append(doc_id)
+        self._titles.append(title)
+        self._hashes.append(digest)
+        self._kinds[slot] = KINDS.index(kind)
+        self._lengths[slot] = length
+        self._alive[slot] = True
+        self._slots[doc_id] = slot
+        self._total_length += length
+        self._count += 1
+        return slot
+
+    def _kill(self, doc_id):
+        slot = self._slots.pop(doc_id)
+        self._alive[slot] = False
+        self._ids[slot] = None
+        self._total_length -= float(self._lengths[slot])
+
+    def put(self, doc_id: str, kind: str, title: str, text: str, digest: str = None) -> bool:
+        """
+        Add or replace a document.
+
+        Parameters:
+            doc_id (str): Document ID, e.g. "work:<project_id>".
+            kind (str): One of KINDS.
+            title (str): Shown with search results.
+            text (str): Indexed text.
+            digest (str, optional): document_hash() of the document, when already known.
+
+        Returns:
+            bool: True if the index changed (False when the document is unchanged).
+        """
+        digest = digest or document_hash(kind, title, text)
+        with self._lock:
+            slot = self._slots.get(doc_id)
+            if slot is not None and self._hashes[slot] == digest:
+                return False
+            if slot is not None:
+                self._kill(doc_id)
+            counts = Counter(tokenize(text))
+            slot = self._append(doc_id, kind, title, digest, sum(counts.values()))
+            for term, frequency in counts.items():
+                self._delta.setdefault(term, {})[slot] = frequency
+            self._log({"op": "put", "id": doc_id, "kind": kind, "title": title, "text": text})
+            return True
+
+    def remove(self, doc_id: str) -> bool:
+        """Remove a document; returns False when it is not in the index."""
+        with self._lock:
+            if doc_id not in self._slots:
+                return False
+            self._kill(doc_id)
+            self._log({"op": "remove", "id": doc_id})
+            return True
+
+    def sync(self, documents, kinds=KINDS) -> dict:
+        """
+        Make the documents of the given kinds match a complete, current set.
+
+        Unchanged documents (same digest) are skipped without tokenizing, so
+        syncing an up-to-date index only costs hashing. Changes are not
+        journaled one by one; an index opened from a directory is saved once
+        at the end instead (an interrupted sync is simply repeated).
+
+        Parameters:
+            documents (iterable): (doc_id, kind, title, text) tuples.
+            kinds (tuple): Kinds the set is complete for; other documents of these kinds are removed.
+
+        Returns:
+            dict: Counts of "added" (new or changed) and "removed" documents.
+        """
+        seen, added = set(), 0
+        with self._lock:
+            journal, self._journal = self._journal, None
+            try:
+                for doc_id, kind, title, text in documents:
+                    seen.add(doc_id)
+                    added += self.put(doc_id, kind, title, text)
+                codes = {KINDS.index(kind) for kind in kinds}
+                stale = [doc_id for doc_id, slot in self._slots.items()
+                         if doc_id not in seen and self._kinds[slot] in codes]
+                for doc_id in stale:
+                    self.remove(doc_id)
+            finally:
+                self._journal = journal
+            if (added or stale) and self.directory is not None:
+                self.save()
+        return {"added": added, "removed": len(stale)}
+
+    def _postings(self, term: str) -> tuple:
+        """Return the (slots, term frequencies) of a term across the base segment and the delta."""
+        row = self._vocab.get(term)
+        slots = [self._post_slots[self._indptr[row]:self._indptr[row + 1]]] if row is not None else []
+        frequencies = [self._post_tf[self._indptr[row]:self._indptr[row + 1]]] if row is not None else []
+        delta = self._delta.get(term)
+        if delta:
+            slots.append(np.fromiter(delta.keys(), dtype=np.int32, count=len(delta)))
+            frequencies.append(np.fromiter(delta.values(), dtype=np.float32, count=len(delta)))
+        if not slots:
+            return np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32)
+        return np.concatenate(slots), np.concatenate(frequencies)
+
+    def search(self, query: str, k: int = 10, kinds=None) -> list:
+        """
+        Return the top-k documents for a query by BM25 score.
+
+        Parameters:
+            query (str): Free-text query.
+            k (int): Number of results.
+            kinds (iterable, optional): Only return documents of these kinds.
+
+        Returns:
+            list: Dicts with "id", "kind", "title" and "score", best first.
+        """
+        terms = set(tokenize(query))
+        with self._lock:
+            documents = len(self._slots)
+            if not terms or not documents:
+                return []
+            count = self._count
+            alive = self._alive[:count]
+            average = max(self._total_length / documents, 1.0)
+            norm = K1 * (1 - B + B * self._lengths[:count] / average)
+            scores = np.zeros(count, dtype=np.float32)
+            for term in terms:
+                slots, frequencies = self._postings(term)
+                live = alive[slots]
+                slots, frequencies = slots[live], frequencies[live]
+                if not len(slots):
+                    continue
+                idf = math.log(1 + (documents - len(slots) + 0.5) / (len(slots) + 0.5))
+                scores[slots] += idf * frequencies * (K1 + 1) / (frequencies + norm[slots])
+            if kinds is not None:
+                codes = [KINDS.index(kind) for kind in kinds]
+                scores[~np.isin(self._kinds[:count], codes)] = 0
+            hits = np.flatnonzero(scores > 0)
+            if len(hits) > k:
+                hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+            hits = hits[np.argsort(-scores[hits], kind="stable")]
+            return [
+                {"id": self._ids[slot], "kind": KINDS[self._kinds[slot]], "title": self._titles[slot],
+                 "score": float(scores[slot])}
+                for slot in hits.tolist()
+            ]
+
+    def compact(self):
+        """Fold the delta into the base segment and drop dead slots."""
+        with self._lock:
+            count = self._count
+            alive = self._alive[:count]
+            remap = np.full(count, -1, dtype=np.int64)
+            remap[alive] = np.arange(int(alive.sum()))
+
+            rows = np.repeat(np.arange(len(self._vocab), dtype=np.int64), np.diff(self._indptr))
+            slots, frequencies = self._post_slots.astype(np.int64), self._post_tf
+            vocab = dict(self._vocab)
+            delta_rows, delta_slots, delta_frequencies = [], [], []
+            for term, postings in self._delta.items():
+                row = vocab.setdefault(term, len(vocab))
+                delta_rows.extend([row] * len(postings))
+                delta_slots.extend(postings.keys())
+                delta_frequencies.extend(postings.values())
+            rows = np.concatenate([rows, np.asarray(delta_rows, dtype=np.int64)])
+            slots = np.concatenate([slots, np.asarray(delta_slots, dtype=np.int64)])
+            frequencies = np.concatenate([frequencies, np.asarray(delta_frequencies, dtype=np.float32)])
+
+            keep = alive[slots] if len(slots) else np.zeros(0, dtype=bool)
+            rows, slots, frequencies = rows[keep], remap[slots[keep]], frequencies[keep]
+            # Terms left without postings leave the vocabulary
+            terms = np.array(list(vocab), dtype=object)
+            used = np.bincount(rows, minlength=len(terms)) > 0
+            renumber = np.cumsum(used) - 1
+            rows = renumber[rows]
+            order = np.lexsort((slots, rows))
+
+            self._vocab = {term: row for row, term in enumerate(terms[used].tolist())}
+            self._indptr = np.concatenate([[0], np.cumsum(np.bincount(rows, minlength=len(self._vocab)))])
+            self._post_slots = slots[order].astype(np.int32)
+            self._post_tf = frequencies[order]
+            self._delta = {}
+
+            live = np.flatnonzero(alive).tolist()
+            self._ids = [self._ids[slot] for slot in live]
+            self._titles = [self._titles[slot] for slot in live]
+            self._hashes = [self._hashes[slot] for slot in live]
+            kinds, lengths = self._kinds[live], self._lengths[live]
+            capacity = max(1024, 2 * len(live))
+            self._kinds = np.zeros(capacity, dtype=np.int8)
+            self._lengths = np.zeros(capacity, dtype=np.float32)
+            self._alive = np.zeros(capacity, dtype=bool)
+            self._kinds[:len(live)], self._lengths[:len(live)], self._alive[:len(live)] = kinds, lengths, True
+            self._count = len(live)
+            self._slots = {doc_id: slot for slot, doc_id in enumerate(self._ids)}
+            self._total_length = float(lengths.sum())
+
+    def _log(self, entry: dict):
+        """Append a change to the journal, compacting into a new segment once it is long."""
+        if self._journal is None:
+            return
+        self._journal.write(json.dumps(entry) + "\n")
+        self._journal.flush()
+        self._journal_entries += 1
+        if self._journal_entries >= COMPACT_AFTER:
+            self.save()
+
+    def save(self):
+        """Compact and write the segment of an index opened from a directory, emptying its journal."""
+        with self._lock:
+            if self.directory is None:
+                raise ValueError("index was not opened from a directory")
+            start = time.perf_counter()
+            self.compact()
+            meta = {"format": FORMAT_VERSION, "ids": self._ids, "titles": self._titles,
+                    "hashes": self._hashes, "terms": list(self._vocab)}
+            temporary = os.path.join(self.directory, f"{_SEGMENT}.tmp-{os.getpid()}")
+            with open(temporary, "wb") as f:
+                np.savez(
+                    f, meta=np.frombuffer(json.dumps(meta).encode(), dtype=np.uint8),
+                    kinds=self._kinds[:self._count], lengths=self._lengths[:self._count],
+                    indptr=self._indptr, slots=self._post_slots, frequencies=self._post_tf,
+                )
+            os.replace(temporary, os.path.join(self.directory, _SEGMENT))
+            # Replaying a journal over the segment it was folded into changes nothing, so a crash here is safe
+            if self._journal is not None:
+                self._journal.close()
+            self._journal = open(os.path.join(self.directory, _JOURNAL), "w", encoding="utf-8")
+            self._journal_entries = 0
+            logging.info(f"Saved retrieval index {self.directory}: {len(self)} documents, "
+                         f"{len(self._vocab)} terms in {time.perf_counter() - start:.3f}s.")
+
+    def _load_segment(self, path: str):
+        with np.load(path) as arrays:
+            meta = json.loads(arrays["meta"].tobytes().decode())
+            if meta["format"] != FORMAT_VERSION:
+                raise ValueError(f"segment format {meta['format']} is not {FORMAT_VERSION}")
+            self._ids, self._titles, self._hashes = meta["ids"], meta["titles"], meta["hashes"]
+            self._vocab = {term: row for row, term in enumerate(meta["terms"])}
+            self._indptr, self._post_slots, self._post_tf = arrays["indptr"], arrays["slots"], arrays["frequencies"]
+            self._count = len(self._ids)
+            capacity = max(1024, 2 * self._count)
+            self._kinds = np.zeros(capacity, dtype=np.int8)
+            self._lengths = np.zeros(capacity, dtype=np.float32)
+            self._alive = np.zeros(capacity, dtype=bool)
+            self._kinds[:self._count], self._lengths[:self._count] = arrays["kinds"], arrays["lengths"]
+            self._alive[:self._count] = True
+        self._slots = {doc_id: slot for slot, doc_id in enumerate(self._ids)}
+        self._total_length = float(self._lengths[:self._count].sum())
+
+    @classmethod
+    def open(cls, directory: str) -> "BM25Index":
+        """
+        Open the index stored in a directory, creating an empty one if there is none.
+
+        The last segment is loaded and the journal replayed over it. An
+        unreadable segment is discarded and the index starts empty (callers
+        sync it from the database).
+
+        Parameters:
+            directory (str): Index directory.
+
+        Returns:
+            BM25Index: The index, journaling further changes to the directory.
+        """
+        index = cls()
+        os.makedirs(directory, exist_ok=True)
+        segment, journal = os.path.join(directory, _SEGMENT), os.path.join(directory, _JOURNAL)
+        if os.path.isfile(segment):
+            try:
+                index._load_segment(segment)
+            except (OSError, ValueError, KeyError) as e:
+                logging.warning(f"Retrieval index segment {segment} is unreadable, starting empty: {e}")
+                index._reset()
+        if os.path.isfile(journal):
+            with open(journal, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break  # a write cut short by a crash; later lines cannot exist
+                    if entry["op"] == "put":
+                        index.put(entry["id"], entry["kind"], entry["title"], entry["text"])
+                    else:
+                        index.remove(entry["id"])
+                    index._journal_entries += 1
+        index.directory = directory
+        index._journal = open(journal, "a", encoding="utf-8")
+        return index
+
+    def close(self):
+        """Close the journal; the index can still be searched."""
+        with self._lock:
+            if self._journal is not None:
+                self._journal.close()
+                self._journal = None
+
+    def on_work_change(self, event: str, work: dict):
+        """WorksManager listener: index a work on add or edit (remarks live in their own table)."""
+        if work and event in ("add", "edit"):
+            self.put(*work_document(work))
+
+
+def _text(frame: pd.DataFrame, columns: list) -> pd.Series:
+    """Join the given columns of each row into one string, skipping blanks."""
+    parts = [frame[column].astype(object).where(frame[column].notna(), "").astype(str) for column in columns]
+    text = parts[0]
+    for part in parts[1:]:
+        text = text + " " + part
+    return text.str.strip()
+
+
+# Text columns of each kind of document
+STATION_TEXT = ["station_code", "station_name", "categorisation", "zone", "division", "section", "platform_type"]
+WORK_TEXT = [
+    "project_id", "short_name_of_work", "station", "block_section", "section", "works_pending_with",
+    "year_of_sanction", "allocation", "remarks", "latest_remarks_civil", "latest_remarks_electrical",
+    "latest_remarks_s_t",
+]
+
+
+def work_document(work: dict) -> tuple:
+    """Return the (doc_id, kind, title, text) of one works table row."""
+    text = " ".join(str(work[column]) for column in WORK_TEXT if work.get(column) not in (None, ""))
+    return f"work:{work['project_id']}", "work", f"{work.get('short_name_of_work') or ''} ({work['project_id']})", text
+
+
+def database_documents(conn) -> list:
+    """
+    Build the documents of every station, paavailability and works row.
+
+    Amenity documents spell out each recorded amenity as "<name>: <value>",
+    so a query can name the amenity and the station together.
+
+    Parameters:
+        conn (sqlite3.Connection): Connection to read from.
+
+    Returns:
+        list: (doc_id, kind, title, text) tuples.
+    """
+    documents = []
+    stations = pd.read_sql_query(f"SELECT {', '.join(STATION_TEXT)} FROM stations;", conn)
+    documents += zip(
+        ("station:" + stations["station_code"]).tolist(), ["station"] * len(stations),
+        (stations["station_name"].fillna("") + " (" + stations["station_code"] + ")").tolist(),
+        _text(stations, STATION_TEXT).tolist(),
+    )
+
+    amenities = pd.read_sql_query("SELECT * FROM paavailability;", conn).drop(columns="id")
+    columns = [column for column in amenities.columns if column != "station_code"]
+    labelled = amenities[["station_code"]].copy()
+    for column in columns:
+        values = amenities[column].astype(object).where(amenities[column].notna(), "").astype(str)
+        labelled[column] = (column.replace("_", " ") + ": " + values).where(values != "", "")
+    documents += zip(
+        ("amenities:" + amenities["station_code"]).tolist(), ["amenities"] * len(amenities),
+        ("Amenities at " + amenities["station_code"]).tolist(),
+        _text(labelled, ["station_code", *columns]).tolist(),
+    )
+
+    works = pd.read_sql_query(f"SELECT {', '.join(WORK_TEXT)} FROM works;", conn)
+    documents += zip(
+        ("work:" + works["project_id"]).tolist(), ["work"] * len(works),
+        (works["short_name_of_work"].fillna("") + " (" + works["project_id"] + ")").tolist(),
+        _text(works, WORK_TEXT).tolist(),
+    )
+    return documents
+
+
+def index_directory(db: Database) -> str:
+    """Return the index directory of a database (named after its file)."""
+    return os.path.join(INDEX_DIR, os.path.splitext(os.path.basename(db.db_path))[0])
+
+
+def load_retrieval_index(db: Database, manager: WorksManager, directory: str = None) -> BM25Index:
+    """
+    Return the process-wide retrieval index of a database.
+
+    The index is opened from disk and synced with the database (only new or
+    changed rows are tokenized), then kept current by a WorksManager
+    listener. It is reopened and synced again only when another connection
+    changes the database, and the index it replaces is closed. Nothing here
+    needs a network connection.
+
+    Parameters:
+        db (Database): The shared Database instance.
+        manager (WorksManager): The shared WorksManager, whose writes update the index.
+        directory (str, optional): Index directory; defaults to index_directory(db).
+
+    Returns:
+        BM25Index: The synced index.
+    """
+    directory = directory or index_directory(db)
+
+    def build():
+        start = time.perf_counter()
+        index = BM25Index.open(directory)
+        changes = index.sync(database_documents(db.connection))
+        manager.add_listener("retrieval_index", index.on_work_change)
+        logging.info(f"Retrieval index ready in {time.perf_counter() - start:.3f}s: {len(index)} documents, "
+                     f"{changes['added']} added and {changes['removed']} removed by sync.")
+        return index
+
+    # A replaced index is closed so its journal handle is not left open
+    return cache.get_or_load(
+        ("retrieval_index", db.db_path, directory),
+        lambda: db_fingerprint(db, own_writes=False),
+        build,
+        on_evict=BM25Index.close,
+    )
@@ -0,0 +1,370 @@
+# search_index.py
+
+import bisect
+import heapq
+import re
+import threading
+from collections import OrderedDict
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# Match tiers, lower ranks first
+EXACT, PREFIX, SUBSTRING, FUZZY = 0, 1, 2, 3
+
+# Vocabulary tokens checked for typos per query token, and texts starting with the
+# query ranked ahead of the posting walk
+FUZZY_CANDIDATES = 64
+STARTS_SCAN = 256
+
+
+def tokenize(text) -> list:
+    """Lowercase a string and split it into alphanumeric tokens."""
+    return _TOKEN.findall(str(text).lower())
+
+
+def _trigrams(token: str) -> set:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+def _within_distance(a: str, b: str, limit: int) -> int:
+    """
+    Return the edit distance between two tokens (with adjacent transpositions),
+    or limit + 1 as soon as it is known to exceed the limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SearchIndex:
+    """
+    An incremental, ranked search index for autocomplete boxes.
+
+    Documents are split into tokens. Tokens map to the documents that contain
+    them, a sorted token list serves prefix matches, and a trigram index over
+    the token vocabulary serves substring and typo-tolerant matches. Every
+    query token must match some token of a document; documents are ranked by
+    match quality (exact, prefix, substring, fuzzy), then by whether the whole
+    text starts with the query, then by length and insertion order.
+
+    Postings are kept sorted by that last key (length, then insertion order),
+    so a search walks the documents of its rarest query token best-first and
+    stops once no later document can enter the top results, instead of
+    scoring and sorting every match.
+
+    Results are memoized per query. An add or remove drops only the cached
+    queries the document could change.
+    """
+
+    def __init__(self, cache_size: int = 256):
+        self._docs = {}
+        self._ids = {}
+        self._next_order = 0
+        self._postings = {}
+        self._members = {}
+        self._texts = []
+        self._sorted_tokens = []
+        self._token_grams = {}
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc_id, text: str):
+        """
+        Add a document, replacing any earlier text for the same id.
+
+        Parameters:
+            doc_id (hashable): Identifier returned by search().
+            text (str): Text to match against.
+        """
+        with self._lock:
+            self._add(doc_id, text, sort=True)
+
+    def add_many(self, documents):
+        """Add (doc_id, text) pairs, sorting each touched posting list once at the end."""
+        with self._lock:
+            touched = set()
+            for doc_id, text in documents:
+                if doc_id in self._docs and touched:
+                    # Replacing a document looks its keys up by bisection
+                    self._sort(touched)
+                    touched = set()
+                touched.update(self._add(doc_id, text, sort=False))
+            self._sort(touched)
+
+    def _sort(self, tokens):
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.sort()
+        self._texts.sort()
+        self._sorted_tokens.sort()
+
+    def remove(self, doc_id):
+        """Remove a document if present."""
+        with self._lock:
+            if doc_id in self._docs:
+                self._remove(doc_id)
+
+    def _add(self, doc_id, text, sort: bool) -> tuple:
+        if doc_id in self._docs:
+            self._remove(doc_id)
+        text = str(text)
+        lowered = text.lower()
+        tokens = tuple(dict.fromkeys(tokenize(text)))
+        # Rank key within a match tier: shorter texts first, then older ones
+        key = (len(text) << 32) | self._next_order
+        self._next_order += 1
+        self._docs[doc_id] = (lowered, tokens, key)
+        self._ids[key] = doc_id
+        new_tokens = []
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                self._postings[token] = [key]
+                self._members[token] = {key}
+                if sort:
+                    bisect.insort(self._sorted_tokens, token)
+                else:
+                    self._sorted_tokens.append(token)
+                for gram in _trigrams(token):
+                    self._token_grams.setdefault(gram, set()).add(token)
+                new_tokens.append(token)
+            else:
+                self._members[token].add(key)
+                if sort:
+                    bisect.insort(postings, key)
+                else:
+                    postings.append(key)
+        if sort:
+            bisect.insort(self._texts, (lowered, key))
+        else:
+            self._texts.append((lowered, key))
+        self._invalidate(doc_id, tokens, new_tokens)
+        return tokens
+
+    def _remove(self, doc_id):
+        tokens = self._docs[doc_id][1]
+        self._invalidate(doc_id, tokens, [token for token in tokens if len(self._postings[token]) == 1])
+        lowered, tokens, key = self._docs.pop(doc_id)
+        del self._ids[key]
+        del self._texts[bisect.bisect_left(self._texts, (lowered, key))]
+        for token in tokens:
+            postings = self._postings[token]
+            del postings[bisect.bisect_left(postings, key)]
+            self._members[token].discard(key)
+            if not postings:
+                del self._postings[token]
+                del self._members[token]
+                del self._sorted_tokens[bisect.bisect_left(self._sorted_tokens, token)]
+                for gram in _trigrams(token):
+                    grams = self._token_grams[gram]
+                    grams.discard(token)
+                    if not grams:
+                        del self._token_grams[gram]
+
+    def _invalidate(self, doc_id, tokens: tuple, vocabulary_changes):
+        """
+        Drop cached queries a document change could alter: those listing the
+        document, those whose every token could match it, and typo-tolerant ones
+        whose candidate vocabulary gains or loses a token.
+        """
+        if not self._cache:
+            return
+        changed_grams = set().union(*(_trigrams(token) for token in vocabulary_changes))
+        token_grams = [_trigrams(token) for token in tokens]
+
+        def could_match(query_token):
+            if len(query_token) < 4:
+                return any(query_token in token for token in tokens)
+            grams = _trigrams(query_token)
+            return any(query_token in token or grams & doc_grams for token, doc_grams in zip(tokens, token_grams))
+
+        for key, result in list(self._cache.items()):
+            query_tokens = key[0]
+            if (doc_id in result
+                    or (changed_grams and any(len(token) >= 4 and _trigrams(token) & changed_grams for token in query_tokens))
+                    or all(could_match(token) for token in query_tokens)):
+                del self._cache[key]
+
+    def _matching_tokens(self, query_token: str) -> dict:
+        """Map vocabulary tokens matching one query token to their best tier."""
+        matches = {}
+        position = bisect.bisect_left(self._sorted_tokens, query_token)
+        while position < len(self._sorted_tokens) and self._sorted_tokens[position].startswith(query_token):
+            token = self._sorted_tokens[position]
+            matches[token] = EXACT if token == query_token else PREFIX
+            position += 1
+
+        grams = _trigrams(query_token)
+        if not grams:
+            return matches
+        posting_sets = sorted((self._token_grams.get(gram, set()) for gram in grams), key=len)
+        candidates = set(posting_sets[0]).intersection(*posting_sets[1:])
+        for token in candidates:
+            if token not in matches and query_token in token:
+                matches[token] = SUBSTRING
+
+        if len(query_token) >= 4:
+            limit = 1 if len(query_token) < 8 else 2
+            # Only the vocabulary tokens sharing the most trigrams with the query are checked
+            shared = {}
+            for gram in grams:
+                for token in self._token_grams.get(gram, ()):
+                    shared[token] = shared.get(token, 0) + 1
+            near = heapq.nsmallest(FUZZY_CANDIDATES, shared.items(), key=lambda item: (-item[1], item[0]))
+            for token, _ in near:
+                if token in matches:
+                    continue
+                # A typo is tolerated against the whole token or, while typing, against its prefix.
+                if (_within_distance(query_token, token, limit) <= limit
+                        or _within_distance(query_token, token[:len(query_token)], limit) <= limit):
+                    matches[token] = FUZZY
+        return matches
+
+    def search(self, query: str, limit=20) -> list:
+        """
+        Return the ids of documents matching a query, best matches first.
+
+        Parameters:
+            query (str): Free text typed by the user.
+            limit (int or None): Maximum number of ids; None returns every match.
+
+        Returns:
+            list: Matching document ids in rank order.
+        """
+        query_tokens = tuple(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return []
+        key = (query_tokens, limit)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                return list(cached)
+
+            token_matches = [self._matching_tokens(token) for token in query_tokens]
+            if any(not matches for matches in token_matches) or limit == 0:
+                result = []
+            else:
+                result = self._rank(" ".join(query.lower().split()), token_matches, limit)
+
+            if self._cache_size:
+                self._cache[key] = tuple(result)
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+            return result
+
+    def _walk(self, tokens):
+        """Yield the keys of documents containing any of the tokens, in rank-key order."""
+        postings = [self._postings[token] for token in tokens]
+        if len(postings) == 1:
+            yield from postings[0]
+            return
+        previous = None
+        for key in heapq.merge(*postings):
+            if key != previous:
+                yield key
+                previous = key
+
+    def _rank(self, phrase: str, token_matches: list, limit) -> list:
+        # Documents are walked from the query token with the fewest postings, one
+        # match tier of it at a time and in rank-key order within a tier. A
+        # document's score is the sum of the best tier each query token reaches it
+        # with, so none reached through driver tier t scores below t + rest_score.
+        by_size = sorted(token_matches, key=lambda matches: sum(len(self._postings[token]) for token in matches))
+        driver = by_size[0]
+        rest_score = sum(min(matches.values()) for matches in by_size[1:])
+        driver_tiers = {}
+        for token, tier in driver.items():
+            driver_tiers.setdefault(tier, []).append(token)
+        docs, ids = self._docs, self._ids
+        # A document must contain a match of every query token, checked rarest first by
+        # set lookups; only documents passing are scored. Walked ones have the driver's.
+        filters = [[self._members[token] for token in matches] for matches in by_size]
+        others = filters[1:]
+
+        def matches_all(key, filters):
+            for members in filters:
+                for docs_with_token in members:
+                    if key in docs_with_token:
+                        break
+                else:
+                    return False
+            return True
+
+        def rank(key):
+            lowered, tokens, _ = docs[ids[key]]
+            score = 0
+            for matches in token_matches:
+                score += min(matches[token] for token in tokens if token in matches)
+            return (score, 0 if lowered.startswith(phrase) else 1, key)
+
+        # Texts starting with the query are a contiguous run of the sorted texts. When
+        # the run is short it is ranked up front, so the walk can stop at the first
+        # full set of best-scoring documents rather than the first full set that
+        # also starts with the query.
+        start = bisect.bisect_left(self._texts, (phrase,))
+        starts = []
+        for lowered, key in self._texts[start:start + STARTS_SCAN + 1]:
+            if not lowered.startswith(phrase):
+                break
+            starts.append(key)
+        starts_ranked = len(starts) <= STARTS_SCAN
+        if not starts_ranked:
+            starts = []
+
+        # Max-heap (negated rank keys) of the best documents so far
+        top = []
+
+        def offer(ranked):
+            item = (-ranked[0], -ranked[1], -ranked[2])
+            if limit is None or len(top) < limit:
+                heapq.heappush(top, item)
+            elif item > top[0]:
+                heapq.heapreplace(top, item)
+
+        for key in starts:
+            if matches_all(key, filters):
+                offer(rank(key))
+        seen = set(starts)
+        # Unwalked documents start with the query only when the run was too long to rank
+        flag = 1 if starts_ranked else 0
+        for tier in sorted(driver_tiers):
+            # Stop once the worst kept document beats any still to be walked:
+            # those score at least bound and come later in rank-key order.
+            bound = tier + rest_score
+            for key in self._walk(driver_tiers[tier]):
+                if limit is not None and len(top) == limit and (bound, flag, key) > (-top[0][0], -top[0][1], -top[0][2]):
+                    return [ids[-item[2]] for item in sorted(top, reverse=True)]
+                if key in seen or not matches_all(key, others):
+                    continue
+                if len(driver_tiers) > 1:
+                    seen.add(key)
+                offer(rank(key))
+        return [ids[-item[2]] for item in sorted(top, reverse=True)]
+
+    def on_work_change(self, event: str, work: dict):
+        """WorksManager listener: re-index a work on add or edit."""
+        if work and event in ("add", "edit"):
+            self.add(work["project_id"], work_search_text(work))
+
+
+def work_search_text(work) -> str:
+    """Searchable text of a works table row: its short name and project id."""
+    return f"{work.get('short_name_of_work') or ''} {work.get('project_id') or ''}"
@@ -0,0 +1,106 @@
+# sheet_upload.py
+
+import logging
+import pandas as pd
+from database import ID_CHUNK
+from ingest import WORK_COLUMNS, WorksSheetReader
+
+# Configure logging
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s [%(levelname)s]: %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+
+
+def read_works_sheet(source, filename: str = None, pending_with: str = None) -> tuple:
+    """
+    Read a works progress sheet and map it onto the works columns it provides.
+
+    Only columns present in the sheet are kept, so a sheet that leaves out a
+    column never blanks it in the database.
+
+    Parameters:
+        source: File path or file-like object.
+        filename (str, optional): Name used to pick the format when source is file-like.
+        pending_with (str, optional): Works pending-with authority to set on every row.
+
+    Returns:
+        tuple: (frame keyed by project_id, rows read, rows without a usable project_id).
+    """
+    reader = WorksSheetReader(source, filename, pending_with)
+    mapped = reader.read().drop(columns="banner")
+
+    # Rows without a project ID and repeated IDs (after the first) are skipped
+    valid = (mapped["project_id"] != "") & ~mapped["project_id"].duplicated()
+    return mapped[valid].set_index("project_id"), reader.rows, int((~valid).sum())
+
+
+def normalize_works(frame: pd.DataFrame) -> pd.DataFrame:
+    """Coerce works columns to the dtypes map_columns produces, so sheet and database rows hash alike."""
+    normalized = {}
+    for column in frame.columns:
+        kind, default = WORK_COLUMNS[column][1:] if column in WORK_COLUMNS else ("text", "")
+        if kind in ("text", "category"):
+            normalized[column] = frame[column].fillna(default).astype(str)
+        else:
+            numbers = pd.to_numeric(frame[column], errors="coerce").fillna(default)
+            normalized[column] = numbers.astype("int64") if kind == "int" else numbers.astype("float64")
+    return pd.DataFrame(normalized, index=frame.index)
+
+
+def row_hashes(frame: pd.DataFrame) -> pd.Series:
+    """Return one 64-bit hash per row of a normalized frame (column order matters)."""
+    return pd.util.hash_pandas_object(frame, index=False)
+
+
+def stored_works(conn, project_ids, columns: list) -> pd.DataFrame:
+    """Read the given columns of the works with these project IDs, indexed by project_id."""
+    project_ids = list(project_ids)
+    frames = []
+    for start in range(0, len(project_ids), ID_CHUNK):
+        chunk = project_ids[start:start + ID_CHUNK]
+        frames.append(pd.read_sql_query(
+            f"SELECT project_id, {', '.join(columns)} FROM works "
+            f"WHERE project_id IN ({', '.join('?' for _ in chunk)});",
+            conn, params=chunk,
+        ))
+    if not frames:
+        return pd.DataFrame(columns=columns, index=pd.Index([], name="project_id"))
+    return pd.concat(frames, ignore_index=True).set_index("project_id")
+
+
+def diff_works(conn, sheet: pd.DataFrame) -> dict:
+    """
+    Compare a sheet with the works table by row hash.
+
+    Parameters:
+        conn (sqlite3.Connection): Connection to read the stored works from.
+        sheet (pd.DataFrame): Frame from read_works_sheet(), indexed by project_id.
+
+    Returns:
+        dict: "inserts" (project IDs not in works), "updates" (project IDs whose
+              values differ) and "unchanged" (count of identical rows).
+    """
+    sheet = normalize_works(sheet)
+    columns = list(sheet.columns)
+    stored = stored_works(conn, sheet.index, columns)
+    known = sheet.index.isin(stored.index)
+
+    existing = sheet[known]
+    before = row_hashes(normalize_works(stored.loc[existing.index, columns]))
+    after = row_hashes(existing)
+    changed = before.to_numpy() != after.to_numpy()
+    return {
+        "inserts": sheet.index[~known].tolist(),
+        "updates": existing.index[changed].tolist(),
+        "unchanged": int((~changed).sum()),
+    }
+
+
+def sheet_items(sheet: pd.DataFrame, project_ids: list) -> list:
+    """Turn sheet rows into WorksManager.apply_batch items (native Python values)."""
+    rows = normalize_works(sheet).loc[project_ids]
+    columns = list(rows.columns)
+    values = zip(rows.index.tolist(), *(rows[column].tolist() for column in columns))
+    return [{"project_id": row[0], **dict(zip(columns, row[1:]))} for row in values]
@@ -1,21 +1,28 @@
 import streamlit as st
+from card_renderer import render_cards
+from chatbot_data import SOURCE_SCHEMA, WorksSchema
+from data_loader import format_number
+from paged_table import FrameSource, render_paged_table
 
-def render_station_table(station_data):
-    """Render station data in a table view."""
+def render_station_table(station_data, key: str = "stations"):
+    """Render station data in a paged table view."""
     if station_data.empty:
         st.warning("No station details available.")
     else:
-        st.dataframe(station_data)
+        render_paged_table(FrameSource(station_data, key), key=key)
 
-def render_work_table(work_data):
-    """Render works data in a table view."""
+def render_work_table(work_data, key: str = "works"):
+    """Render works data in a paged table view."""
     if work_data.empty:
         st.warning("No works found.")
     else:
-        st.dataframe(work_data)
+        render_paged_table(FrameSource(work_data, key), key=key)
 
-def render_station_card(station_details):
+def render_station_card(station_details, heading: str = "Station Details: "):
     """Render station details in a modern and organized card format."""
+    if not station_details:
+        st.warning("No station details available.")
+        return
     st.markdown(
         f"""
         <style>
@@ -60,12 +67,12 @@ def render_station_card(station_details):
             }}
         </style>
         <div class="station-card">
-            <h3>🚉 Station Details: {station_details['STATION_NAME']} ({station_details['STATION_CODE']}) - {station_details['CATEGORISATION']}</h3>
+            <h3>🚉 {heading}{station_details['STATION_NAME']} ({station_details['STATION_CODE']}) - {station_details['CATEGORISATION']}</h3>
             <div class="header-line"></div>
             <div class="station-info">
                 <p><b>Earnings Range:</b> {station_details['EARNINGS_RANGE']}</p>
                 <p><b>Passenger Range:</b> {station_details['PASSENGER_RANGE']}</p>
-                <p><b>Passenger Footfall:</b> {station_details['PASSENGER_FOOTFALL']}</p>
+                <p><b>Passenger Footfall:</b> {format_number(station_details['PASSENGER_FOOTFALL'])}</p>
                 <p><b>Platforms:</b> {station_details['PLATFORMS']}</p>
                 <p><b>Platform Type:</b> {station_details['PLATFORM_TYPE']}</p>
                 <p><b>Parking:</b> {station_details['PARKING']}</p>
@@ -76,68 +83,7 @@ def render_station_card(station_details):
         unsafe_allow_html=True,
     )
 
-def render_work_cards(work_data):
-    """Render works data in a grid layout with enhanced card styling."""
-    if work_data.empty:
-        st.warning("No works found.")
-        return
-
-    st.markdown(
-        """
-        <style>
-            .card-container {
-                display: flex;
-                flex-wrap: wrap;
-                justify-content: space-around;
-                gap: 20px;
-                margin-top: 20px;
-            }
-            .card {
-                border: 1px solid #ddd;
-                border-radius: 15px;
-                background: linear-gradient(to bottom, #f8f9fa, #ffffff);
-                padding: 20px;
-                box-shadow: 0 8px 16px rgba(0, 0, 0, 0.2);
-                width: 30%;
-                transition: transform 0.3s ease, box-shadow 0.3s ease;
-            }
-            .card:hover {
-                transform: translateY(-5px);
-                box-shadow: 0 12px 24px rgba(0, 0, 0, 0.3);
-            }
-            .card h3 {
-                font-size: 1.5rem;
-                color: #333;
-                margin-bottom: 10px;
-                text-align: center;
-                border-bottom: 2px solid #007BFF;
-                padding-bottom: 5px;
-            }
-            .card p {
-                font-size: 1rem;
-                color: #555;
-                margin: 8px 0;
-            }
-            .card p b {
-                color: #007BFF;
-            }
-        </style>
-        """,
-        unsafe_allow_html=True,
-    )
+def render_work_cards(work_data, schema: WorksSchema = SOURCE_SCHEMA, key="works", empty_message="No works found."):
+    """Render works data as a paginated grid of the schema's cards."""
+    render_cards(work_data, schema.card, key=key, empty_message=empty_message)
 
-    st.markdown('<div class="card-container">', unsafe_allow_html=True)
-    for _, row in work_data.iterrows():
-        st.markdown(
-            f"""
-            <div class="card">
-                <h3>{row.get('Short Name of Work', 'No Title')}</h3>
-                <p><b>📅 Year of Sanction:</b> {row.get('Year of Sanction', 'N/A')}</p>
-                <p><b>💰 Current Cost:</b> {row.get('Current Cost', 'N/A')}</p>
-                <p><b>📊 Financial Progress:</b> {row.get('Financial Progress', 'N/A')}</p>
-                <p><b>📝 Remarks:</b> {row.get('Remarks', 'N/A')}</p>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
-    st.markdown('</div>', unsafe_allow_html=True)
\ No newline at end of file
@@ -3,7 +3,9 @@
 
 import sqlite3
 import logging
-from database import Database
+from database import Database, ID_CHUNK, PH53_COLUMNS, PH53_SUMMARY_QUERY, rebuild_ph53_summary
+from ingest import BulkIngestor, REMARK_COLUMNS, WORK_COLUMNS
+from sheet_upload import diff_works, read_works_sheet, sheet_items
 import pandas as pd
 import datetime
 import os
@@ -15,6 +17,42 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
+# Columns a caller may write; anything else is rejected before SQL is built.
+WORK_FIELDS = ("works_pending_with", *WORK_COLUMNS)
+REMARK_FIELDS = tuple(REMARK_COLUMNS)
+
+
+class BatchRolledBack(Exception):
+    """Raised inside an atomic batch to roll it back when any item failed."""
+
+
+def _field_error(item, allowed, required=()) -> str:
+    """Return why an item cannot be written, or None when its columns are acceptable."""
+    if not isinstance(item, dict):
+        return f"expected a dict, got {type(item).__name__}"
+    unknown = [key for key in item if key not in allowed]
+    if unknown:
+        return f"unknown column(s): {', '.join(map(str, unknown))}"
+    missing = [key for key in required if item.get(key) in (None, "")]
+    if missing:
+        return f"missing {', '.join(missing)}"
+    return None
+
+
+def _runs(items: list, positions: list):
+    """Group positions into consecutive runs of items with the same columns, keeping order."""
+    run, columns = [], None
+    for position in positions:
+        keys = tuple(items[position])
+        if run and keys != columns:
+            yield columns, run
+            run = []
+        columns = keys
+        run.append(position)
+    if run:
+        yield columns, run
+
+
 class WorksManager:
     """
     A class to manage PH-53 works data, including CRUD operations and remarks handling.
@@ -28,9 +66,37 @@ class WorksManager:
             db (Database): An instance of the Database class for DB operations.
         """
         self.db = db
-        self.conn = self.db.connection
+        self._listeners = {}
         logging.info("WorksManager initialized.")
     
+    @property
+    def conn(self):
+        """The calling thread's read connection; writes go through Database.write."""
+        return self.db.connection
+    
+    def add_listener(self, name: str, callback):
+        """
+        Register a callback that is told about every committed write.
+        
+        Registering again under the same name replaces the earlier callback, so
+        derived structures (search indexes, summaries) can be rebuilt and
+        re-registered without piling up stale listeners.
+        
+        Parameters:
+            name (str): Listener name.
+            callback (callable): Called as callback(event, record) with event
+                                 "add", "edit" or "remark" and the stored record.
+        """
+        self._listeners[name] = callback
+    
+    def _notify(self, event: str, record: dict):
+        """Pass a committed write to every listener; listener errors are logged, not raised."""
+        for name, callback in list(self._listeners.items()):
+            try:
+                callback(event, record)
+            except Exception as e:
+                logging.error(f"Listener '{name}' failed on {event}: {e}")
+    
     def add_work_record(self, work_data: dict):
         """
         Add a new work record to the 'works' table.
@@ -41,9 +107,8 @@ class WorksManager:
         Returns:
             bool: True if the operation was successful, False otherwise.
         """
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
+        def insert(conn):
+            conn.execute("""
                 INSERT INTO works (
                     works_pending_with,
                     project_id,
@@ -86,8 +151,11 @@ class WorksManager:
                     :latest_remarks_civil_as_on
                 );
             """, work_data)
-            self.conn.commit()
+
+        try:
+            self.db.write(insert, announced=True)
             logging.info(f"Added new work record: {work_data.get('project_id')}")
+            self._notify("add", self.get_work_by_id(work_data.get('project_id')))
             return True
         except sqlite3.IntegrityError as e:
             logging.error(f"IntegrityError while adding work record: {e}")
@@ -107,23 +175,234 @@ class WorksManager:
         Returns:
             bool: True if the operation was successful, False otherwise.
         """
+        error = _field_error(updated_data, WORK_FIELDS)
+        if error:
+            logging.error(f"Rejected edit of work record {project_id}: {error}")
+            return False
         try:
-            cursor = self.conn.cursor()
-            # Prepare the SET part of the SQL statement
+            # Prepare the SET part of the SQL statement; project_id identifies the row and is not updated
+            updated_data = {key: value for key, value in updated_data.items() if key != 'project_id'}
             set_clause = ", ".join([f"{key} = :{key}" for key in updated_data.keys()])
             updated_data['project_id'] = project_id
             sql = f"UPDATE works SET {set_clause} WHERE project_id = :project_id;"
-            cursor.execute(sql, updated_data)
-            if cursor.rowcount == 0:
+            rowcount = self.db.write(lambda conn: conn.execute(sql, updated_data).rowcount, announced=True)
+            if rowcount == 0:
                 logging.warning(f"No work record found with PROJECTID: {project_id}")
                 return False
-            self.conn.commit()
             logging.info(f"Edited work record: {project_id}")
+            self._notify("edit", self.get_work_by_id(project_id))
             return True
         except Exception as e:
             logging.error(f"Error while editing work record: {e}")
             return False
     
+    def apply_batch(self, inserts=(), updates=(), remarks=(), atomic: bool = True) -> dict:
+        """
+        Apply many work inserts, work updates and remarks in one write transaction.
+        
+        Items are dicts keyed by column name. Updates carry the project_id of the
+        work plus the columns to change, so the rows of an uploaded progress sheet
+        can be passed as they are. Column names are checked against WORK_FIELDS /
+        REMARK_FIELDS before any SQL is built. Inserts run first, then updates,
+        then remarks (so remarks may refer to works added in the same batch);
+        consecutive items with the same columns share one executemany, and a
+        group that hits a constraint is retried row by row to find the failing items.
+        
+        Parameters:
+            inserts (iterable of dict): New works; project_id is required.
+            updates (iterable of dict): Changes to existing works; project_id is required.
+            remarks (iterable of dict): New remarks.
+            atomic (bool): Roll back the whole batch if any item fails; otherwise
+                           commit the items that succeeded.
+        
+        Returns:
+            dict: "applied" (bool, whether anything was committed) and one result list
+                  per kind ("inserts", "updates", "remarks") in input order. Each result
+                  has "index", "project_id", "status" ("inserted", "updated", "added",
+                  "invalid", "not_found", "failed" or "rolled_back") and "error".
+        """
+        batches = {
+            "inserts": (list(inserts), WORK_FIELDS, ("project_id",), "inserted"),
+            "updates": (list(updates), WORK_FIELDS, ("project_id",), "updated"),
+            "remarks": (list(remarks), REMARK_FIELDS, (), "added"),
+        }
+        results = {}
+        for kind, (items, allowed, required, _) in batches.items():
+            results[kind] = []
+            for index, item in enumerate(items):
+                error = _field_error(item, allowed, required)
+                results[kind].append({
+                    "index": index,
+                    "project_id": item.get("project_id") if isinstance(item, dict) else None,
+                    "status": "invalid" if error else None,
+                    "error": error,
+                })
+
+        def pending(kind):
+            return [result["index"] for result in results[kind] if result["status"] is None]
+
+        def insert_sql(table):
+            return lambda columns: (
+                f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join(':' + column for column in columns)});"
+            )
+
+        def update_sql(columns):
+            set_clause = ", ".join(f"{column} = :{column}" for column in columns if column != "project_id")
+            return f"UPDATE works SET {set_clause} WHERE project_id = :project_id;"
+
+        def job(conn):
+            if not conn.in_transaction:
+                conn.execute("BEGIN;")
+            self._execute_runs(conn, batches["inserts"][0], results["inserts"], pending("inserts"),
+                               insert_sql("works"), "inserted")
+
+            # Updates whose project_id does not exist (after this batch's inserts) are reported, not run
+            positions = pending("updates")
+            existing = self._existing_project_ids(conn, {batches["updates"][0][i]["project_id"] for i in positions})
+            for position in positions:
+                if batches["updates"][0][position]["project_id"] not in existing:
+                    results["updates"][position].update(status="not_found", error="no work with this project_id")
+            positions = [i for i in pending("updates") if len(batches["updates"][0][i]) > 1]
+            for position in set(pending("updates")) - set(positions):
+                results["updates"][position]["status"] = "updated"  # nothing to change
+            self._execute_runs(conn, batches["updates"][0], results["updates"], positions, update_sql, "updated")
+
+            self._execute_runs(conn, batches["remarks"][0], results["remarks"], pending("remarks"),
+                               insert_sql("remarks"), "added")
+
+            if atomic and any(result["status"] not in ("inserted", "updated", "added")
+                              for kind_results in results.values() for result in kind_results):
+                raise BatchRolledBack()
+
+        if atomic and any(result["status"] == "invalid" for kind_results in results.values() for result in kind_results):
+            applied = False
+        else:
+            try:
+                self.db.write(job, announced=True)
+                applied = True
+            except BatchRolledBack:
+                applied = False
+            except Exception as e:
+                logging.error(f"Error while applying work batch: {e}")
+                for kind_results in results.values():
+                    for result in kind_results:
+                        if result["status"] in (None, "inserted", "updated", "added"):
+                            result.update(status="failed", error=str(e))
+                return {"applied": False, **results}
+
+        if not applied:
+            for kind_results in results.values():
+                for result in kind_results:
+                    if result["status"] in (None, "inserted", "updated", "added"):
+                        result["status"] = "rolled_back"
+        else:
+            self._notify_batch(batches, results)
+
+        counts = {kind: sum(result["status"] == batches[kind][3] for result in results[kind]) for kind in results}
+        failed = sum(len(results[kind]) for kind in results) - sum(counts.values())
+        logging.info(f"Work batch {'applied' if applied else 'rolled back'}: {counts['inserts']} inserted, "
+                     f"{counts['updates']} updated, {counts['remarks']} remarks added, {failed} not applied.")
+        return {"applied": applied, **results}
+    
+    def upload_progress_sheet(self, source, filename: str = None, pending_with: str = None,
+                              atomic: bool = False) -> dict:
+        """
+        Apply a progress sheet (CSV or Excel, shaped like the division sheets) to works.
+        
+        Each sheet row is hashed and compared with the stored work of the same
+        project_id; only new and changed rows are written, through apply_batch,
+        so re-uploading a sheet with a handful of edits touches only those works.
+        Columns missing from the sheet are left as they are.
+        
+        Parameters:
+            source: File path or file-like object (e.g. a Streamlit upload).
+            filename (str, optional): Name used to pick the format when source is file-like.
+            pending_with (str, optional): Works pending-with authority to set on every row.
+            atomic (bool): Apply all changes or none (see apply_batch).
+        
+        Returns:
+            dict: "rows", "skipped" (rows without a usable project_id), "inserted",
+                  "updated", "unchanged", "failed" and the apply_batch "results".
+        """
+        sheet, rows, skipped = read_works_sheet(source, filename, pending_with)
+        diff = diff_works(self.conn, sheet)
+        results = self.apply_batch(
+            inserts=sheet_items(sheet, diff["inserts"]),
+            updates=sheet_items(sheet, diff["updates"]),
+            atomic=atomic,
+        )
+        report = {
+            "rows": rows,
+            "skipped": skipped,
+            "inserted": sum(result["status"] == "inserted" for result in results["inserts"]),
+            "updated": sum(result["status"] == "updated" for result in results["updates"]),
+            "unchanged": diff["unchanged"],
+        }
+        report["failed"] = len(diff["inserts"]) + len(diff["updates"]) - report["inserted"] - report["updated"]
+        report["results"] = results
+        logging.info(
+            f"Progress sheet {filename or getattr(source, 'name', source)}: {rows} rows, {report['inserted']} inserted, "
+            f"{report['updated']} updated, {report['unchanged']} unchanged, {report['failed']} failed, {skipped} skipped."
+        )
+        return report
+    
+    def _execute_runs(self, conn, items: list, results: list, positions: list, build_sql, status: str):
+        """Run items with executemany per run of equal columns, falling back to row-by-row on errors."""
+        for columns, run in _runs(items, positions):
+            sql = build_sql(columns)
+            conn.execute("SAVEPOINT batch_run;")
+            try:
+                conn.executemany(sql, [items[position] for position in run])
+                conn.execute("RELEASE batch_run;")
+                for position in run:
+                    results[position]["status"] = status
+                continue
+            except sqlite3.DatabaseError:
+                conn.execute("ROLLBACK TO batch_run;")
+                conn.execute("RELEASE batch_run;")
+            for position in run:
+                conn.execute("SAVEPOINT batch_item;")
+                try:
+                    conn.execute(sql, items[position])
+                    conn.execute("RELEASE batch_item;")
+                    results[position]["status"] = status
+                except sqlite3.DatabaseError as e:
+                    conn.execute("ROLLBACK TO batch_item;")
+                    conn.execute("RELEASE batch_item;")
+                    results[position].update(status="failed", error=str(e))
+    
+    def _existing_project_ids(self, conn, project_ids) -> set:
+        """Return which of the given project IDs exist in works."""
+        project_ids = list(project_ids)
+        existing = set()
+        for start in range(0, len(project_ids), ID_CHUNK):
+            chunk = project_ids[start:start + ID_CHUNK]
+            rows = conn.execute(
+                f"SELECT project_id FROM works WHERE project_id IN ({', '.join('?' for _ in chunk)});", chunk
+            ).fetchall()
+            existing.update(row[0] for row in rows)
+        return existing
+    
+    def _notify_batch(self, batches: dict, results: dict):
+        """Tell listeners about every item a committed batch wrote, reading the stored works in chunks."""
+        if not self._listeners:
+            return
+        for kind, event in (("inserts", "add"), ("updates", "edit")):
+            project_ids = list(dict.fromkeys(
+                result["project_id"] for result in results[kind] if result["status"] == batches[kind][3]
+            ))
+            for start in range(0, len(project_ids), ID_CHUNK):
+                chunk = project_ids[start:start + ID_CHUNK]
+                rows = self.conn.execute(
+                    f"SELECT * FROM works WHERE project_id IN ({', '.join('?' for _ in chunk)});", chunk
+                ).fetchall()
+                for row in rows:
+                    self._notify(event, dict(row))
+        items = batches["remarks"][0]
+        for result in results["remarks"]:
+            if result["status"] == "added":
+                self._notify("remark", dict(items[result["index"]]))
+    
     def get_all_works(self) -> pd.DataFrame:
         """
         Retrieve all work records from the 'works' table.
@@ -174,9 +453,8 @@ class WorksManager:
         Returns:
             bool: True if the operation was successful, False otherwise.
         """
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute("""
+        def insert(conn):
+            conn.execute("""
                 INSERT INTO remarks (
                     date,
                     works_pending_with,
@@ -191,8 +469,11 @@ class WorksManager:
                     :remark
                 );
             """, remark_data)
-            self.conn.commit()
+
+        try:
+            self.db.write(insert, announced=True)
             logging.info(f"Added new remark for PROJECTID: {remark_data.get('project_id')}")
+            self._notify("remark", dict(remark_data))
             return True
         except Exception as e:
             logging.error(f"Error while adding remark: {e}")
@@ -215,37 +496,23 @@ class WorksManager:
     
     def summarize_ph53_works(self) -> pd.DataFrame:
         """
-        Summarize PH-53 works by categorizing them based on their 'Status'.
-        Assumes that 'Status' is part of the 'works' table or needs to be determined.
-        Adjust the logic based on actual data schema.
+        Summarize PH-53 works by "Works Pending with", bucketed by financial progress.
+        Reads the materialized ph53_summary table, which triggers on the works
+        table keep current, so the cost does not grow with the number of works.
     
         Returns:
             pd.DataFrame: A summary DataFrame containing aggregated counts for each "Works Pending with".
         """
         try:
-            query = """
-                SELECT 
-                    works_pending_with,
-                    COUNT(*) AS total_pids_sanctioned,
-                    SUM(CASE WHEN financial_progress_percent >= 100 THEN 1 ELSE 0 END) AS works_completed_pending_cr_fcc_bill,
-                    SUM(CASE WHEN financial_progress_percent < 100 AND financial_progress_percent >= 50 THEN 1 ELSE 0 END) AS tender_to_be_called,
-                    SUM(CASE WHEN financial_progress_percent < 50 AND financial_progress_percent >= 25 THEN 1 ELSE 0 END) AS tender_under_finalization_loa_issued,
-                    SUM(CASE WHEN financial_progress_percent < 25 THEN 1 ELSE 0 END) AS work_in_progress
-                FROM works
-                GROUP BY works_pending_with
-            """
-            df = pd.read_sql_query(query, self.conn)
+            df = pd.read_sql_query(
+                f"SELECT NULLIF(works_pending_with, '') AS works_pending_with, {', '.join(PH53_COLUMNS)} "
+                "FROM ph53_summary ORDER BY works_pending_with;",
+                self.conn
+            )
             
             # Adding Total Row
-            total_row = {
-                "works_pending_with": "Total Works",
-                "total_pids_sanctioned": df["total_pids_sanctioned"].sum(),
-                "works_completed_pending_cr_fcc_bill": df["works_completed_pending_cr_fcc_bill"].sum(),
-                "tender_to_be_called": df["tender_to_be_called"].sum(),
-                "tender_under_finalization_loa_issued": df["tender_under_finalization_loa_issued"].sum(),
-                "work_in_progress": df["work_in_progress"].sum()
-            }
-            df = df.append(total_row, ignore_index=True)
+            total_row = {"works_pending_with": "Total Works", **{column: df[column].sum() for column in PH53_COLUMNS}}
+            df = pd.concat([df, pd.DataFrame([total_row])], ignore_index=True)
             
             logging.info("PH-53 works summary created successfully.")
             return df
@@ -253,6 +520,34 @@ class WorksManager:
             logging.error(f"Error summarizing PH-53 works: {e}")
             return pd.DataFrame()
     
+    def check_ph53_summary(self, repair: bool = False) -> pd.DataFrame:
+        """
+        Compare the materialized PH-53 summary with a full recompute from works.
+        
+        Parameters:
+            repair (bool): Rebuild the materialized table when they differ.
+        
+        Returns:
+            pd.DataFrame: One row per pending-with value whose counts differ, with
+                          the stored and recomputed counts side by side; empty when consistent.
+        """
+        stored = pd.read_sql_query(f"SELECT works_pending_with, {', '.join(PH53_COLUMNS)} FROM ph53_summary;", self.conn)
+        expected = pd.read_sql_query(PH53_SUMMARY_QUERY, self.conn)
+        merged = stored.merge(expected, on="works_pending_with", how="outer", suffixes=("_stored", "_expected"))
+        merged = merged.fillna(0)
+        differs = pd.Series(False, index=merged.index)
+        for column in PH53_COLUMNS:
+            differs |= merged[f"{column}_stored"] != merged[f"{column}_expected"]
+        mismatches = merged[differs].reset_index(drop=True)
+        if mismatches.empty:
+            logging.info("PH-53 summary is consistent with the works table.")
+        else:
+            logging.warning(f"PH-53 summary differs from the works table for {len(mismatches)} pending-with values.")
+            if repair:
+                self.db.write(rebuild_ph53_summary)
+                logging.info("PH-53 summary rebuilt from the works table.")
+        return mismatches
+    
     def get_remarks_with_dates(self) -> pd.DataFrame:
         """
         Collect remarks from all data sets with the current date attached.
@@ -272,305 +567,29 @@ class WorksManager:
             logging.error(f"Error collecting remarks with dates: {e}")
             return pd.DataFrame()
     
-    def initialize_data_from_csv(self, csv_folder: str = '.'):
+    def initialize_data_from_csv(self, csv_folder: str = '.', chunk_rows: int = None) -> dict:
         """
         Initialize the database with data from CSV files located in the specified folder.
         It detects and imports data for stations, paavailability, works, and remarks.
+        Each table is cleaned with vectorized pandas operations and loaded with a
+        single executemany, all inside one transaction.
         
         Parameters:
             csv_folder (str): Path to the folder containing CSV files.
                               Defaults to the current directory.
+            chunk_rows (int, optional): Stream files in chunks of this many rows,
+                                        keeping memory flat for very large files.
+        
+        Returns:
+            dict: Per-table row, insert and rejection counts (see BulkIngestor.ingest_folder).
         """
         try:
-            # Initialize stations from 'stations.csv'
-            stations_csv = os.path.join(csv_folder, 'stations.csv')
-            with open(stations_csv, 'r') as file:
-                data = file.read()  # Dummy read operation
-        except FileNotFoundError:
-            print(f"Error: The file '{stations_csv}' was not found.")
-        except Exception as e:
-            print(f"An unexpected error occurred: {e}")
-        finally:
-            if os.path.isfile(stations_csv):
-                stations_df = pd.read_csv(stations_csv)
-                for _, row in stations_df.iterrows():
-                    station_data = {
-                        "station_code": row.get('Station code', '').strip(),
-                        "station_name": row.get('STATION NAME', '').strip(),
-                        "categorisation": row.get('Categorisation', '').strip(),
-                        "zone": row.get('ZONE', '').strip(),
-                        "division": row.get('DIVISION', '').strip(),
-                        "section": row.get('Section', '').strip(),
-                        "earnings_range": row.get('Earnings range', '').strip(),
-                        "passenger_range": row.get('Passenger range', '').strip(),
-                        "passenger_footfall": int(row.get('Passenger footfall', 0)),
-                        "platform_type": row.get('Platform Type', 'Unknown').strip(),
-                        "number_of_platforms": int(row.get('Number of Platforms', 0))
-                    }
-                    try:
-                        self.conn.execute("""
-                            INSERT OR IGNORE INTO stations (
-                                station_code, station_name, categorisation, zone, division, section, 
-                                earnings_range, passenger_range, passenger_footfall, platform_type, number_of_platforms
-                            ) VALUES (
-                                :station_code, :station_name, :categorisation, :zone, :division, :section, 
-                                :earnings_range, :passenger_range, :passenger_footfall, :platform_type, :number_of_platforms
-                            );
-                        """, station_data)
-                        logging.info(f"Inserted/Skipped station: {station_data['station_code']}")
-                    except Exception as e:
-                        logging.error(f"Error inserting station {station_data['station_code']}: {e}")
-                self.conn.commit()
-                logging.info("Stations data initialized from CSV.")
-            else:
-                logging.warning(f"'stations.csv' not found in {csv_folder}. Skipping stations initialization.")
-            
-            # Initialize paavailability from 'paavailability.csv'
-            paavailability_csv = os.path.join(csv_folder, 'paavailability.csv')
-            if os.path.isfile(paavailability_csv):
-                pa_df = pd.read_csv(paavailability_csv)
-                for _, row in pa_df.iterrows():
-                    pa_data = {
-                        "station_code": row.get('Stations ', '').strip(),
-                        "amenities": row.get('Amenities', '').strip(),
-                        "platforms_hl_ml_rl": row.get('Platforms -HL/ML/RL', '').strip(),
-                        "number_of_platforms_length_each_pf": row.get('No. of Platforms (Length of Each PF)', '').strip(),
-                        "foot_over_bridge": row.get('Foot over bridge (with Ramp or Steps)', '').strip(),
-                        "drinking_water_taps_pf_wise": row.get('Drinking water taps (PF wise)', '').strip(),
-                        "seating_arrangement": row.get('Seating Arrangement (no. of passenger/PF)', '').strip(),
-                        "platform_shelter_sqm": row.get('Platform Shelter ((PF wise: in sqm)', '').strip(),
-                        "urinals": row.get("Urinals (including W/R's & Pay & Use Toilet)", '').strip(),
-                        "latrines": row.get('Latrines', '').strip(),
-                        "toilet_facility": row.get('Toilet Facility/Pay & Use toilet in Circulating area', '').strip(),
-                        "number_of_pay_use_toilet_units": row.get('No. of Pay & Use toilet units (Platform wise)', '').strip(),
-                        "gps_clock": row.get('GPS Clock', '').strip(),
-                        "water_cooler_ro_plant_pf_wise": row.get('Water Cooler/RO Palnt PF wise', '').strip(),
-                        "dustbins": row.get('Dustbins (Dry & Wet In Pairs)', '').strip(),
-                        "announcement_system": row.get('Announcement System (Computerised/Manual)', '').strip(),
-                        "two_wheeler_parking_capacity": int(row.get('2 Wheeler Parking (Capacity)', 0)),
-                        "four_wheeler_parking_capacity": int(row.get('4 Wheeler Parking (Capacity)', 0)),
-                        "pre_paid_taxi_auto_booth": row.get('Pre Paid Taxi/Auto Booth', '').strip(),
-                        "national_flag": row.get('100ft tall National flag in Circulating area', '').strip(),
-                        "no_of_daily_trains": row.get('No. of Daily Trains (Ordinary & Express) (---- / ----)', '').strip(),
-                        "no_of_non_daily_trains": row.get('No. of non-daily Trains (Ordinary & Express) (---- / ----)', '').strip(),
-                        "no_of_functional_uts_counters": int(row.get('No. of functional UTS Counters', 0)),
-                        "no_of_functional_prs_counters": int(row.get('No. of functional PRS Counters', 0)),
-                        "ladies_sr_citizen_pwd_uts_counter": row.get('Ladies/Sr.Citizen/PWD (Divyangjan) UTS Counter (Yes/No)', '').strip(),
-                        "no_of_atvm_available": int(row.get('No. of ATVM available', 0)),
-                        "no_of_atvm_facilitators": int(row.get('No. of ATVM Facilitators', 0)),
-                        "enquiry_counter": row.get('Enquiry Counter (Yes/No)', '').strip(),
-                        "current_reservation_facility": row.get('Current Reservation Facility (Yes/No)', '').strip(),
-                        "no_of_coaches_longest_stopping_train": int(row.get('No. of Coaches of Longest stopping train', 0)),
-                        "paid_lounge_ac": row.get('Paid Lounge (A/C)', '').strip(),
-                        "paid_lounge_non_ac": row.get('Paid Lounge (Non-A/C)', '').strip(),
-                        "waiting_hall_ticketing_area": row.get('Waiting Hall/Ticketing area', '').strip(),
-                        "retiring_room_nos_ac": int(row.get('Retiring Room Nos. (AC)', 0)),
-                        "retiring_room_nos_non_ac": int(row.get('Retiring Room Nos. (Non AC)', 0)),
-                        "dormitory_gents_beds": int(row.get('Dormitoty for Gents (No. of Beds)', 0)),
-                        "dormitory_ladies_beds": int(row.get('Dormitoty for Ladies (No. of Beds)', 0)),
-                        "parcel_office": row.get('Parcel Office (Yes/No)', '').strip(),
-                        "no_of_staffs_at_po": int(row.get('No. of Staffs at PO', 0)),
-                        "parcel_packing_available": row.get('Parcel Packing: Available or not', '').strip(),
-                        "reserved_vip_lounge_seating_capacity": int(row.get('Reserved/VIP Lounge (Seating Capacity)', 0)),
-                        "upper_class_waiting_room_seating_capacity": int(row.get('Upper Class Waiting Room (Seating Capacity)', 0)),
-                        "ac_waiting_room_seating_capacity": int(row.get('AC Waiting Room (Seating Capacity)', 0)),
-                        "general_waiting_room_seating_capacity": int(row.get('General Waiting Room (Seating Capacity)', 0)),
-                        "ladies_waiting_room_seating_capacity": int(row.get('Ladies Waiting Room (Seating Capacity)', 0)),
-                        "baby_feeding_corner": row.get('Baby feeding Corner (Yes/No)', '').strip(),
-                        "medical_emergency_centre": row.get('Free Medical Emergency Centre / Ambulance: Name of Hospital backed by', '').strip(),
-                        "first_aid_provision": row.get('First Aid Provision', '').strip(),
-                        "pharmacy": row.get('Pharmacy', '').strip(),
-                        "battery_operated_cars": row.get('Battery Operated Cars (Nos. & Tariff per Passenger)', '').strip(),
-                        "wheel_chair": int(row.get('Wheel Chair (Nos.)', 0)),
-                        "trolley_path": row.get('Trolley Path (Available at 1 end or Both Or not available)', '').strip(),
-                        "divyang_toilet": row.get('Divyang Toilet', '').strip(),
-                        "water_sink_pedestal_for_pwd": row.get('Water sink/pedestal for PWD (Divyangjan) (atleast 1 unit)', '').strip(),
-                        "no_of_railway_sahayak": int(row.get('No. of Railway Sahayak (Licensed porters)', 0)),
-                        "no_of_catering_stall_pf_wise": int(row.get('No. of Catering stall (PF Wise)', 0)),
-                        "no_of_milk_stall_pf_wise": int(row.get('No. of Milk stall (PF Wise)', 0)),
-                        "no_of_multipurpose_stall_pf_wise": int(row.get('No. of Multipurpose stall (PF Wise)', 0)),
-                        "ticket_checking_staff_strength": int(row.get('Ticket Checking staffs strength', 0)),
-                        "osop_stall_location_commodity": row.get('OSOP stall (Location & Commodity)', '').strip(),
-                        "no_of_book_stall_pf_wise": int(row.get('No. of Book stall (PF Wise)', 0)),
-                        "ttdc": row.get('TTDC', '').strip(),
-                        "hpmc": row.get('HPMC', '').strip(),
-                        "food_plaza_irctc": row.get('Food Plaza (IRCTC)', '').strip(),
-                        "jana_aahar_irctc": row.get('Jana Aahar (IRCTC)', '').strip(),
-                        "fast_food_unit_irctc": row.get('Fast Food Unit (IRCTC)', '').strip(),
-                        "refreshment_room_irctc": row.get('Refreshment Room (IRCTC)', '').strip(),
-                        "vrr_nvrr": row.get('VRR/NVRR', '').strip(),
-                        "electronic_train_indicator_board": row.get('Electronic Train indicator Board', '').strip(),
-                        "electronic_coach_indication_board": row.get('Electronic Coach Indication Board', '').strip(),
-                        "rdn_video_wall": row.get('RDN Video Wall (Nos. with Location)', '').strip(),
-                        "manual_coach_indication_board": row.get('Manual Coach Indication Board', '').strip(),
-                        "rdn_cctv": row.get('RDN CCTV (Train Arr./Dep.)', '').strip(),
-                        "wifi_facility": row.get('Wi-Fi Facility (Yes/No)', '').strip(),
-                        "lifts_with_location_pf_no": row.get('Lifts with Location/PF No.', '').strip(),
-                        "escalator_with_location_pf_no": row.get('Escalator with Location/PF No.', '').strip(),
-                        "brailee_signage": row.get('Brailee Signage (Station Map & Plates)', '').strip(),
-                        "atm_facility": row.get('ATM Facility', '').strip(),
-                        "grp_out_post": row.get('GRP out post', '').strip(),
-                        "rpf_post": row.get('RPF post', '').strip(),
-                        "sbi_card_kiosk": row.get('SBI Card KIOSK', '').strip(),
-                        "gaming_zone": row.get('Gaming Zone', '').strip(),
-                        "cleanliness_of_station": row.get('Cleanliness of Station (DEnHM or Station Imprest)', '').strip(),
-                        "cloak_room": row.get('Cloak Room', '').strip(),
-                        "subway": row.get('Subway', '').strip(),
-                        "mobile_charging_points": row.get('Mobile charging points', '').strip(),
-                        "bottle_crusher": row.get('Bottle Crusher', '').strip()
-                    }
-                    try:
-                        self.conn.execute("""
-                            INSERT OR IGNORE INTO paavailability (
-                                station_code, amenities, platforms_hl_ml_rl, number_of_platforms_length_each_pf,
-                                foot_over_bridge, drinking_water_taps_pf_wise, seating_arrangement, platform_shelter_sqm,
-                                urinals, latrines, toilet_facility, number_of_pay_use_toilet_units, gps_clock,
-                                water_cooler_ro_plant_pf_wise, dustbins, announcement_system, two_wheeler_parking_capacity,
-                                four_wheeler_parking_capacity, pre_paid_taxi_auto_booth, national_flag, no_of_daily_trains,
-                                no_of_non_daily_trains, no_of_functional_uts_counters, no_of_functional_prs_counters,
-                                ladies_sr_citizen_pwd_uts_counter, no_of_atvm_available, no_of_atvm_facilitators,
-                                enquiry_counter, current_reservation_facility, no_of_coaches_longest_stopping_train,
-                                paid_lounge_ac, paid_lounge_non_ac, waiting_hall_ticketing_area, retiring_room_nos_ac,
-                                retiring_room_nos_non_ac, dormitory_gents_beds, dormitory_ladies_beds, parcel_office,
-                                no_of_staffs_at_po, parcel_packing_available, reserved_vip_lounge_seating_capacity,
-                                upper_class_waiting_room_seating_capacity, ac_waiting_room_seating_capacity,
-                                general_waiting_room_seating_capacity, ladies_waiting_room_seating_capacity,
-                                baby_feeding_corner, medical_emergency_centre, first_aid_provision, pharmacy,
-                                battery_operated_cars, wheel_chair, trolley_path, divyang_toilet,
-                                water_sink_pedestal_for_pwd, no_of_railway_sahayak, no_of_catering_stall_pf_wise,
-                                no_of_milk_stall_pf_wise, no_of_multipurpose_stall_pf_wise, ticket_checking_staff_strength,
-                                osop_stall_location_commodity, no_of_book_stall_pf_wise, ttdc, hpmc,
-                                food_plaza_irctc, jana_aahar_irctc, fast_food_unit_irctc, refreshment_room_irctc,
-                                vrr_nvrr, electronic_train_indicator_board, electronic_coach_indication_board,
-                                rdn_video_wall, manual_coach_indication_board, rdn_cctv, wifi_facility,
-                                lifts_with_location_pf_no, escalator_with_location_pf_no, brailee_signage,
-                                atm_facility, grp_out_post, rpf_post, sbi_card_kiosk, gaming_zone,
-                                cleanliness_of_station, cloak_room, subway, mobile_charging_points, bottle_crusher
-                            ) VALUES (
-                                :station_code, :amenities, :platforms_hl_ml_rl, :number_of_platforms_length_each_pf,
-                                :foot_over_bridge, :drinking_water_taps_pf_wise, :seating_arrangement, :platform_shelter_sqm,
-                                :urinals, :latrines, :toilet_facility, :number_of_pay_use_toilet_units, :gps_clock,
-                                :water_cooler_ro_plant_pf_wise, :dustbins, :announcement_system, :two_wheeler_parking_capacity,
-                                :four_wheeler_parking_capacity, :pre_paid_taxi_auto_booth, :national_flag, :no_of_daily_trains,
-                                :no_of_non_daily_trains, :no_of_functional_uts_counters, :no_of_functional_prs_counters,
-                                :ladies_sr_citizen_pwd_uts_counter, :no_of_atvm_available, :no_of_atvm_facilitators,
-                                :enquiry_counter, :current_reservation_facility, :no_of_coaches_longest_stopping_train,
-                                :paid_lounge_ac, :paid_lounge_non_ac, :waiting_hall_ticketing_area, :retiring_room_nos_ac,
-                                :retiring_room_nos_non_ac, :dormitory_gents_beds, :dormitory_ladies_beds, :parcel_office,
-                                :no_of_staffs_at_po, :parcel_packing_available, :reserved_vip_lounge_seating_capacity,
-                                :upper_class_waiting_room_seating_capacity, :ac_waiting_room_seating_capacity,
-                                :general_waiting_room_seating_capacity, :ladies_waiting_room_seating_capacity,
-                                :baby_feeding_corner, :medical_emergency_centre, :first_aid_provision, :pharmacy,
-                                :battery_operated_cars, :wheel_chair, :trolley_path, :divyang_toilet,
-                                :water_sink_pedestal_for_pwd, :no_of_railway_sahayak, :no_of_catering_stall_pf_wise,
-                                :no_of_milk_stall_pf_wise, :no_of_multipurpose_stall_pf_wise, :ticket_checking_staff_strength,
-                                :osop_stall_location_commodity, :no_of_book_stall_pf_wise, :ttdc, :hpmc,
-                                :food_plaza_irctc, :jana_aahar_irctc, :fast_food_unit_irctc, :refreshment_room_irctc,
-                                :vrr_nvrr, :electronic_train_indicator_board, :electronic_coach_indication_board,
-                                :rdn_video_wall, :manual_coach_indication_board, :rdn_cctv, :wifi_facility,
-                                :lifts_with_location_pf_no, :escalator_with_location_pf_no, :brailee_signage,
-                                :atm_facility, :grp_out_post, :rpf_post, :sbi_card_kiosk, :gaming_zone,
-                                :cleanliness_of_station, :cloak_room, :subway, :mobile_charging_points, :bottle_crusher
-                            );
-                        """, pa_data)
-                        logging.info(f"Inserted/Skipped paavailability for station: {pa_data['station_code']}")
-                    except Exception as e:
-                        logging.error(f"Error inserting paavailability for station {pa_data['station_code']}: {e}")
-                self.conn.commit()
-                logging.info("PAAvailability data initialized from CSV.")
-            else:
-                logging.warning(f"'paavailability.csv' not found in {csv_folder}. Skipping PAAvailability initialization.")
-            
-            # Initialize works from individual CSV files
-            pending_with_files = {
-                "Sr.DEN/E/SBC": "SrDEN_E_SBC.csv",
-                "Sr.DEN/W/SBC": "SrDEN_W_SBC.csv",
-                "Sr.DEN/S/SBC": "SrDEN_S_SBC.csv",
-                "Sr.DEN/N/SBC": "SrDEN_N_SBC.csv",
-                "Divisional Works": "Divisional_Works.csv",
-                "Dy.CE/GSU/SBC": "Dy_CE_GSU_SBC.csv",
-                "Sr.DCM/SBC": "SrDCM_SBC.csv"
-            }
-            
-            for key, filename in pending_with_files.items():
-                filepath = os.path.join(csv_folder, filename)
-                if os.path.isfile(filepath):
-                    works_df = pd.read_csv(filepath)
-                    for _, row in works_df.iterrows():
-                        work_data = {
-                            "works_pending_with": key,
-                            "project_id": row.get('PROJECTID', '').strip(),
-                            "year_of_sanction": int(row.get('Year of Sanction', 0)),
-                            "date_of_sanction": row.get('Date of Sanction', '').strip(),
-                            "short_name_of_work": row.get('Short Name of Work', '').strip(),
-                            "block_section": row.get('Block Section', '').strip(),
-                            "station": row.get('Station', '').strip(),
-                            "allocation": row.get('ALLOCATION', '').strip(),
-                            "cost": float(row.get('Cost', 0.0)),
-                            "expenditure_up_to_date": float(row.get('Expenditure upto date', 0.0)),
-                            "financial_progress_percent": float(row.get('Financial Progress in %', 0.0)),
-                            "if_umbrella": row.get('IF UMBRELLA?', '').strip(),
-                            "parent_work": row.get('PARENT WORK', '').strip(),
-                            "section": row.get('Section', '').strip(),
-                            "remarks": row.get('Remarks', '').strip(),
-                            "latest_remarks_civil": row.get('Latest Remarks Civil', '').strip(),
-                            "latest_remarks_electrical": row.get('Latest Remarks Electrical', '').strip(),
-                            "latest_remarks_s_t": row.get('Latest Remarks S&T', '').strip(),
-                            "latest_remarks_civil_as_on": row.get('Latest Remarks Civil As On (DD-MM-YYYY)', '').strip()
-                        }
-                        try:
-                            self.conn.execute("""
-                                INSERT OR IGNORE INTO works (
-                                    works_pending_with, project_id, year_of_sanction, date_of_sanction, 
-                                    short_name_of_work, block_section, station, allocation, cost, 
-                                    expenditure_up_to_date, financial_progress_percent, if_umbrella, 
-                                    parent_work, section, remarks, latest_remarks_civil, 
-                                    latest_remarks_electrical, latest_remarks_s_t, latest_remarks_civil_as_on
-                                ) VALUES (
-                                    :works_pending_with, :project_id, :year_of_sanction, :date_of_sanction, 
-                                    :short_name_of_work, :block_section, :station, :allocation, :cost, 
-                                    :expenditure_up_to_date, :financial_progress_percent, :if_umbrella, 
-                                    :parent_work, :section, :remarks, :latest_remarks_civil, 
-                                    :latest_remarks_electrical, :latest_remarks_s_t, :latest_remarks_civil_as_on
-                                );
-                            """, work_data)
-                            logging.info(f"Inserted/Skipped work record: {work_data['project_id']}")
-                        except Exception as e:
-                            logging.error(f"Error inserting work record {work_data['project_id']}: {e}")
-                    self.conn.commit()
-                    logging.info(f"Works data initialized from {filename}.")
-                else:
-                    logging.warning(f"'{filename}' not found in {csv_folder}. Skipping works initialization for {key}.")
-            
-            # Initialize remarks from 'remarks.csv' if exists
-            remarks_csv = os.path.join(csv_folder, 'remarks.csv')
-            if os.path.isfile(remarks_csv):
-                remarks_df = pd.read_csv(remarks_csv)
-                for _, row in remarks_df.iterrows():
-                    remark_data = {
-                        "date": row.get('Date', '').strip(),
-                        "works_pending_with": row.get('Works Pending with', '').strip(),
-                        "project_id": row.get('PROJECTID', '').strip(),
-                        "department": row.get('Department', '').strip(),
-                        "remark": row.get('Remark', '').strip()
-                    }
-                    try:
-                        self.conn.execute("""
-                            INSERT OR IGNORE INTO remarks (
-                                date, works_pending_with, project_id, department, remark
-                            ) VALUES (
-                                :date, :works_pending_with, :project_id, :department, :remark
-                            );
-                        """, remark_data)
-                        logging.info(f"Inserted/Skipped remark for PROJECTID: {remark_data['project_id']}")
-                    except Exception as e:
-                        logging.error(f"Error inserting remark for PROJECTID {remark_data['project_id']}: {e}")
-                self.conn.commit()
-                logging.info("Remarks data initialized from CSV.")
-            else:
-                logging.warning(f"'remarks.csv' not found in {csv_folder}. Skipping remarks initialization.")
-            
+            report = self.db.write(lambda conn: BulkIngestor(conn).ingest_folder(csv_folder, chunk_rows))
             logging.info("Data initialization from CSV files completed.")
+            return report
+        except Exception as e:
+            logging.error(f"Error initializing data from CSV files: {e}")
+            return {}
 
     if __name__ == "__main__":
         # Example usage